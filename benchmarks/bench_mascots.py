@@ -0,0 +1,126 @@
+"""
+Python-side cost of each additional mascot in one process: CPU and RSS for 1..16 simulated mascots.
+This excludes the Flutter view process every mascot also runs (and its socket traffic), so it's a
+lower bound on the real cost, not what a user sees in their task manager.
+
+Each mascot loads its sprites and speech lines, then runs the idle bobbing loop at 60 FPS
+against a stand-in window for a few seconds. `shared` uses the process-wide sprite cache,
+speech corpus and frame clock (what `main_app` does now); `isolated` gives every mascot its
+own copies, like separate processes would (minus the interpreter and Flet themselves).
+Every configuration runs in a fresh subprocess so RSS readings don't leak between them.
+
+    python benchmarks/bench_mascots.py [--seconds=3] [--counts=1,2,4,8,16]
+"""
+import asyncio, json, math, os, subprocess, sys, time
+
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC))
+
+
+# -------- Child --------
+def rss_mb() -> float:
+    """Current resident set size (peak on platforms without /proc)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+class FakeWindow:
+    __slots__ = ("top", "updates")
+
+    def __init__(self):
+        self.top = 0.0
+        self.updates = 0
+
+    def update(self):
+        self.updates += 1
+
+
+async def mascot(shared: bool, seconds: float) -> tuple[int, tuple]:
+    from ui.images import MikuStates, SpriteCache, sprite_cache
+    from utilities.data import LINES_PATH, get_speech_lines, load_lines
+    from utilities.timers import DeltaTimer, frame_clock
+
+    cache = sprite_cache if shared else SpriteCache()
+    for state in MikuStates:
+        cache.get(state)
+    lines = get_speech_lines() if shared else load_lines(LINES_PATH)
+    timer = frame_clock.timer() if shared else DeltaTimer(target_fps=60.0)
+
+    window, phase, base = FakeWindow(), 0.0, 100.0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        dt = await timer.tick()
+        phase = (phase + 4.0 * dt) % math.tau
+        window.top = base + math.sin(phase) * 4.0
+        window.update()
+    return window.updates, (cache, lines, timer) # Kept alive until RSS is read
+
+
+def child(mode: str, count: int, seconds: float) -> None:
+    import flet # Imported up front so every configuration pays for it equally
+    baseline_rss = rss_mb()
+
+    async def run():
+        return await asyncio.gather(*(mascot(mode == "shared", seconds) for _ in range(count)))
+
+    cpu_start = time.process_time()
+    results = asyncio.run(run())
+    cpu = time.process_time() - cpu_start
+    rss = rss_mb()
+    print(json.dumps({
+        "mode": mode, "mascots": count,
+        "cpu_pct": round(cpu / seconds * 100, 2),
+        "rss_mb": round(rss, 2),
+        "rss_added_mb": round(rss - baseline_rss, 2),
+        "frames_per_mascot": round(sum(frames for frames, _ in results) / count),
+    }))
+
+
+# -------- Parent --------
+def slope(xs: list[float], ys: list[float]) -> float:
+    """Least-squares slope, i.e. the cost of each additional mascot."""
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    den = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / den if den else 0.0
+
+
+def main(argv: list[str]) -> None:
+    opts = dict(a[2:].split("=", 1) for a in argv if a.startswith("--") and "=" in a)
+    seconds = float(opts.get("seconds", 3))
+    counts = [int(c) for c in opts.get("counts", "1,2,4,8,16").split(",")]
+
+    results = []
+    for mode in ("shared", "isolated"):
+        for count in counts:
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode, str(count), str(seconds)],
+                capture_output=True, text=True, check=True
+            )
+            results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print("Python-side only: excludes each mascot's Flutter view process\n")
+    print(f"{'mode':<9} {'mascots':>7} {'cpu %':>7} {'rss MB':>8} {'+rss MB':>8} {'frames':>7}")
+    for r in results:
+        print(f"{r['mode']:<9} {r['mascots']:>7} {r['cpu_pct']:>7} {r['rss_mb']:>8} {r['rss_added_mb']:>8} {r['frames_per_mascot']:>7}")
+    print()
+    for mode in ("shared", "isolated"):
+        rows = [r for r in results if r["mode"] == mode]
+        xs = [r["mascots"] for r in rows]
+        print(
+            f"{mode}: +{slope(xs, [r['cpu_pct'] for r in rows]):.2f}% CPU and "
+            f"+{slope(xs, [r['rss_added_mb'] for r in rows]):.2f} MB per additional mascot (Python side)"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--child":
+        child(sys.argv[2], int(sys.argv[3]), float(sys.argv[4]))
+    else:
+        main(sys.argv[1:])
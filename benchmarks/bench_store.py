@@ -0,0 +1,90 @@
+"""
+Interaction-path latency with the persistent state store, and its startup read cost.
+
+Each interaction bumps a counter, like `track()` in `main_app` does:
+- `memory`:   a plain dict, i.e. before anything was persisted
+- `store`:    `StateStore.increment` (memory + a coalesced flush scheduled on the timer wheel)
+- `sync_sql`: writing and committing to SQLite on every interaction, for comparison
+
+    python benchmarks/bench_store.py [--interactions=20000] [--keys=500]
+"""
+import asyncio, sqlite3, statistics, sys, tempfile, time
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from utilities.store import StateStore
+
+KEYS = ["count.tap", "count.drag", "count.menu_open", "count.void", "count.window_focus"]
+
+
+def percentiles(samples_ns: list[int]) -> dict[str, float]:
+    samples = sorted(samples_ns)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] / 1000
+    return {"p50_us": round(pick(0.5), 2), "p99_us": round(pick(0.99), 2), "mean_us": round(statistics.fmean(samples) / 1000, 2)}
+
+
+async def run_interactions(bump, n: int) -> list[int]:
+    samples = []
+    for i in range(n):
+        start = time.perf_counter_ns()
+        bump(KEYS[i % len(KEYS)])
+        samples.append(time.perf_counter_ns() - start)
+        if i % 64 == 0:
+            await asyncio.sleep(0) # Let scheduled flushes run, as they would between frames
+    return samples
+
+
+async def main(argv: list[str]) -> None:
+    opts = dict(a[2:].split("=", 1) for a in argv if a.startswith("--") and "=" in a)
+    n = int(opts.get("interactions", 20000))
+    key_count = int(opts.get("keys", 500))
+    tmp = Path(tempfile.mkdtemp())
+    results = {}
+
+    counters: dict[str, int] = {}
+    def bump_memory(key: str) -> None:
+        counters[key] = counters.get(key, 0) + 1
+    results["memory"] = percentiles(await run_interactions(bump_memory, n))
+
+    store = StateStore(path=tmp / "store.db", flush_interval=0.05)
+    store.load()
+    results["store"] = percentiles(await run_interactions(store.increment, n))
+    await store.close()
+    flushes = store.stats()
+
+    conn = sqlite3.connect(tmp / "sync.db")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE kv (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+    def bump_sync(key: str) -> None:
+        with conn:
+            conn.execute(
+                "INSERT INTO kv VALUES (?, 1) ON CONFLICT(key) DO UPDATE SET value = value + 1", (key,)
+            )
+    results["sync_sql"] = percentiles(await run_interactions(bump_sync, min(n, 2000)))
+    conn.close()
+
+    # Startup: one query for everything
+    seeded = StateStore(path=tmp / "seeded.db")
+    seeded.load()
+    for i in range(key_count):
+        seeded.set(f"memory.{i}", {"count": i, "seen": time.time()})
+    await seeded.close()
+    loads = []
+    for _ in range(20):
+        fresh = StateStore(path=tmp / "seeded.db")
+        start = time.perf_counter()
+        fresh.load()
+        loads.append((time.perf_counter() - start) * 1000)
+        await fresh.close()
+
+    print(f"{'path':<9} {'p50 µs':>8} {'p99 µs':>8} {'mean µs':>8}")
+    for name, r in results.items():
+        print(f"{name:<9} {r['p50_us']:>8} {r['p99_us']:>8} {r['mean_us']:>8}")
+    print(f"\nstore flushes: {flushes['flushes']} transactions for {flushes['writes']} writes ({flushes['rows_flushed']} rows)")
+    print(f"startup load of {key_count} keys: median {statistics.median(loads):.3f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
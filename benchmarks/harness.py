@@ -0,0 +1,62 @@
+"""
+Tiny benchmark harness used by the `suite_*.py` modules and `run.py`.
+
+A suite registers cases with `@case`. A timing case returns the zero-argument callable to
+time, and is reported in ns per call. A measured case (`measured=True`) runs itself and
+returns `(value, unit)`. Either way, lower is better. Noisy cases can set their own
+regression `threshold` instead of the runner's.
+"""
+import sys, time
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    setup: Callable
+    measured: bool = False
+    threshold: Optional[float] = None
+
+
+CASES: list[Case] = []
+
+
+def case(name: str, measured: bool = False, threshold: Optional[float] = None):
+    def register(setup: Callable) -> Callable:
+        CASES.append(Case(name, setup, measured, threshold))
+        return setup
+    return register
+
+
+def time_call(fn: Callable[[], object], min_time: float = 0.05, repeat: int = 5) -> float:
+    """Returns the best ns per call of `fn` over `repeat` runs of at least `min_time` seconds each."""
+    number = 1
+    while True: # Find a loop count that takes long enough to time reliably
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= min_time * 1e9:
+            break
+        number *= 2 if elapsed else 10
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter_ns() - start) / number)
+    return best
+
+
+def run_case(c: Case, quick: bool = False) -> dict:
+    if c.measured:
+        value, unit = c.setup()
+        return {"value": round(value, 4), "unit": unit}
+    fn = c.setup()
+    ns = time_call(fn, min_time=0.01 if quick else 0.05, repeat=3 if quick else 5)
+    return {"value": round(ns, 2), "unit": "ns/op"}
@@ -0,0 +1,94 @@
+"""
+Runs the micro-benchmarks in `benchmarks/suite_*.py`, writes the results as JSON and,
+given a baseline, flags every case that got slower than the regression threshold.
+
+    python benchmarks/run.py                                   # Print and write results/latest.json
+    python benchmarks/run.py --filter=monitor --quick          # Only matching cases, shorter runs
+    python benchmarks/run.py --baseline=benchmarks/results/0.4.2.json [--threshold=0.15]
+    python benchmarks/run.py --output=benchmarks/results/0.4.2.json  # Save a release's baseline
+
+Exits with 1 if any case regressed, so it can gate a release build.
+"""
+import importlib, json, platform, sys, time
+
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+
+from harness import CASES, run_case
+
+DEFAULT_OUTPUT = BENCH_DIR / "results" / "latest.json"
+DEFAULT_THRESHOLD = 0.15 # 15% slower than the baseline counts as a regression
+
+
+def project_version() -> str:
+    pyproject = BENCH_DIR.parent / "pyproject.toml"
+    for line in pyproject.read_text(encoding="utf-8").splitlines():
+        if line.startswith("version"):
+            return line.split("=", 1)[1].strip().strip('"')
+    return "unknown"
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Returns the names of regressed cases, and prints the change of every shared case."""
+    thresholds = {c.name: c.threshold for c in CASES if c.threshold is not None}
+    regressions = []
+    print(f"\nCompared to {baseline['meta']['version']} ({baseline['meta']['timestamp']}):")
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if before is None or not before["value"]:
+            continue
+        change = result["value"] / before["value"] - 1
+        limit = thresholds.get(name, threshold)
+        flag = ""
+        if change > limit:
+            regressions.append(name)
+            flag = f"  <-- REGRESSION (> {limit:+.0%})"
+        print(f"  {name:<44} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main(argv: list[str]) -> int:
+    opts = dict(a[2:].split("=", 1) if "=" in a else (a[2:], "") for a in argv if a.startswith("--"))
+    quick = "quick" in opts
+    name_filter = opts.get("filter", "")
+    threshold = float(opts.get("threshold", DEFAULT_THRESHOLD))
+    output = Path(opts.get("output") or DEFAULT_OUTPUT)
+
+    for suite in sorted(BENCH_DIR.glob("suite_*.py")):
+        importlib.import_module(suite.stem)
+
+    results = {}
+    for c in CASES:
+        if name_filter not in c.name:
+            continue
+        result = run_case(c, quick=quick)
+        results[c.name] = result
+        print(f"{c.name:<44} {result['value']:>14,.2f} {result['unit']}")
+
+    report = {
+        "meta": {
+            "version": project_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nWrote {output}")
+
+    if "baseline" in opts:
+        baseline = json.loads(Path(opts["baseline"]).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed.")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
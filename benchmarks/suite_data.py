@@ -0,0 +1,40 @@
+"""`utilities.data`: loading and sampling speech corpora far larger than the shipped one."""
+import atexit, json, random, shutil, tempfile
+
+from pathlib import Path
+from harness import case
+from utilities.data import load_lines, random_line
+
+CORPUS_SIZES = (1_000, 10_000, 100_000)
+EMOTIONS = ("happy", "singing", "joy", "amgry", "thinking", "flustered", "neutral", "reading", "ready")
+
+_tmp = Path(tempfile.mkdtemp(prefix="miku-bench-"))
+atexit.register(shutil.rmtree, _tmp, True)
+
+
+def corpus(size: int) -> Path:
+    """Writes (once) a speech file shaped like `miku_speech.json` with `size` lines."""
+    path = _tmp / f"speech_{size}.json"
+    if not path.exists():
+        rnd = random.Random(size)
+        lines = [
+            {"text": f"Line {i}: " + " ".join(rnd.choice(("la", "miku", "♪", "(●'◡'●)")) for _ in range(8)),
+             "emotion": rnd.choice(EMOTIONS)}
+            for i in range(size)
+        ]
+        path.write_text(json.dumps(lines, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+for size in CORPUS_SIZES:
+    def register(size: int = size):
+        @case(f"data.load_lines[{size}]")
+        def load():
+            path = corpus(size)
+            return lambda: load_lines(path)
+
+        @case(f"data.random_line[{size}]")
+        def pick():
+            lines = load_lines(corpus(size))
+            return lambda: random_line(lines)
+    register()
@@ -0,0 +1,88 @@
+"""Tap hit-testing: `ui.hitmap` lookups against the two `is_within_radius` circles they replaced."""
+import random, tempfile, time
+
+import flet as ft
+
+from harness import case
+from pathlib import Path
+from ui.hitmap import HitMap, HitMaps, fallback_region
+from ui.images import ASSETS_PATH, MikuStates, get_miku_state
+from utilities.math import is_within_radius
+
+DISPLAY = (258, 210)
+SPRITE = (ASSETS_PATH / get_miku_state(MikuStates.NEUTRAL)).read_bytes()
+
+
+def taps(n: int = 256) -> list[tuple[float, float]]:
+    rnd = random.Random(45)
+    return [(rnd.uniform(0, DISPLAY[0]), rnd.uniform(0, DISPLAY[1])) for _ in range(n)]
+
+
+def cycle(points: list[tuple[float, float]]):
+    state = {"i": 0}
+    def next_point() -> tuple[float, float]:
+        i = state["i"] = (state["i"] + 1) % len(points)
+        return points[i]
+    return next_point
+
+
+@case("hitmap.radius_checks")
+def radius_checks():
+    next_point = cycle([ft.Offset(x=x + 10, y=y + 50) for x, y in taps()]) # Window coordinates, as before
+    flustered, headpat = ft.Offset(x=141.0, y=210.0), ft.Offset(x=121.0, y=135.0)
+    def run():
+        point = next_point()
+        if not is_within_radius(center=flustered, point=point, radius=40):
+            is_within_radius(center=headpat, point=point, radius=50)
+    return run
+
+
+@case("hitmap.fallback_region") # Taps before `hit_maps.warm()` has built the sprite's map
+def fallback():
+    next_point = cycle(taps())
+    def run():
+        fallback_region(*next_point())
+    return run
+
+
+@case("hitmap.region_at")
+def region_at():
+    hit_map = HitMap.from_png(SPRITE)
+    next_point = cycle(taps())
+    def run():
+        x, y = next_point()
+        hit_map.region_at(x, y, *DISPLAY)
+    return run
+
+
+@case("hitmap.region_at[flipped,scaled]")
+def region_at_transformed():
+    hit_map = HitMap.from_png(SPRITE)
+    next_point = cycle(taps())
+    def run():
+        x, y = next_point()
+        hit_map.region_at(x, y, *DISPLAY, flipped=True, scale=0.8)
+    return run
+
+
+@case("hitmap.build[one sprite]", measured=True, threshold=0.5) # One-off cost, in a worker thread
+def build():
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        HitMap.from_png(SPRITE)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, "ms"
+
+
+@case("hitmap.warm[all sprites,cached]", measured=True, threshold=0.5) # Every launch after the first
+def warm_cached():
+    cache = Path(tempfile.mkdtemp()) / "hitmaps.bin"
+    maps = lambda: HitMaps(lambda state: ASSETS_PATH / get_miku_state(state), cache_path=lambda: cache)
+    maps().warm(list(MikuStates)) # Decodes and saves the cache once
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        maps().warm(list(MikuStates))
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, "ms"
@@ -0,0 +1,26 @@
+"""`utilities.math`: hit tests and random chances, both run on every tap and movement."""
+import flet as ft
+
+from harness import case
+from utilities.math import chance, is_within_radius
+
+
+@case("math.is_within_radius[tuple]")
+def within_radius_tuple():
+    return lambda: is_within_radius((141.0, 210.0), (150.0, 200.0), 40)
+
+
+@case("math.is_within_radius[offset]")
+def within_radius_offset():
+    center, point = ft.Offset(141.0, 210.0), ft.Offset(150.0, 200.0)
+    return lambda: is_within_radius(center, point, 40)
+
+
+@case("math.chance[50]")
+def chance_half():
+    return lambda: chance(50)
+
+
+@case("math.chance[0]")
+def chance_never():
+    return lambda: chance(0)
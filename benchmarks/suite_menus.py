@@ -0,0 +1,49 @@
+"""`ui.menus`: opening a 500-entry menu, every button built up front against a `MenuSpec`'s virtual list."""
+import time
+
+import flet as ft
+
+from harness import case
+from ui.menus import DefaultMenu, MenuCache, MenuEntry, MenuSpec
+
+ENTRIES = [MenuEntry(f"Entry {i}") for i in range(500)]
+
+
+def best_ms(build, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def eager() -> ft.Container:
+    menu = DefaultMenu("Eager")
+    for entry in ENTRIES:
+        menu.add_button(entry.text, entry.on_click)
+    return menu.build()
+
+
+def lazy() -> ft.Container:
+    menus = MenuCache(ft.Column())
+    menus.declare("big", MenuSpec("Lazy", lambda: ENTRIES))
+    return menus.get("big")
+
+
+@case("menus.open[500,eager]", measured=True, threshold=0.5)
+def open_eager():
+    return best_ms(eager), "ms"
+
+
+@case("menus.open[500,spec]", measured=True, threshold=0.5)
+def open_spec():
+    return best_ms(lazy), "ms"
+
+
+@case("menus.open[500,spec,cached]")
+def open_cached():
+    menus = MenuCache(ft.Column())
+    menus.declare("big", MenuSpec("Lazy", lambda: ENTRIES))
+    menus.get("big")
+    return lambda: menus.get("big")
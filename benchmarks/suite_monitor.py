@@ -0,0 +1,74 @@
+"""`utilities.monitor` over synthetic layouts of 1 to 16 monitors, rows of 4 at 1920x1080."""
+import random
+
+from dataclasses import dataclass
+from harness import case
+from utilities.monitor import check_and_adjust_bounds, clamp_to_monitor, get_monitor_for_window
+
+LAYOUTS = (1, 2, 4, 8, 16)
+WINDOW = (288, 270)
+
+
+@dataclass
+class FakeMonitor: # Same fields the code reads from `screeninfo.Monitor`
+    x: int
+    y: int
+    width: int
+    height: int
+    is_primary: bool = False
+
+
+def layout(count: int) -> list[FakeMonitor]:
+    return [
+        FakeMonitor(x=(i % 4) * 1920, y=(i // 4) * 1080, width=1920, height=1080, is_primary=i == 0)
+        for i in range(count)
+    ]
+
+
+def positions(monitors: list[FakeMonitor], n: int = 256) -> list[tuple[int, int]]:
+    """Window positions across the whole layout, a few of them in the void or across edges."""
+    rnd = random.Random(39)
+    right = max(m.x + m.width for m in monitors)
+    bottom = max(m.y + m.height for m in monitors)
+    return [(rnd.randint(-400, right + 100), rnd.randint(-300, bottom + 100)) for _ in range(n)]
+
+
+def cycle(points: list[tuple[int, int]]):
+    state = {"i": 0}
+    def next_point() -> tuple[int, int]:
+        i = state["i"] = (state["i"] + 1) % len(points)
+        return points[i]
+    return next_point
+
+
+for count in LAYOUTS:
+    def register(count: int = count):
+        monitors = layout(count)
+        points = positions(monitors)
+
+        @case(f"monitor.get_monitor_for_window[{count}]")
+        def monitor_for_window():
+            next_point = cycle(points)
+            def run():
+                left, top = next_point()
+                get_monitor_for_window(left=left, top=top, width=WINDOW[0], height=WINDOW[1], monitors=monitors)
+            return run
+
+        @case(f"monitor.check_and_adjust_bounds[{count}]")
+        def adjust_bounds():
+            next_point = cycle(points)
+            def run():
+                left, top = next_point()
+                check_and_adjust_bounds(left=left, top=top, width=WINDOW[0], height=WINDOW[1], monitors=monitors)
+            return run
+    register()
+
+
+@case("monitor.clamp_to_monitor")
+def clamp():
+    monitor = layout(1)[0]
+    next_point = cycle(positions([monitor]))
+    def run():
+        left, top = next_point()
+        clamp_to_monitor(monitor, left=left, top=top, width=WINDOW[0], height=WINDOW[1])
+    return run
@@ -0,0 +1,53 @@
+"""`utilities.physics`: fixed steps of a throw bouncing around a 2x2 layout, and what a frame costs."""
+import tracemalloc
+
+from dataclasses import dataclass
+from harness import case
+from utilities.physics import PhysicsWorld
+
+WINDOW = (288, 270)
+
+
+@dataclass
+class FakeMonitor: # Same fields the code reads from `screeninfo.Monitor`
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+MONITORS = [FakeMonitor(x=(i % 2) * 1920, y=(i // 2) * 1080, width=1920, height=1080) for i in range(4)]
+
+
+def world() -> PhysicsWorld:
+    physics = PhysicsWorld(bounce=0.9)
+    physics.set_colliders(MONITORS, *WINDOW)
+    physics.friction = physics.ground_drag = 1.0 # Never comes to rest, so every step is a full one
+    physics.throw(1000, 300, 3000, -1500)
+    return physics
+
+
+@case("physics.step")
+def step():
+    physics = world()
+    return physics._step
+
+
+@case("physics.advance[60fps frame]")
+def advance():
+    physics = world()
+    return lambda: physics.advance(1 / 60)
+
+
+@case("physics.step[bytes retained per 10k]", measured=True, threshold=0.5)
+def retained():
+    """Memory still allocated after 10k steps: stays flat, nothing is kept per step."""
+    physics = world()
+    physics._step() # Warm up attribute caches
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(10_000):
+        physics._step()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return max(after - before, 0), "B"
@@ -0,0 +1,93 @@
+"""`utilities.planner` over synthetic layouts of 4 to 256 monitors, rows of 16 at 1920x1080, some offset."""
+import random
+
+from dataclasses import dataclass
+from harness import case
+from utilities.planner import MovementPlanner
+
+LAYOUTS = (4, 16, 64, 256)
+WINDOW = (288, 270)
+MAX_STEP = 300
+TOP = 400 # A window top every row's monitors can hold
+
+
+@dataclass
+class FakeMonitor: # Same fields the code reads from `screeninfo.Monitor`
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+def layout(count: int, shift: int = 0) -> list[FakeMonitor]:
+    """Every third monitor is 100px lower, so links only hold for some window tops."""
+    return [
+        FakeMonitor(x=(i % 16) * 1920, y=(i // 16) * 1200 + (100 if i % 3 == 2 else 0) + shift, width=1920, height=1080)
+        for i in range(count)
+    ]
+
+
+def lefts(count: int, n: int = 256) -> list[int]:
+    rnd = random.Random(47)
+    right = min(count, 16) * 1920
+    return [rnd.randint(0, right - WINDOW[0]) for _ in range(n)]
+
+
+def cycle(values: list):
+    state = {"i": 0}
+    def next_value():
+        i = state["i"] = (state["i"] + 1) % len(values)
+        return values[i]
+    return next_value
+
+
+for count in LAYOUTS:
+    def register(count: int = count):
+        monitors = layout(count)
+
+        @case(f"planner.refresh[{count},unchanged]")
+        def refresh_unchanged():
+            planner = MovementPlanner()
+            planner.refresh(monitors, *WINDOW)
+            def run():
+                planner.refresh(monitors, *WINDOW)
+            return run
+
+        @case(f"planner.refresh[{count},rebuild]")
+        def refresh_rebuild():
+            planner = MovementPlanner()
+            next_layout = cycle([monitors, layout(count, shift=1)]) # Alternate, so every call rebuilds
+            def run():
+                planner.refresh(next_layout(), *WINDOW)
+                planner.row(TOP)
+            return run
+
+        @case(f"planner.wander[{count}]")
+        def wander():
+            planner = MovementPlanner()
+            planner.refresh(monitors, *WINDOW)
+            next_left = cycle(lefts(count))
+            def run():
+                planner.wander(next_left(), TOP, 250)
+            return run
+
+        @case(f"planner.route[{count},whole row]")
+        def route():
+            planner = MovementPlanner()
+            planner.refresh(monitors, *WINDOW)
+            goal = min(count, 16) * 1920
+            def run():
+                planner.route(0, TOP, goal, MAX_STEP)
+            return run
+    register()
+
+
+@case("planner.route_to_neighbour[16]")
+def route_to_neighbour():
+    planner = MovementPlanner()
+    planner.refresh(layout(16), *WINDOW)
+    rng = random.Random(47)
+    next_left = cycle(lefts(16))
+    def run():
+        planner.route_to_neighbour(next_left(), TOP, MAX_STEP, rng)
+    return run
@@ -0,0 +1,74 @@
+"""`utilities.pointer`: cursor reads per simulated minute, against 3600 for polling every 60fps frame."""
+import math
+
+from harness import case
+from utilities.pointer import PointerSampler, SyntheticPointer
+
+MIKU = (1000.0, 800.0)
+MINUTE = 60.0
+
+
+class SimulatedWheel:
+    """Runs a sampler's schedule on a fake clock instead of waiting for it."""
+    def __init__(self):
+        self.now = 0.0
+        self._due: list = []
+
+    def clock(self) -> float:
+        return self.now
+
+    def schedule(self, delay: float, callback, *args):
+        self._due.append((self.now + delay, callback, args))
+        return self
+
+    def active(self) -> bool:
+        return bool(self._due)
+
+    def cancel(self) -> bool:
+        self._due.clear()
+        return True
+
+    def run(self, until: float) -> None:
+        while self._due:
+            self._due.sort(key=lambda due: due[0])
+            at, callback, args = self._due.pop(0)
+            if at > until:
+                break
+            self.now = at
+            callback(*args)
+
+
+def reads_per_minute(path) -> float:
+    wheel = SimulatedWheel()
+    source = SyntheticPointer(path, clock=wheel.clock)
+    sampler = PointerSampler(source, target=lambda: MIKU, wheel=wheel, clock=wheel.clock)
+    sampler.start()
+    wheel.run(MINUTE)
+    return source.reads
+
+
+PATHS = {
+    "idle": lambda t: (300.0, 200.0),                                         # Cursor left alone
+    "far": lambda t: (2600.0 + 200 * math.sin(t), 200.0),                     # Busy on another screen
+    "near": lambda t: (MIKU[0] + 150 * math.sin(t), MIKU[1] - 100),           # Playing around Miku
+    "passing": lambda t: (MIKU[0] + 1800 * math.sin(t / 4), MIKU[1] - 300),   # Crossing back and forth
+}
+
+for name, path in PATHS.items():
+    def register(name: str = name, path=path):
+        @case(f"pointer.reads_per_minute[{name}]", measured=True, threshold=0.25)
+        def reads():
+            return reads_per_minute(path), "reads"
+    register()
+
+
+@case("pointer.sample")
+def sample():
+    wheel = SimulatedWheel()
+    source = SyntheticPointer(PATHS["near"], clock=wheel.clock)
+    sampler = PointerSampler(source, target=lambda: MIKU, on_move=lambda x, y, d: None, wheel=wheel, clock=wheel.clock)
+    def run():
+        wheel.now += 0.05
+        wheel.cancel() # Drop the read it scheduled last time, only the read itself is timed
+        sampler._sample()
+    return run
@@ -0,0 +1,29 @@
+"""Frame timing accuracy: how far each tick's delta strays from the 60 FPS frame time."""
+import asyncio
+
+from harness import case
+from utilities.timers import DeltaTimer, FrameClock
+
+TARGET_FPS = 60.0
+TICKS = 120
+
+
+def tick_error_ms(make_timer) -> float:
+    """Mean absolute error of `tick()` deltas against the target frame time, in ms."""
+    async def run() -> list[float]:
+        timer = make_timer()
+        await timer.tick() # The first delta includes setup time
+        return [await timer.tick() for _ in range(TICKS)]
+    deltas = asyncio.run(run())
+    frame = 1 / TARGET_FPS
+    return sum(abs(dt - frame) for dt in deltas) / len(deltas) * 1000
+
+
+@case("timers.DeltaTimer.tick[error]", measured=True, threshold=1.0) # Scheduler jitter
+def delta_timer_error():
+    return tick_error_ms(lambda: DeltaTimer(target_fps=TARGET_FPS)), "ms"
+
+
+@case("timers.FrameTimer.tick[error]", measured=True, threshold=1.0)
+def frame_timer_error():
+    return tick_error_ms(lambda: FrameClock(target_fps=TARGET_FPS).timer()), "ms"
@@ -1,5 +1,6 @@
 import flet as ft
 
+from typing import Optional
 from ui.images import Miku
 from utilities.data import get_day_period
 from utilities.debug import get_full_username
@@ -7,13 +8,15 @@ from utilities.monitor import get_monitor_for_window
 
 # TODO: Make a class for chatting, if possible
 
-CHAT_GREETINGS = [
-    (f"Hello there {get_full_username()}!\n(｡･∀･)ﾉﾞ", Miku.HAPPY),
-    ("Hello, I'm Hatsune Miku! ヾ(•ω•`)o", Miku.HAPPY),
-    (f"Good {get_day_period(return_str=True).capitalize()}! Genki? ヾ(^▽^*)))", Miku.HAPPY),
-    (f"Let's start the {get_day_period(return_str=True)} feeling energized! o(^▽^)o", Miku.JOY),
-    ("Miku dayo~（＾∀＾●）ﾉｼ", Miku.HAPPY)
-]
+def chat_greetings() -> list[tuple[str, Miku]]:
+    """Returns the greetings, built on demand since they need the username and time of day."""
+    return [
+        (f"Hello there {get_full_username()}!\n(｡･∀･)ﾉﾞ", Miku.HAPPY),
+        ("Hello, I'm Hatsune Miku! ヾ(•ω•`)o", Miku.HAPPY),
+        (f"Good {get_day_period(return_str=True).capitalize()}! Genki? ヾ(^▽^*)))", Miku.HAPPY),
+        (f"Let's start the {get_day_period(return_str=True)} feeling energized! o(^▽^)o", Miku.JOY),
+        ("Miku dayo~（＾∀＾●）ﾉｼ", Miku.HAPPY)
+    ]
 
 EXIT_APP_MSGS = [
     ("\'Til next time! ヽ（≧□≦）ノ", Miku.HAPPY),
@@ -29,6 +32,18 @@ WHEN_HEADPAT_MSGS = [
     ("I-I don't mind h-headpats\n(≧﹏ ≦)", Miku.PONDER),
 ]
 
+WHEN_RUBBED_MSGS = [
+    ("Hehe, that tickles! (≧∇≦)ﾉ", Miku.JOY),
+    ("Mmm~ a little to the left? ( ˘▽˘)っ♨", Miku.HAPPY),
+    ("Are you trying to polish me? (・∀・)", Miku.PONDER),
+]
+
+WHEN_SHAKEN_MSGS = [
+    ("W-w-whoa, s-stop shaking me! @_@", Miku.SHOCK),
+    ("My head is spinning... (＠_＠;)", Miku.SHOCK),
+    ("Hey! I'm not a snow globe! (╬▔皿▔)╯", Miku.AMGRY),
+]
+
 WHEN_DRAGGED_MSGS = [
     ("Where we going? o((>ω< ))o", Miku.ECSTATIC),
     ("Weeeee \\(≧▽≦)/", Miku.ECSTATIC),
@@ -40,9 +55,12 @@ AFTER_DRAGGED_MSGS = [
     ("╰(￣ω￣ｏ)", Miku.HAPPY),
 ]
 
-def after_dragged_msgs(page: ft.Page) -> list[tuple[str, Miku]]:
-    """Returns a list of message arguments with new special messages."""
-    m = get_monitor_for_window(page=page)
+def after_dragged_msgs(page: ft.Page, monitors: Optional[list] = None) -> list[tuple[str, Miku]]:
+    """
+    Returns a list of message arguments with new special messages.
+    Pass already enumerated `monitors` to skip enumerating them again.
+    """
+    m = get_monitor_for_window(page=page, monitors=monitors)
     status = "currently" if m.is_primary else "NOT"
     add_list = [
         (f"Hmm... My sources tell me that I'm {status} in your main monitor! "
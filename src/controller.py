@@ -0,0 +1,183 @@
+import time
+
+from enum import Enum
+from typing import Callable, Optional
+
+
+class MikuState(Enum):
+    IDLE = "idle"         # Bobbing in place and wandering every now and then
+    MOVING = "moving"     # Gliding to a new spot
+    DRAGGED = "dragged"   # Being carried around by the user
+    THROWN = "thrown"     # Let go mid-drag, flying until she lands (see `utilities.physics`)
+    CHATTING = "chatting" # Paused to talk to the user, resumes wandering afterwards
+    MENU = "menu"         # A menu is open
+    EXITING = "exiting"   # Saying goodbye, nothing else runs
+
+
+class MikuTrigger(Enum):
+    STEP = "step"             # Start a movement
+    ARRIVE = "arrive"         # Movement finished
+    DRAG = "drag"             # User grabbed her
+    DROP = "drop"             # User let go
+    THROW = "throw"           # User let go with physics on
+    LAND = "land"             # Came to rest after a throw
+    PAUSE = "pause"           # Stop to talk
+    RESUME = "resume"         # Done talking, back to wandering
+    OPEN_MENU = "open_menu"
+    CLOSE_MENU = "close_menu"
+    EXIT = "exit"
+
+
+class MikuLoop(Enum):
+    WANDER = "wander"       # `movement_loop`
+    BOB = "bob"             # `idle_bobbing_loop`
+    ANIMATION = "animation" # `move_miku_smooth`, started by whoever fires `STEP`
+    PHYSICS = "physics"     # `physics_loop`
+
+
+S, T = MikuState, MikuTrigger
+
+# The loops each state needs. Transitions stop the loops the new state doesn't need.
+STATE_LOOPS: dict[MikuState, frozenset[MikuLoop]] = {
+    S.IDLE: frozenset({MikuLoop.WANDER, MikuLoop.BOB}),
+    S.MOVING: frozenset({MikuLoop.WANDER, MikuLoop.ANIMATION}),
+    S.DRAGGED: frozenset(),
+    S.THROWN: frozenset({MikuLoop.PHYSICS}),
+    S.CHATTING: frozenset({MikuLoop.BOB}),
+    S.MENU: frozenset(),
+    S.EXITING: frozenset(),
+}
+
+# (state, trigger) -> next state. Anything missing is ignored.
+TRANSITIONS: dict[tuple[MikuState, MikuTrigger], MikuState] = {
+    (S.IDLE, T.STEP): S.MOVING,
+    (S.CHATTING, T.STEP): S.MOVING,
+    (S.MOVING, T.ARRIVE): S.IDLE,
+    **{(state, T.DRAG): S.DRAGGED for state in (S.IDLE, S.MOVING, S.CHATTING, S.THROWN)},
+    (S.DRAGGED, T.DROP): S.CHATTING,
+    (S.DRAGGED, T.THROW): S.THROWN,
+    (S.THROWN, T.LAND): S.CHATTING,
+    **{(state, T.PAUSE): S.CHATTING for state in (S.IDLE, S.MOVING, S.CHATTING)}, # Not while carried or flying
+    (S.CHATTING, T.RESUME): S.IDLE,
+    **{(state, T.OPEN_MENU): S.MENU for state in (S.IDLE, S.MOVING, S.DRAGGED, S.CHATTING)},
+    (S.MENU, T.CLOSE_MENU): S.CHATTING,
+    **{(state, T.EXIT): S.EXITING for state in MikuState if state is not S.EXITING},
+}
+
+del S, T
+
+
+class MikuController:
+    """
+    Miku's behavior as an explicit state machine over `TRANSITIONS`.
+    Each transition starts and stops exactly the loops in `STATE_LOOPS`, and counts of
+    transitions, redundant (self) transitions, ignored triggers and time in state are kept.
+
+    Orthogonal to the state:
+    - `speaking`: the speech bubble is showing (she can talk while moving).
+    - `exit_armed`: waiting for the second right-click that confirms the exit.
+    - `manual`: debug override, she doesn't wander on her own.
+    """
+    def __init__(self, state: MikuState = MikuState.CHATTING, debug: bool = False):
+        self.debug = debug
+        self._state = state
+        self._entered_at = time.perf_counter()
+        self._starters: dict[MikuLoop, Callable[[], None]] = {}
+        self._stoppers: dict[MikuLoop, Callable[[], None]] = {}
+        self.speaking = False
+        self.exit_armed = False
+        self.manual = False
+        self._transitions: dict[str, int] = {}
+        self._redundant: dict[str, int] = {}
+        self._ignored: dict[str, int] = {}
+        self._time_in_state: dict[MikuState, float] = {s: 0.0 for s in MikuState}
+
+    def _debug_msg(self, msg: str):
+        if self.debug:
+            print(f"[CONTROLLER] {msg}")
+
+    # -------- Setup --------
+    def register_loop(
+        self, loop: MikuLoop, start: Optional[Callable[[], None]], stop: Callable[[], None]
+    ) -> None:
+        """`start` must be idempotent; `None` means the loop is started by whoever needs it."""
+        if start is not None:
+            self._starters[loop] = start
+        self._stoppers[loop] = stop
+
+    def begin(self) -> None:
+        """Starts the loops of the initial state."""
+        self._ensure_loops()
+
+    # -------- State --------
+    @property
+    def state(self) -> MikuState:
+        return self._state
+
+    def is_in(self, *states: MikuState) -> bool:
+        return self._state in states
+
+    def needs(self, loop: MikuLoop) -> bool:
+        """Returns `True` if the current state should be running `loop`."""
+        if loop is MikuLoop.WANDER and self.manual:
+            return False
+        return loop in STATE_LOOPS[self._state]
+
+    def can(self, trigger: MikuTrigger) -> bool:
+        return (self._state, trigger) in TRANSITIONS
+
+    def fire(self, trigger: MikuTrigger) -> bool:
+        """Applies `trigger`. Returns `False` if the current state ignores it."""
+        old = self._state
+        new = TRANSITIONS.get((old, trigger))
+        if new is None:
+            key = f"{old.value}:{trigger.value}"
+            self._ignored[key] = self._ignored.get(key, 0) + 1
+            self._debug_msg(f"Ignored {trigger.value} while {old.value}")
+            return False
+        if new is old:
+            key = f"{old.value}:{trigger.value}"
+            self._redundant[key] = self._redundant.get(key, 0) + 1
+            return True
+
+        now = time.perf_counter()
+        self._time_in_state[old] += now - self._entered_at
+        self._entered_at = now
+        self._state = new
+        key = f"{old.value} -> {new.value}"
+        self._transitions[key] = self._transitions.get(key, 0) + 1
+        self._debug_msg(f"{key} ({trigger.value})")
+
+        for loop in STATE_LOOPS[old] - STATE_LOOPS[new]:
+            self._stoppers.get(loop, _noop)()
+        self._ensure_loops()
+        return True
+
+    def set_manual(self, enabled: bool) -> None:
+        """Turns the manual (no wandering) override on or off."""
+        self.manual = enabled
+        if enabled:
+            self._stoppers.get(MikuLoop.WANDER, _noop)()
+        self._ensure_loops()
+
+    def _ensure_loops(self) -> None:
+        for loop in STATE_LOOPS[self._state]:
+            if self.needs(loop):
+                self._starters.get(loop, _noop)()
+
+    # -------- Instrumentation --------
+    def stats(self) -> dict:
+        """Returns transition counts, redundant/ignored triggers and seconds spent per state."""
+        time_in_state = dict(self._time_in_state)
+        time_in_state[self._state] += time.perf_counter() - self._entered_at
+        return {
+            "state": self._state.value,
+            "transitions": dict(self._transitions),
+            "redundant": dict(self._redundant),
+            "ignored": dict(self._ignored),
+            "time_in_state_s": {s.value: round(t, 3) for s, t in time_in_state.items()},
+        }
+
+
+def _noop() -> None:
+    pass
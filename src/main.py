@@ -1,18 +1,47 @@
+import asyncio, sys
+
+from utilities.instance import InstanceCommand, claim_instance, forward_command, instance_server, parse_args
+from utilities.profiler import startup_profiler
+from utilities.settings import settings_store
+
+DEBUG = settings_store.current.debug # Set `"debug": true` in `settings.json` (see `utilities.settings`)
+PROFILE_STARTUP = settings_store.current.profile_startup # Writes import and phase timings up to the first frame to `startup_report.json`
+
+# Single instance: hand the command to the running Miku instead of starting another one
+launch_args = parse_args(sys.argv[1:])
+if not launch_args.multi:
+    instance_socket = claim_instance()
+    if instance_socket is None:
+        forwarded = forward_command(launch_args)
+        if forwarded is None:
+            print("Miku is already starting up, not launching another one.")
+        if forwarded is not False:
+            sys.exit(0)
+    instance_server.attach(instance_socket)
+    if instance_socket is not None and launch_args.command is InstanceCommand.EXIT:
+        sys.exit(0) # Nothing to close
+
+startup_profiler.enabled = PROFILE_STARTUP
+startup_profiler.track_imports()
+
 import flet as ft
 
 from main_ui import main_app
 from setup import before_main_app
-
-# TODO: Implement a feature to disable/enable debug mode
-DEBUG = False
+from ui.images import ASSETS_PATH
+from utilities.mascots import run_mascots
 
 
-async def main(page: ft.Page):
-    await main_app(page=page, debug=DEBUG)
+async def main(page: ft.Page, mascot_id: int = 0):
+    await main_app(page=page, debug=DEBUG, mascot_id=mascot_id)
 
-async def before_main(page: ft.Page):
-    await before_main_app(page=page, debug=DEBUG)
+async def before_main(page: ft.Page, mascot_id: int = 0):
+    with startup_profiler.phase("before_main_app"):
+        await before_main_app(page=page, debug=DEBUG, mascot_id=mascot_id)
 
 
 if __name__ == "__main__":
-    ft.run(main=main, before_main=before_main)
\ No newline at end of file
+    if launch_args.mascots > 1: # Several Mikus sharing one process, see `utilities.mascots`
+        asyncio.run(run_mascots(main, before_main, launch_args.mascots, ASSETS_PATH, debug=DEBUG))
+    else:
+        ft.run(main=main, before_main=before_main)
\ No newline at end of file
@@ -1,38 +1,63 @@
 import flet as ft
-import random, asyncio, math
+import random, asyncio, math, time
 
-from typing import Optional, Tuple
+from collections import Counter
+
+from typing import Optional
 from setup import set_win_pos_bc, before_main_app
 from chats import (
-    CHAT_GREETINGS, EXIT_APP_MSGS, WHEN_HEADPAT_MSGS, WHEN_DRAGGED_MSGS, WHEN_IN_VOID_MSGS,
-    WHEN_FED_UP_MSGS, WHEN_FLUSTERED_MSGS, after_dragged_msgs)
+    chat_greetings, EXIT_APP_MSGS, WHEN_HEADPAT_MSGS, WHEN_DRAGGED_MSGS, WHEN_IN_VOID_MSGS,
+    WHEN_FED_UP_MSGS, WHEN_FLUSTERED_MSGS, WHEN_RUBBED_MSGS, WHEN_SHAKEN_MSGS, after_dragged_msgs)
 from ui.components import default_speech_bubble
-from ui.images import DynamicMiku, Miku
-from ui.menus import DefaultMenu
+from ui.hitmap import Region
+from ui.images import DynamicMiku, Miku, MikuStates, hit_maps
+from ui.menus import MenuCache, MenuEntry, MenuSpec
+from ui.hud import PerformanceHud
 from ui.animations import (opening_animation, anim_setup_main, exit_animation, show_menu_animation,
                            exit_menu_animation)
-from utilities.data import SPEECH_LINES, random_line, get_date, get_time
-from utilities.timers import ResettableTimer, DeltaTimer
-from utilities.tasks import cancel_task, await_task_completion, is_task_done
-from utilities.debug import debug_msg
+from utilities.data import get_speech_lines, random_line, get_date, get_time
+from utilities.accounting import update_accounting, update_control, update_page, update_window
+from utilities.timers import ResettableTimer, FrameTimer, frame_clock, timer_wheel
+from utilities.tasks import TaskSupervisor
+from utilities.debug import debug_msg, logs
 from utilities.helpers import rnd_miku_chat
+from utilities.instance import InstanceCommand, instance_server
+from utilities.mascots import mascots
+from controller import MikuController, MikuLoop, MikuState, MikuTrigger
+from utilities.boot import BootPipeline, BootStage
+from utilities.events import EventPipeline, EventPolicy, EventRule
+from utilities.gestures import STROKE_CODES, GestureRecognizer, Stroke
 from utilities.monitor import check_and_adjust_bounds, get_all_monitors
-from utilities.math import chance, is_within_radius
-from utilities.notifications import preset_help_notif
+from utilities.planner import MovementPlanner
+from utilities.physics import PhysicsWorld, VelocityTracker
+from utilities.pointer import FacingHysteresis, PointerSampler, system_pointer
+from utilities.math import chance
+from utilities.notifications import notifications, preset_help_notif
+from utilities.memory import memory_profiler
+from utilities.perf import PerfSampler
+from utilities.profiler import startup_profiler
+from utilities.settings import LOG_CHANNELS, Settings, log_levels, settings_store
+from utilities.store import state_store
+from utilities.telemetry import TelemetryEvent, telemetry
+from utilities.session import get_restored_snapshot, get_session_path, save_snapshot, take_snapshot
 
 
 # TODO: If possible, refactor everything related to Miku into a class for modularity.
-async def main_app(page: ft.Page, debug: bool = False):
-    """Serves as the `main` of the entire app."""
+async def main_app(page: ft.Page, debug: bool = False, mascot_id: int = 0):
+    """
+    Serves as the `main` of the entire app. Each call is one mascot with its own window state,
+    see `utilities.mascots` for running several in one process.
+    """
+    startup_profiler.mark("main_app")
+    mascots.join(mascot_id)
     # -------- Setup --------
-    # Task Flags for Loops
-    stop_event = asyncio.Event() # Used to control movement loop only
-    restart_timer_task:      Optional[asyncio.Task] = None
-    speech_timer_task:       Optional[asyncio.Task] = None
-    movement_task:           Optional[asyncio.Task] = None
-    movement_animation_task: Optional[asyncio.Task] = None
-    idle_task:               Optional[asyncio.Task] = None
-    tasks = [restart_timer_task, speech_timer_task, movement_task, movement_animation_task]
+    # Behavior State and Loops
+    controller = MikuController(MikuState.CHATTING, debug=debug) # Greets the user first
+    # Slots: "restart_timer", "speech_timer", "movement", "movement_animation", "idle", "hud"
+    # Groups: "menu" (button actions), "boot" (opening animation), "events" (window events),
+    #         "ipc" (commands forwarded by another launch), "settings" (applying live changes),
+    #         "gestures" (reactions to strokes)
+    supervisor = TaskSupervisor(debug=debug)
     
     ## -- Controls --
     # Defaults
@@ -42,171 +67,262 @@ async def main_app(page: ft.Page, debug: bool = False):
     HEIGHT_INCREASE = 0
     WIDTH_INCREASE  = 400
     
+    # Where the sprite sits in the window (bottom left, 10px padding), to hit-test taps against it
+    SPRITE_LEFT = 10
+    SPRITE_TOP  = 50
+    
     ## -- Variables --
-    # Debug Stuff
-    ALLOW_VOID_TRAVERSAL: bool = False
-    ENABLE_MV_OVERRIDE:   bool = False
-    SHOW_MOVEMENT_LOGS:   bool = False
-    SHOW_IDLE_LOGS:       bool = False
-    SHOW_CHAT_LOGS:       bool = False
-    SHOW_LOOP_LOGS:       bool = False
-    SHOW_WINDOW_LOGS:     bool = False
-    mv_override_enabled:  bool = False
-    exit_app:             bool = False
-    open_menu:            bool = False
-    is_miku_chatting:     bool = False
-    disable:              bool = False
-    
-    # Movement
-    MIKU_MV_FREQ_MS:    Tuple[int, int] = (2000, 3000) # Frequency of randomized Miku movement
-    MIKU_MV_STEP:       Tuple[int, int] = (-300, 300)  # Range of randomized Miku movement
-    MIKU_RT_MOD:        float = 0.125                  # Rotation modifier for Miku flip
-    MIKU_FLIP_CHANCE:   int = 5                        # Chance of Miku flip out of 100%
-    MIKU_CHAT_CHANCE:   int = 20                       # Chance for Miku to randomly chat out of 100%
-    FPS:                float = 60.0                   # For smooth movement animation
-    MINIMUM_ANIM_FRAME: float = 1.0                    # Used for clamping the lowest allowable animation time per frame
+    # Tunables (see `utilities.settings`), replaced live when `settings.json` changes
+    settings: Settings = settings_store.current
     
     # Idle Animation
     idle_phase: float = 0.0         # Bobbing position
     idle_base_top = page.window.top # Baseline for idle bobbing
-    IDLE_AMP: float = 4.0           # Pixels up/down (tweak for subtlety)
     
-    # Speech Values (in seconds)
-    MSG_BASE_TIME: float = 2.0      # Minimum time to display
-    PER_CHAR_TIME: float = 0.02     # Tweak speed factor
+    # Log channels, switched by the `show_*_logs` settings
+    movement_log = logs.channel("movement")
+    idle_log = logs.channel("idle")
+    chat_log = logs.channel("chat")
+    loop_log = logs.channel("loop")
+    window_log = logs.channel("window")
+    
+    # -------- Cursor (see `utilities.pointer`) --------
+    facing = FacingHysteresis()
+    cursor: Optional[PointerSampler] = None # Created the first time `watch_cursor` or `follow_cursor` is on
+    
+    def miku_center() -> tuple[float, float]:
+        return page.window.left + page.window.width / 2, page.window.top + page.window.height / 2
+    
+    def on_cursor_moved(x: float, _y: float, _distance: float) -> None:
+        if not controller.is_in(MikuState.IDLE, MikuState.CHATTING):
+            return # Gliding, carried, thrown or in a menu: she faces where she's going
+        flipped = miku.is_flipped()
+        if facing.should_turn(x - miku_center()[0], flipped):
+            miku.set_flipped(not flipped)
+    
+    def apply_cursor_settings() -> None:
+        nonlocal cursor
+        wanted = settings.watch_cursor or settings.follow_cursor
+        if wanted and cursor is None:
+            source = system_pointer()
+            if source is None:
+                print("Can't read the cursor position here, Miku won't watch it.")
+                return
+            cursor = PointerSampler(source, target=miku_center, on_move=on_cursor_moved)
+            cursor.debug = debug
+        if cursor is None:
+            return
+        if wanted:
+            cursor.start()
+        else:
+            cursor.stop()
+    
+    def on_settings_changed(new: Settings, changed: frozenset[str]) -> None:
+        """Swaps in the new snapshot; loops read `settings` every iteration, so only shared state needs applying."""
+        nonlocal settings
+        settings = new
+        if "fps" in changed:
+            frame_clock.set_target_fps(new.fps)
+        if "telemetry" in changed:
+            telemetry.enabled = new.telemetry
+        if not changed.isdisjoint(LOG_CHANNELS.values()):
+            logs.configure(log_levels(new))
+        if "log_file" in changed:
+            if new.log_file:
+                logs.open_file()
+            else:
+                supervisor.spawn(logs.close_file(), group="settings", name="on_settings_changed -> close_file")
+        if "update_budget" in changed:
+            update_accounting.budget = new.update_budget or None
+        if "memory_profiling" in changed:
+            if new.memory_profiling:
+                memory_profiler.start()
+            else:
+                memory_profiler.stop()
+        if "watch_cursor" in changed or "follow_cursor" in changed:
+            apply_cursor_settings()
+        if "enable_mv_override" in changed and not new.enable_mv_override and controller.manual:
+            controller.set_manual(False)
+    
+    def track(event: TelemetryEvent, value: float = 0.0) -> None:
+        """Records `event` for telemetry and counts it in what Miku remembers. Memory only, never waits on disk."""
+        telemetry.record(event, value, mascot_id)
+        state_store.increment(f"count.{event.name.lower()}")
+    
+    frame_clock.set_target_fps(settings.fps)
+    logs.configure(log_levels(settings))
+    if settings.log_file:
+        logs.open_file()
+    telemetry.enabled = settings.telemetry
+    telemetry.debug = debug
+    update_accounting.budget = settings.update_budget or None
+    memory_profiler.debug = debug
+    if settings.memory_profiling:
+        memory_profiler.start() # Shared by every mascot, started again is a no-op
+    state_store.debug = debug
+    unsubscribe_settings = settings_store.subscribe(on_settings_changed)
+    settings_store.debug = debug
+    settings_store.watch() # Shared by every mascot
     
     # Timers for Stuff
     interaction_timer: ResettableTimer = None
     interaction_increment: int = 0
     exit_timer: ResettableTimer = None
-    global_timer: DeltaTimer = DeltaTimer(target_fps=FPS)
+    global_timer: FrameTimer = frame_clock.timer() # Frames are shared with every other mascot
+    loop_frames: Counter[str] = Counter()           # Frames drawn per loop, for the performance menu
+    planner = MovementPlanner()                     # Walkable ground across the monitors
+    planner.debug = debug
+    physics = PhysicsWorld()                        # Throws on drag release, with `throw_physics`
+    drag_velocity = VelocityTracker()               # Window positions while dragged
+    released_at: Optional[float] = None             # When the pointer let go, if the platform tells us
     
     # -------- Window Functions --------
     async def to_front_with_delay(delay: float = 1):
         """Sets the window to be `always_on_top` for a duration given by `delay`."""
-        debug_msg(f"Bringing Miku to the front for {delay}s", debug=SHOW_WINDOW_LOGS)
+        window_log.debug("Bringing Miku to the front for %ss", delay)
         page.window.always_on_top = True
-        await asyncio.sleep(delay)
+        await timer_wheel.sleep(delay)
         page.window.always_on_top = False
-        debug_msg("Brought Miku to the front.", debug=SHOW_WINDOW_LOGS)
+        window_log.debug("Brought Miku to the front.")
     
     # -------- Task Helpers --------
     def start_movement_loop() -> None:
-        """Starts Movement Loop"""
-        nonlocal movement_task
-        cancel_task(movement_animation_task)
-        if cancel_task(movement_task):
-            debug_msg("Restarting movement loop", debug=SHOW_MOVEMENT_LOGS)
-        else:
-            debug_msg("Starting movement loop", debug=SHOW_MOVEMENT_LOGS)
-        stop_event.clear()
-        movement_task = asyncio.create_task(coro=movement_loop(), name="start_movement_loop -> movement_loop")
+        """Starts the movement loop, unless it is already running."""
+        if supervisor.is_running("movement"):
+            return
+        movement_log.debug("Starting movement loop")
+        supervisor.start("movement", movement_loop(), name="start_movement_loop -> movement_loop")
         
     def stop_movement_loop() -> None:
         """Stops movement loop."""
-        stop_event.set()
-        cancel_task(movement_animation_task)
-        if cancel_task(movement_task):
-            debug_msg("Stopping movement loop", debug=SHOW_MOVEMENT_LOGS)
+        if supervisor.cancel("movement"):
+            movement_log.debug("Stopping movement loop")
         else:
-            debug_msg("Movement loop already stopped", debug=SHOW_MOVEMENT_LOGS)
+            movement_log.debug("Movement loop already stopped")
+    
+    def stop_movement_animation() -> None:
+        if supervisor.cancel("movement_animation"):
+            movement_log.debug("Cancelled smooth movement task")
             
     def restart_loop_after_delay(delay: Optional[float] = 2.0) -> None:
-        """Restarts the movement loop after a `delay`. If `delay <= 0` then cancel, and `delay` is in seconds."""
-        nonlocal restart_timer_task
-        if cancel_task(restart_timer_task):
-            debug_msg(msg="Cancelled previous restart_timer_task", handler="delayed_restart", debug=SHOW_LOOP_LOGS)
-        stop_movement_loop()
+        """
+        Pauses Miku to talk, then resumes wandering after a `delay` (in seconds).
+        If `delay <= 0` she stays paused, and if `delay` is `None` she resumes right away.
+        Does nothing while she's dragged or thrown, letting go decides what happens next.
+        """
+        if controller.is_in(MikuState.DRAGGED, MikuState.THROWN):
+            return
+        if supervisor.cancel("restart_timer"):
+            loop_log.debug("Cancelled previous restart_timer task")
+        if not controller.fire(MikuTrigger.PAUSE):
+            return
+        
+        if delay is None:
+            controller.fire(MikuTrigger.RESUME)
+            return
         
         if delay <= 0:
-            debug_msg(f"Cancelling restart loop since delay={delay}", debug=SHOW_LOOP_LOGS)
+            loop_log.debug("Cancelling restart loop since delay=%s", delay)
             return
         
-        debug_msg(f"Waiting for {delay}s before restarting loop.", debug=SHOW_LOOP_LOGS)
+        loop_log.debug("Waiting for %ss before restarting loop.", delay)
         
         async def delayed_restart():
-            """Starts movement loop after `delay` and also resets Miku to her `Neutral` state."""
-            await asyncio.sleep(delay)
-            if miku.is_pan_start():
+            """Resumes wandering after `delay` and also resets Miku to her `Neutral` state."""
+            await timer_wheel.sleep(delay)
+            if not controller.is_in(MikuState.CHATTING):
                 return
-            debug_msg(msg="Setting Miku to Neutral", handler="delayed_restart", debug=SHOW_LOOP_LOGS)
+            loop_log.debug("Setting Miku to Neutral")
             miku.set_state(Miku.NEUTRAL)
-            start_movement_loop()
-        
-        if delay is None:
-            start_movement_loop()
-            return
+            controller.fire(MikuTrigger.RESUME)
         
-        restart_timer_task = asyncio.create_task(coro=delayed_restart(), name="delayed_restart")
+        supervisor.start("restart_timer", delayed_restart(), name="delayed_restart")
         
     # -------- Movement (Smooth OS Window Animation) --------
+    def next_step(route: list[int]) -> int:
+        """The next step of `route`, or a random one kept on walkable ground (see `utilities.planner`)."""
+        planner.refresh(get_all_monitors(), page.window.width, page.window.height) # Rebuilt only on changes
+        left, max_step = page.window.left, max(map(abs, settings.move_step))
+        if settings.follow_cursor and cursor is not None and cursor.last is not None:
+            route.clear()
+            dx = cursor.last[0] - miku_center()[0]
+            step = 0 if abs(dx) <= facing.dead_zone else int(max(-max_step, min(dx, max_step)))
+            return step if settings.allow_void_traversal else planner.wander(left, idle_base_top, step)
+        if not route and chance(settings.travel_chance):
+            route.extend(planner.route_to_neighbour(left, idle_base_top, max_step))
+            if route:
+                movement_log.debug("Walking to another screen in %s steps", len(route))
+        if route:
+            return route.pop(0)
+        step = random.randint(*settings.move_step)
+        return step if settings.allow_void_traversal else planner.wander(left, idle_base_top, step)
+    
     async def movement_loop() -> None:
         """Handles the movement loop for Miku."""
-        while not stop_event.is_set() and not mv_override_enabled and not open_menu:
-            if miku.is_pan_start():
-                debug_msg("Stopping Movement Loop :: Miku is being dragged!", debug=SHOW_MOVEMENT_LOGS)
-                break
-            
-            rnd_delay = random.randint(*MIKU_MV_FREQ_MS) / 1000
-            debug_msg(f"Sleeping for {rnd_delay}s", handler="MIKU", debug=SHOW_MOVEMENT_LOGS)
-            await asyncio.sleep(rnd_delay)
+        route: list[int] = []
+        expected_left: Optional[float] = None # Where the last step should have left her
+        while controller.needs(MikuLoop.WANDER):
+            rnd_delay = random.randint(*settings.move_freq_ms) / 1000
+            movement_log.debug("Sleeping for %ss", rnd_delay)
+            await timer_wheel.sleep(rnd_delay)
             
-            rnd_step = random.randint(*MIKU_MV_STEP)
-            debug_msg(
-                msg=f"Moving {rnd_step}px to the {"left" if rnd_step < 0 else "right"}.",
-                handler="MIKU", debug=SHOW_MOVEMENT_LOGS
-            )
-            
-            if not miku.is_pan_start():
-                if chance(MIKU_FLIP_CHANCE):
+            if controller.is_in(MikuState.IDLE):
+                if expected_left is not None and abs(page.window.left - expected_left) > 1:
+                    route.clear() # Dragged or pushed back since, the rest of the route is stale
+                rnd_step = next_step(route)
+                expected_left = page.window.left + rnd_step
+                if movement_log.on: # Skips picking the side while the channel is off
+                    movement_log.debug("Moving %spx to the %s.", rnd_step, "left" if rnd_step < 0 else "right")
+                if chance(settings.flip_chance):
                     rnd_rotation = math.pi * 2 * math.copysign(1, -rnd_step)
                     await start_smooth_movement(step=rnd_step, rotate=rnd_rotation, base_duration=rnd_delay)
                 else:
                     await start_smooth_movement(step=rnd_step, base_duration=rnd_delay)
-            await asyncio.sleep(rnd_delay)
+            await timer_wheel.sleep(rnd_delay)
             
     async def validate_position(step: int, target_left: ft.Number) -> None:
         """Checks whether the window's position is within the boundaries of a valid monitor."""
-        if not check_and_adjust_bounds(page, SHOW_WINDOW_LOGS):
+        if not check_and_adjust_bounds(page, window_log.on):
             delay: Optional[float] = 2
             debug_msg("Miku has entered the void!", debug=debug)
-            stop_movement_loop()
-            stop_idle_bobbing()
-            if not ALLOW_VOID_TRAVERSAL:
-                debug_msg("Attempting to restore position...", debug=SHOW_WINDOW_LOGS)
+            track(TelemetryEvent.VOID, step)
+            controller.fire(MikuTrigger.PAUSE)
+            if not settings.allow_void_traversal:
+                window_log.debug("Attempting to restore position...")
                 page.window.left += -step * 2
-                page.window.update()
+                update_window(page)
             else:
-                debug_msg("WARNING! Miku can move past monitor boundaries.", debug=SHOW_WINDOW_LOGS)
+                window_log.warning("Miku can move past monitor boundaries.")
                 def on_clicked(_) -> None:
                     nonlocal target_left
-                    set_win_pos_bc(get_all_monitors(), page)
-                    page.window.update()
+                    set_win_pos_bc(get_all_monitors(), page, slot=mascot_id)
+                    update_window(page)
                     target_left = page.window.left
                     restart_loop_after_delay(delay)
-                await preset_help_notif(on_clicked=on_clicked)
+                preset_help_notif(on_clicked=on_clicked) # Queued, deduped and rate limited
             # start_idle_bobbing()
             await miku_chat(choose_random_from=WHEN_IN_VOID_MSGS)
             print(f"Using delay of {delay}s for restart_loop_after_delay")
             restart_loop_after_delay(delay)
             
         else:
-            if chance(MIKU_CHAT_CHANCE):
+            if chance(settings.chat_chance):
                 await miku_chat()
     
     async def start_smooth_movement(
         step: int, rotate: Optional[float] = None, base_duration: float = 0.2
     ) -> None:
         """Manages proper starting of the `move_miku_smooth` function."""
-        nonlocal movement_animation_task
+        if not controller.fire(MikuTrigger.STEP):
+            return
         miku_img.rotate = 0
-        miku_img.update()
-        if cancel_task(movement_animation_task):
-            debug_msg("Cancelled previous smooth movement task", debug=SHOW_MOVEMENT_LOGS)
+        update_control(miku_img)
+        if supervisor.is_running("movement_animation"):
+            movement_log.debug("Cancelled previous smooth movement task")
         else:
-            debug_msg("Starting new smooth movement task", debug=SHOW_MOVEMENT_LOGS)
-        movement_animation_task = asyncio.create_task(
-            coro=move_miku_smooth(step, rotate, base_duration),
+            movement_log.debug("Starting new smooth movement task")
+        supervisor.start(
+            "movement_animation", move_miku_smooth(step, rotate, base_duration),
             name="start_smooth_movement -> move_miku_smooth"
         )
     
@@ -216,39 +332,38 @@ async def main_app(page: ft.Page, debug: bool = False):
         """Smoothly animate the OS window horizontally with ease-out curve and jiggle."""
         nonlocal idle_base_top
         idle_base_top = page.window.top
-        stop_idle_bobbing()
         if step == 0:
-            start_idle_bobbing() # nothing to move; ensure idle is running again
+            controller.fire(MikuTrigger.ARRIVE) # nothing to move; back to idle
             return
         miku.set_flipped(step < 0) # Flip sprite based on direction
-        miku_img.rotate = ft.Rotate(MIKU_RT_MOD * (abs(step) / 100)) if rotate is None else rotate
-        miku_img.update()
+        miku_img.rotate = ft.Rotate(settings.rotate_mod * (abs(step) / 100)) if rotate is None else rotate
+        update_control(miku_img)
         duration = base_duration + (abs(step) / 300)  # larger step = slower glide
         start_left = page.window.left                 # Initial window x pos
         target_left = start_left + step               # Target window x pos
         await validate_position(step, target_left)
         JIGGLE_AMP = 3
         elapsed = 0.0
-        while elapsed < duration and not miku.is_pan_start():
+        while elapsed < duration and controller.is_in(MikuState.MOVING):
             dt = await global_timer.tick()
+            loop_frames["glide"] += 1
             elapsed += dt
-            t = min(MINIMUM_ANIM_FRAME, elapsed / duration)
+            t = min(settings.min_anim_frame, elapsed / duration)
             eased_t = 1 - (1 - t) ** 3
             new_left = start_left + (step * eased_t)
             jiggle = math.sin(t * math.tau) * JIGGLE_AMP
             new_top = idle_base_top + jiggle
             page.window.left = new_left
             page.window.top = new_top
-            page.window.update()
-        else:
-            idle_base_top = page.window.top
-            start_idle_bobbing()
+            update_window(page)
+        if not controller.is_in(MikuState.MOVING):
+            return # Dragged, paused or exiting mid-glide; don't snap back to the old target
         # Snap to target to avoid drift
         page.window.left = target_left
         page.window.top = round(idle_base_top)  # reset jiggle rounding
-        page.window.update()
+        update_window(page)
         idle_base_top = page.window.top # Reset baseline for idle bobbing
-        start_idle_bobbing()
+        controller.fire(MikuTrigger.ARRIVE)
         await to_front_with_delay()
         await validate_position(step, target_left)
     
@@ -258,47 +373,88 @@ async def main_app(page: ft.Page, debug: bool = False):
         """Handles the window bobbing animation loop."""
         nonlocal idle_phase, idle_base_top
         miku_img.rotate = 0
-        page.update()
-        while not miku.is_pan_start() and not open_menu:
+        update_page(page)
+        while controller.needs(MikuLoop.BOB):
             dt = await global_timer.tick()
-            idle_phase += IDLE_AMP * dt
+            loop_frames["bob"] += 1
+            idle_phase += settings.idle_amp * dt
             if idle_phase > math.tau:
                 idle_phase -= math.tau
-            offset = math.sin(idle_phase) * IDLE_AMP
+            offset = math.sin(idle_phase) * settings.idle_amp
             page.window.top = idle_base_top + offset
-            page.window.update()
+            update_window(page)
             
+    # ---- Throw Physics (see `utilities.physics`) ----
+    def throw_miku() -> bool:
+        """Throws Miku with the drag's velocity at release. `False` if physics is off or she can't fly from here."""
+        nonlocal released_at
+        if not settings.throw_physics or not controller.can(MikuTrigger.THROW):
+            return False
+        vx, vy = drag_velocity.velocity(now=released_at)
+        drag_velocity.clear()
+        released_at = None
+        physics.gravity, physics.bounce = settings.gravity, settings.bounce
+        physics.set_colliders(get_all_monitors(), page.window.width, page.window.height)
+        if not physics.throw(page.window.left, page.window.top, vx, vy):
+            return False
+        movement_log.debug("Thrown at (%s, %s) px/s", round(vx), round(vy))
+        return controller.fire(MikuTrigger.THROW) # Starts `physics_loop`
+    
+    async def physics_loop() -> None:
+        """Moves the window every frame, interpolated between fixed physics steps, until she lands."""
+        while controller.needs(MikuLoop.PHYSICS):
+            dt = await global_timer.tick()
+            loop_frames["physics"] += 1
+            alpha = physics.advance(dt)
+            page.window.left, page.window.top = physics.position(alpha)
+            update_window(page)
+            if physics.body.resting:
+                supervisor.spawn(on_landed(), group="events", name="physics_loop -> on_landed")
+                controller.fire(MikuTrigger.LAND) # Stops this loop
+                return
+    
+    async def on_landed() -> None:
+        """Same as being put down by hand, see `window_interactions`."""
+        nonlocal idle_base_top
+        monitors = get_all_monitors()
+        check_and_adjust_bounds(page, window_log.on, monitors=monitors)
+        idle_base_top = page.window.top
+        track(TelemetryEvent.DROP)
+        restart_loop_after_delay(await miku_chat(choose_random_from=after_dragged_msgs(page, monitors)))
+    
+    def start_physics() -> None:
+        if not supervisor.is_running("physics"):
+            supervisor.start("physics", physics_loop(), name="start_physics -> physics_loop")
+    
+    def stop_physics() -> None:
+        supervisor.cancel("physics")
+    
     def start_idle_bobbing() -> None:
         """Starts the window bobbing animation."""
-        nonlocal idle_task
-        check_task = is_task_done(idle_task)
-        if check_task and check_task is not None:
-            debug_msg(msg="Idle bobbing already started", handler="MIKU", debug=SHOW_IDLE_LOGS)
+        if supervisor.is_running("idle"):
+            idle_log.debug("Idle bobbing already started")
             return
-        debug_msg(msg="Idle bobbing started", handler="MIKU", debug=SHOW_IDLE_LOGS)
-        idle_task = asyncio.create_task(coro=idle_bobbing_loop(), name="start_idle_bobbing -> idle_bobbing_loop")
+        idle_log.debug("Idle bobbing started")
+        supervisor.start("idle", idle_bobbing_loop(), name="start_idle_bobbing -> idle_bobbing_loop")
 
     def stop_idle_bobbing() -> None:
         """Stops the window bobbing animation."""
-        nonlocal idle_task
-        if cancel_task(idle_task):
-            debug_msg(msg="Idle bobbing stopped", handler="MIKU", debug=SHOW_IDLE_LOGS)
-            idle_task = None
+        if supervisor.cancel("idle"):
+            idle_log.debug("Idle bobbing stopped")
         else:
-            debug_msg(msg="Idle bobbing already stopped", handler="MIKU", debug=SHOW_IDLE_LOGS)
+            idle_log.debug("Idle bobbing already stopped")
     
     # -------- Speech Feature --------
     async def remove_speech(delay: Optional[float] = None) -> None:
         """Animate speech bubble exit animation and wait for it to finish."""
-        nonlocal speech_bubble, is_miku_chatting
         if delay and delay > 0:
-            await asyncio.sleep(delay)
+            await timer_wheel.sleep(delay)
             speech_bubble.opacity = 0
             speech_bubble.offset = ft.Offset(x=0.0, y=1.0)
-            speech_bubble.update()
-            await asyncio.sleep(0.2)
+            update_control(speech_bubble)
+            await timer_wheel.sleep(0.2)
             miku.set_state(Miku.NEUTRAL)
-            is_miku_chatting = False
+            controller.speaking = False
     
     async def miku_chat(
         msg: Optional[str] = None, emote: Optional[Miku] = None,
@@ -321,9 +477,8 @@ async def main_app(page: ft.Page, debug: bool = False):
         Returns:
             float: The `duration` used for displaying the message.
         """
-        nonlocal speech_bubble, speech_timer_task, is_miku_chatting
-        is_miku_chatting = True
-        random_chat = random_line(SPEECH_LINES)
+        controller.speaking = True
+        random_chat = random_line(get_speech_lines())
         chat: str = random_chat["text"]
         emotion: str = random_chat["emotion"]
         
@@ -331,55 +486,50 @@ async def main_app(page: ft.Page, debug: bool = False):
             msg, emote = rnd_miku_chat(choose_random_from)
         
         if duration is None:
-            dynamic_duration = MSG_BASE_TIME + PER_CHAR_TIME * len(chat)
+            dynamic_duration = settings.msg_base_time + settings.per_char_time * len(chat)
             duration = round(dynamic_duration, 3)
             
-        if cancel_task(speech_timer_task):
-            debug_msg(msg="Cancelled previous speech timer", handler="CHAT", debug=SHOW_CHAT_LOGS)
+        if supervisor.cancel("speech_timer"):
+            chat_log.debug("Cancelled previous speech timer")
         else:
-            debug_msg(msg=f"Starting new speech timer with {duration}s", handler="CHAT", debug=SHOW_CHAT_LOGS)
+            chat_log.debug("Starting new speech timer with %ss", duration)
         
         if msg is None and emote:
-            debug_msg(msg="Using a random line for the message", handler="CHAT", debug=SHOW_CHAT_LOGS)
+            chat_log.debug("Using a random line for the message")
         elif msg and emote is None:
-            debug_msg(msg="Using a random emote for the message", handler="CHAT", debug=SHOW_CHAT_LOGS)
+            chat_log.debug("Using a random emote for the message")
         elif msg is None and emote is None:
-            debug_msg(msg="Generating a random chat from list", handler="CHAT", debug=SHOW_CHAT_LOGS)
+            chat_log.debug("Generating a random chat from list")
         else:
-            debug_msg(msg="Using provided params for the message", handler="CHAT", debug=SHOW_CHAT_LOGS)
+            chat_log.debug("Using provided params for the message")
         
         miku.set_state(getattr(Miku, emotion.upper(), emotion) if emote is None else emote)
         speech_text: ft.Text = speech_bubble.content
         speech_text.value = chat if msg is None else msg
         speech_bubble.offset = ft.Offset(x=0.0, y=0.0)
         speech_bubble.opacity = 1
-        speech_bubble.update()
-        asyncio.create_task(asyncio.sleep(0.2))
-        start_idle_bobbing() # ensure idle is running (idempotent) (Mr. GPT truly out here with technical jargon)
-        debug_msg(f"Miku's chat will be shown {f"for {duration}s" if duration > 0 else "indefinitely"}.", debug=SHOW_CHAT_LOGS)
+        update_control(speech_bubble)
         if duration > 0:
-            speech_timer_task = asyncio.create_task(coro=remove_speech(duration), name="miku_chat -> remove_speech")
+            chat_log.debug("Miku's chat will be shown for %ss.", duration)
+            supervisor.start("speech_timer", remove_speech(duration), name="miku_chat -> remove_speech")
         else:
-            speech_timer_task = None
+            chat_log.debug("Miku's chat will be shown indefinitely.")
         return duration
 
     # -------- Event Handlers --------
     async def on_keyboard_event(e: ft.KeyboardEvent) -> None:
-        nonlocal mv_override_enabled
-        if exit_app:
+        if controller.exit_armed or controller.is_in(MikuState.EXITING):
             return
         # print(f"Detected key press: {e.key}")
-        if e.key == "`" and ENABLE_MV_OVERRIDE:
-            mv_override_enabled = not mv_override_enabled
-            if mv_override_enabled:
-                stop_movement_loop()
+        if e.key == "`" and settings.enable_mv_override:
+            controller.set_manual(not controller.manual)
+            if controller.manual:
                 await miku_chat(
                     msg="S-something's wrong... I seem to can't move on my own anymore? (´。＿。｀)",
                     emote=Miku.SHOCK)
             else:
-                start_movement_loop()
                 await miku_chat(msg="I can move again now! (/≧▽≦)/", emote=Miku.JOY)
-        if mv_override_enabled:
+        if controller.manual:
             step = 100
             if e.key == "D":
                 await start_smooth_movement(step)
@@ -389,75 +539,104 @@ async def main_app(page: ft.Page, debug: bool = False):
     async def window_interactions(e: ft.WindowEvent) -> None:
         """Various window interactions with Miku."""
         delay: float = 2
-        if e.type == ft.WindowEventType.MOVED: # After drag
+        if e.type == ft.WindowEventType.MOVED: # After drag (settled, see `window_events`)
+            if controller.is_in(MikuState.THROWN) or throw_miku():
+                return # `physics_loop` puts her down once she lands
             # user moved window; update baseline and resume idle
-            check_and_adjust_bounds(page, SHOW_WINDOW_LOGS)
-            miku.set_pan_start(False)
+            monitors = get_all_monitors() # Enumerate once for both the bounds and the messages
+            check_and_adjust_bounds(page, window_log.on, monitors=monitors)
+            if not controller.fire(MikuTrigger.DROP):
+                return # Not put down by hand, nothing to react to
             
             # IMPORTANT: update idle baseline to user's new position
             nonlocal idle_base_top
             idle_base_top = page.window.top
-            delay = await miku_chat(choose_random_from=after_dragged_msgs(page))
+            track(TelemetryEvent.DROP)
+            delay = await miku_chat(choose_random_from=after_dragged_msgs(page, monitors))
             
         elif e.type == ft.WindowEventType.BLUR:
+            track(TelemetryEvent.WINDOW_BLUR)
             if chance(50):
                 delay = await miku_chat(msg="Are you just going to leave me here? o(≧口≦)o", emote=Miku.AMGRY)
             else:
                 miku.set_state(Miku.AMGRY)
             await to_front_with_delay()
             
-        elif e.type == ft.WindowEventType.FOCUS and not is_miku_chatting:
+        elif e.type == ft.WindowEventType.FOCUS and not controller.speaking:
+            track(TelemetryEvent.WINDOW_FOCUS)
             delay = await miku_chat(msg="Hi! q(≧▽≦q)", emote=Miku.JOY)
             
         restart_loop_after_delay(delay)
     
     async def on_event(e: ft.WindowEvent) -> None:
         """Handles manual application exit logic."""
-        if exit_app:
+        if controller.exit_armed or controller.is_in(MikuState.EXITING):
             return
         if e.type == ft.WindowEventType.CLOSE:
             await exit_miku()
-        if not open_menu:
+            return
+        in_menu = controller.is_in(MikuState.MENU)
+        if not in_menu:
             await window_interactions(e)
-        check_and_adjust_bounds(page, SHOW_WINDOW_LOGS)
+        if controller.is_in(MikuState.THROWN):
+            return # Flying across monitor edges, `on_landed` adjusts once she's down
+        if e.type != ft.WindowEventType.MOVED or in_menu: # Otherwise already adjusted above
+            check_and_adjust_bounds(page, window_log.on)
 
+    async def on_window_event(e: ft.WindowEvent) -> None:
+        """Samples the drag's positions before `window_events` debounces them, for throws."""
+        if e.type in (ft.WindowEventType.MOVE, ft.WindowEventType.MOVED) and controller.is_in(MikuState.DRAGGED):
+            drag_velocity.push(page.window.left, page.window.top)
+        await window_events.push(e)
+    
     async def on_drag_start(_) -> None:
-        nonlocal exit_app
-        exit_app = False
-        miku.set_pan_start(True)
-        if exit_app or open_menu:
+        nonlocal released_at
+        controller.exit_armed = False
+        gestures.reset()
+        drag_velocity.clear()
+        released_at = None
+        if not controller.fire(MikuTrigger.DRAG):
             return
+        track(TelemetryEvent.DRAG)
         await miku_chat(choose_random_from=WHEN_DRAGGED_MSGS, duration=0)
+    
+    def on_drag_end(_) -> None:
+        nonlocal released_at
+        released_at = time.monotonic() # The throw waits for the settled MOVED, with the velocity of this moment
 
     def on_enter(_) -> None: # User hovers over Miku
-        if not (
-            open_menu or is_miku_chatting
-            or miku.is_pan_start() or exit_app
+        if (
+            controller.is_in(MikuState.IDLE, MikuState.MOVING, MikuState.CHATTING)
+            and not (controller.speaking or controller.exit_armed)
         ):
             miku.set_state(Miku.READY)
 
     def on_exit(_) -> None: # Default state for Miku
-        if not (
-            miku.is_pan_start() or stop_event.is_set()
-            or exit_app or open_menu or is_miku_chatting
+        if (
+            controller.is_in(MikuState.IDLE, MikuState.MOVING)
+            and not (controller.speaking or controller.exit_armed)
         ):
             miku.set_state(Miku.NEUTRAL)
     
     async def on_tap_down(e: ft.TapEvent) -> None:
-        nonlocal interaction_increment, interaction_timer, exit_app
-        if exit_app or miku.is_pan_start():
+        nonlocal interaction_increment, interaction_timer
+        if controller.exit_armed or controller.is_in(MikuState.DRAGGED, MikuState.THROWN, MikuState.EXITING):
             return
         delay: float = 2
         local_position: ft.Offset = e.local_position
-        stop_movement_loop()
-        exit_app = False
+        gestures.push(local_position.x, local_position.y, pressed=True)
         
-        if open_menu:
+        if controller.is_in(MikuState.MENU):
             delay = await miku_chat(
                 msg="Just select an option from the menu. I'll be waiting! ヾ(≧ ▽ ≦)ゝ",
                 emote=Miku.HAPPY)
             return
-        if is_within_radius(center=ft.Offset(x=141.0, y=210.0), point=local_position, radius=40):
+        region = miku.hit_test(local_position.x - SPRITE_LEFT, local_position.y - SPRITE_TOP)
+        if region is Region.NONE:
+            return # Tapped the transparent space around her
+        controller.fire(MikuTrigger.PAUSE)
+        if region is Region.FLUSTERED:
+            track(TelemetryEvent.TAP, 2)
             # print(interaction_increment)
             if not interaction_increment >= 5:
                 if interaction_timer is None:
@@ -469,72 +648,107 @@ async def main_app(page: ft.Page, debug: bool = False):
                     interaction_increment = 0
             else:
                 await interaction_timer.expired.wait()
-                exit_app = True
+                controller.exit_armed = True
+                track(TelemetryEvent.FED_UP)
                 await miku_chat(choose_random_from=WHEN_FED_UP_MSGS, duration=0)
                 await exit_miku(chat=False)
                 return
             
-        elif is_within_radius(center=ft.Offset(x=121.0, y=135.0), point=local_position, radius=50):
+        elif region is Region.HEADPAT:
+            track(TelemetryEvent.TAP, 1)
             delay = await miku_chat(choose_random_from=WHEN_HEADPAT_MSGS)
             
         else:
+            track(TelemetryEvent.TAP, 0)
             delay = await miku_chat()
         restart_loop_after_delay(delay)
     
+    # -------- Strokes (see `utilities.gestures`) --------
+    STROKE_MSGS = {Stroke.PAT: WHEN_HEADPAT_MSGS, Stroke.RUB: WHEN_RUBBED_MSGS, Stroke.SHAKE: WHEN_SHAKEN_MSGS}
+    
+    def on_hover(e: ft.HoverEvent) -> None:
+        if controller.is_in(MikuState.IDLE, MikuState.MOVING, MikuState.CHATTING):
+            gestures.push(e.local_position.x, e.local_position.y)
+    
+    def on_stroke(stroke: Stroke, _features: dict) -> None:
+        """Called from the timer wheel once a stroke is classified. Pokes are left to `on_tap_down`."""
+        track(TelemetryEvent.STROKE, STROKE_CODES[stroke])
+        if (
+            stroke in STROKE_MSGS and controller.is_in(MikuState.IDLE, MikuState.MOVING)
+            and not (controller.speaking or controller.exit_armed)
+        ):
+            supervisor.spawn(react_to_stroke(stroke), group="gestures", name=f"on_stroke -> {stroke.value}")
+    
+    async def react_to_stroke(stroke: Stroke) -> None:
+        controller.fire(MikuTrigger.PAUSE)
+        delay = await miku_chat(choose_random_from=STROKE_MSGS[stroke])
+        restart_loop_after_delay(delay)
+    
+    gestures = GestureRecognizer(on_stroke=on_stroke)
+    gestures.debug = debug
+    
     async def on_double_tap(_) -> None:
-        nonlocal open_menu, menu_container
-        if exit_app:
+        if controller.exit_armed or controller.is_in(MikuState.EXITING):
             return
-        debug_msg(f"{"Opening" if not open_menu else "Closing"} the menu!", debug=debug)
-        open_menu = not open_menu
+        open_menu = not controller.is_in(MikuState.MENU)
+        debug_msg(f"{"Opening" if open_menu else "Closing"} the menu!", debug=debug)
         if open_menu:
+            if not controller.fire(MikuTrigger.OPEN_MENU):
+                return
+            track(TelemetryEvent.MENU_OPEN)
             await miku_chat(msg="Welcome to the menu! What do you want to do? o(*￣▽￣*)ブ", emote=Miku.HAPPY)
-            stop_idle_bobbing()
-            stop_movement_loop()
             page.window.height += HEIGHT_INCREASE
             page.window.width += WIDTH_INCREASE
             page.window.top -= HEIGHT_INCREASE
             miku_img_container.expand = False
             menu_container.visible = True
-            page.update()
-            await show_menu_animation(main_menu_ctrl)
+            update_page(page)
+            await show_menu_animation(menus.get("main"))
         else:
             await close_menu_and_reset_anim()
-            start_idle_bobbing()
             restart_loop_after_delay(await miku_chat())
-            page.update()
+            update_page(page)
 
     async def on_secondary_tap(_) -> None: # When user right-clicks (or secondary) Miku
-        nonlocal exit_timer, exit_app, disable, form
+        nonlocal exit_timer
         delay: float = 2
         
-        if disable:
-            form.disabled = disable
-            form.update()
+        if controller.is_in(MikuState.EXITING):
+            form.disabled = True
+            update_control(form)
             return
-        if exit_app:
-            disable = True
+        if controller.exit_armed:
             if exit_timer:
                 exit_timer.cancel()
             await exit_miku()
             return
             
-        exit_app = True
+        controller.exit_armed = True
         delay = await miku_chat(
             msg="Right-click me again if you want me to leave... ~(>_<。)\\", 
             emote=Miku.PONDER)
         if exit_timer is None:
             exit_timer = ResettableTimer(delay)
         exit_timer.start()
-        stop_movement_loop()
         restart_loop_after_delay(delay)
         await exit_timer.expired.wait()
-        exit_app = False
+        controller.exit_armed = False
     
     async def on_close(_):
         debug_msg("Window has been closed manually!", debug=debug)
         await exit_miku()
     
+    # Debounces drag storms into one settled MOVED, and throttles focus flapping
+    window_events = EventPipeline(
+        handler=on_event, rules={
+            ft.WindowEventType.MOVED: EventRule(EventPolicy.DEBOUNCE, interval=0.25),
+            ft.WindowEventType.RESIZED: EventRule(EventPolicy.DEBOUNCE, interval=0.25),
+            ft.WindowEventType.FOCUS: EventRule(EventPolicy.THROTTLE, interval=1.0, max_age=1.0),
+            ft.WindowEventType.BLUR: EventRule(EventPolicy.THROTTLE, interval=1.0, max_age=1.0),
+        },
+        spawn=lambda coro: supervisor.spawn(coro=coro, group="events"), log=window_log
+    )
+    
     # -------- Events --------
     async def cleanup_then_exit() -> None:
         """
@@ -544,11 +758,44 @@ async def main_app(page: ft.Page, debug: bool = False):
         debug_msg("Window closing... Cleaning up tasks.", debug=debug)
         interaction_timer = None
         exit_timer = None
-        for task in tasks:
-            await await_task_completion(task)
+        instance_server.off(on_show_command, on_focus_command, on_chat_command, on_exit_command)
+        debug_msg(f"Window event rates: {window_events.metrics()}", handler="EVENTS", debug=debug)
+        window_events.cancel()
+        debug_msg(f"Behavior stats: {controller.stats()}", handler="CONTROLLER", debug=debug)
+        debug_msg(f"Planner: {planner.stats()}", handler="PLANNER", debug=debug)
+        if cursor is not None:
+            cursor.stop()
+            debug_msg(f"Cursor: {cursor.stats()}, turns: {facing.turns}", handler="POINTER", debug=debug)
+        debug_msg(f"Strokes: {gestures.stats()}", handler="GESTURES", debug=debug)
+        debug_msg(f"Live tasks per slot: {supervisor.counts()}", handler="TASKS", debug=debug)
+        debug_msg(f"Task audit: {supervisor.report()}", handler="TASKS", debug=debug)
+        unsubscribe_settings()
+        state_store.touch("last_seen")
+        await supervisor.shutdown()
+        if mascots.leave(mascot_id): # Shared systems go down with the last mascot
+            settings_store.stop_watching()
+            await telemetry.close()
+            await state_store.close()
+            await instance_server.close()
+            debug_msg(f"Notifications: {notifications.stats()}", handler="NOTIFY", debug=debug)
+            await notifications.close()
+            debug_msg(f"Update traffic: {update_accounting.stats()}", handler="ACCOUNTING", debug=debug)
+            await logs.close_file()
+            if memory_profiler.running:
+                await memory_profiler.write_report("exit")
+                memory_profiler.stop()
+            debug_msg(f"Frame clock: {frame_clock.stats()}", handler="TIMERS", debug=debug)
+            debug_msg(f"Timer wheel: {timer_wheel.stats()}", handler="TIMERS", debug=debug)
+            await timer_wheel.close()
+        if settings.sprites_in_memory:
+            debug_msg(f"Sprite cache report: {miku.cache_report()}", handler="MIKU", debug=debug)
+        save_snapshot(
+            take_snapshot(page, get_all_monitors(), miku.state, top=idle_base_top),
+            get_session_path(mascot_id)
+        )
         page.window.prevent_close = False
-        page.window.update()
-        await asyncio.sleep(0.1)
+        update_window(page)
+        await asyncio.sleep(0.1) # Not the wheel: the last mascot to leave has just closed it
         try:
             await page.window.close()
         except:
@@ -557,18 +804,47 @@ async def main_app(page: ft.Page, debug: bool = False):
     
     async def exit_miku(chat: bool = True) -> None:
         delay: float = 1
-        if open_menu:
+        if controller.is_in(MikuState.EXITING):
+            return
+        if controller.is_in(MikuState.MENU):
             await close_menu_and_reset_anim()
+        controller.fire(MikuTrigger.EXIT)
         if chat:
             delay = await miku_chat(choose_random_from=EXIT_APP_MSGS)
-        stop_movement_loop()
         debug_msg(msg="Bye bye...", handler="MIKU", debug=debug)
         await exit_animation(miku_img, delay, debug)
-        stop_idle_bobbing()
-        await asyncio.sleep(delay)
+        await timer_wheel.sleep(delay)
         await cleanup_then_exit()
     
+    # -------- Forwarded Commands (from another launch, see `utilities.instance`) --------
+    async def on_show_command(_: str) -> None:
+        if controller.is_in(MikuState.EXITING):
+            return
+        page.window.minimized = False
+        page.window.visible = True
+        check_and_adjust_bounds(page, window_log.on)
+        update_window(page)
+        await to_front_with_delay()
+    
+    async def on_focus_command(_: str) -> None:
+        if controller.is_in(MikuState.EXITING):
+            return
+        page.window.minimized = False
+        update_window(page)
+        await to_front_with_delay()
+        if not controller.speaking:
+            restart_loop_after_delay(await miku_chat(msg="You called? (・∀・)", emote=Miku.HAPPY))
+    
+    async def on_chat_command(text: str) -> None:
+        if controller.is_in(MikuState.EXITING, MikuState.DRAGGED, MikuState.THROWN, MikuState.MENU):
+            return
+        restart_loop_after_delay(await miku_chat(msg=text) if text else await miku_chat())
+    
+    async def on_exit_command(_: str) -> None:
+        await exit_miku()
+    
     async def close_all_visible_menus_anim() -> None:
+        supervisor.cancel("hud") # Only refreshes while it's on screen
         for menu in menu_column.controls:
             if menu.visible:
                 await exit_menu_animation(menu)
@@ -582,115 +858,212 @@ async def main_app(page: ft.Page, debug: bool = False):
         page.window.height -= HEIGHT_INCREASE
         page.window.width -= WIDTH_INCREASE
         page.window.top += HEIGHT_INCREASE
-        page.update()
+        controller.fire(MikuTrigger.CLOSE_MENU)
+        track(TelemetryEvent.MENU_CLOSE)
+        update_page(page)
         
-    async def open_test_menu() -> None:
+    async def open_submenu(name: str) -> None:
         await close_all_visible_menus_anim()
-        await show_menu_animation(test_menu_ctrl)
+        await show_menu_animation(menus.get(name))
     
-    async def close_test_menu() -> None:
-        await close_all_visible_menus_anim()
-        await show_menu_animation(main_menu_ctrl)
+    async def back_to_main_menu() -> None:
+        """Every submenu's "Go Back", and the performance HUD's."""
+        await open_submenu("main")
+    
+    async def open_perf_menu() -> None:
+        await open_submenu("performance")
+        supervisor.start("hud", perf_hud.run(), name="open_perf_menu -> PerformanceHud.run")
+    
+    async def save_memory_report() -> None:
+        path = await memory_profiler.write_report("manual")
+        if path is None:
+            await miku_chat(msg="I couldn't save the memory report... (；′⌒`)", emote=Miku.THINKING)
+        else:
+            await miku_chat(msg=f"Saved the memory report as {path.name}! (￣▽￣)ゞ", emote=Miku.HAPPY)
+    
+    async def audit_tasks(interval: float = 60.0) -> None:
+        """Debug only: every `interval` seconds, reports tasks that look leaked (see `TaskSupervisor.report`)."""
+        while True:
+            await timer_wheel.sleep(interval)
+            report = supervisor.report()
+            if report["long_running"] or report["untracked"]:
+                debug_msg(f"Task audit: {report}", handler="TASKS", debug=debug)
         
-    # -------- Setup Miku --------
-    miku = DynamicMiku(Miku.NEUTRAL, debug=False)
-    miku_img = miku.get_image()
-    anim_setup_main(miku_img)
-    
-    miku_img_container = ft.Container(
-        content=miku_img, padding=10, alignment=ft.Alignment.BOTTOM_LEFT,
-        expand=True
-    )
+    # -------- Menus (built on first open, see `MenuCache`) --------
+    def go_back_entry() -> MenuEntry:
+        return MenuEntry("Go Back", lambda e: supervisor.spawn(coro=back_to_main_menu(), group="menu", name=e.name))
     
-    main_menu = DefaultMenu("-- Action Menu --\nSelect any option from below to try!")
-    main_menu.add_button("Ask Miku to Exit the App", lambda e: asyncio.create_task(
-        coro=exit_miku(), name=f"{e.name} -> exit_miku()"))
-    main_menu.add_button("Talk With Miku", lambda e: asyncio.create_task(
-        coro=miku_chat(), name=f"{e.name} -> miku_chat()"))
-    main_menu.add_button("Ask Miku the Date and Time", lambda e: asyncio.create_task(
-        coro=miku_chat(f"Today is {get_date()}, and the time is {get_time()}! []~(￣▽￣)~*", Miku.READING),
-        name=f"{e.name} -> miku_chat()"))
-    main_menu.add_button("Test Another Menu", lambda e: asyncio.create_task(
-        coro=open_test_menu(), name=e.name
-    ))
-    main_menu_ctrl = main_menu.build()
-    
-    test_menu = DefaultMenu("-- Test Menu --\nI don't do anything yet.")
-    test_menu.add_button("Go Back", lambda e: asyncio.create_task(
-        coro=close_test_menu(), name=e.name
-    ))
-    test_menu.add_button("I'm a Button")
-    test_menu.add_button("I'm a Button as well")
-    test_menu_ctrl = test_menu.build()
-    
-    menu_column = ft.Column(
-        controls=[main_menu_ctrl, test_menu_ctrl], expand=True,
-        alignment=ft.MainAxisAlignment.CENTER,
-        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-    )
-    menu_container = ft.Container(
-        content=menu_column, alignment=ft.Alignment.CENTER,
-        expand=True, visible=False
-    )
+    def say_line_entry(line: dict) -> MenuEntry:
+        emote = getattr(Miku, line["emotion"].upper(), None)
+        return MenuEntry(line["text"], lambda e: supervisor.spawn(
+            coro=miku_chat(line["text"], emote), group="menu", name=f"{e.name} -> miku_chat()"))
     
-    miku_row = ft.Row(
-        controls=[miku_img_container, menu_container], alignment=ft.MainAxisAlignment.START,
-        vertical_alignment=ft.CrossAxisAlignment.CENTER
-    )
-    miku_column = ft.Column(
-        controls=[miku_row], expand=False,
-        horizontal_alignment=ft.CrossAxisAlignment.START,
-        alignment=ft.MainAxisAlignment.END
-    )
+    def build_perf_hud() -> ft.Container:
+        nonlocal perf_hud
+        perf_hud = PerformanceHud(
+            PerfSampler(loop_frames, supervisor.active_count, supervisor.report),
+            on_back=lambda e: supervisor.spawn(coro=back_to_main_menu(), group="menu", name=e.name)
+        )
+        perf_hud.add_button("Save Memory Report", lambda e: supervisor.spawn(
+            coro=save_memory_report(), group="menu", name=f"{e.name} -> save_memory_report()"))
+        return perf_hud.build()
     
-    speech_column = ft.Column(
-        controls=[speech_bubble],
-        horizontal_alignment=ft.CrossAxisAlignment.START,
-        alignment=ft.MainAxisAlignment.START
-    )
+    def declare_menus() -> None:
+        open_menu = lambda name: lambda e: supervisor.spawn(coro=open_submenu(name), group="menu", name=e.name)
+        menus.declare("main", MenuSpec("-- Action Menu --\nSelect any option from below to try!", [
+            MenuEntry("Ask Miku to Exit the App", lambda e: supervisor.spawn(
+                coro=exit_miku(), group="menu", name=f"{e.name} -> exit_miku()")),
+            MenuEntry("Talk With Miku", lambda e: supervisor.spawn(
+                coro=miku_chat(), group="menu", name=f"{e.name} -> miku_chat()")),
+            MenuEntry("Ask Miku the Date and Time", lambda e: supervisor.spawn(
+                coro=miku_chat(f"Today is {get_date()}, and the time is {get_time()}! []~(￣▽￣)~*", Miku.READING),
+                group="menu", name=f"{e.name} -> miku_chat()")),
+            MenuEntry("Things Miku Can Say", open_menu("lines")),
+            MenuEntry("Test Another Menu", open_menu("test")),
+            MenuEntry("Performance", lambda e: supervisor.spawn(coro=open_perf_menu(), group="menu", name=e.name)),
+        ]))
+        menus.declare("test", MenuSpec("-- Test Menu --\nI don't do anything yet.", [
+            go_back_entry(), MenuEntry("I'm a Button"), MenuEntry("I'm a Button as well"),
+        ]))
+        menus.declare("lines", MenuSpec( # Read on first open; virtual once there are many lines
+            "-- Things Miku Can Say --\nPick one and she'll say it!",
+            lambda: [go_back_entry()] + [say_line_entry(line) for line in get_speech_lines()]
+        ))
+        menus.declare("performance", build_perf_hud)
     
-    miku_stack = ft.Stack(
-        controls=[miku_column, speech_column],
-        alignment=ft.Alignment.CENTER, expand=True,
-    )
+    # -------- Boot Stages --------
+    async def load_secondary() -> None:
+        """Warms the speech content, memories and notifications after Miku is shown."""
+        await asyncio.to_thread(get_speech_lines)
+        await asyncio.to_thread(hit_maps.warm, list(MikuStates)) # From `hitmaps.bin`, only changed sprites are decoded
+        await asyncio.to_thread(state_store.load) # One query for everything Miku remembers
+        if mascot_id == 0:
+            state_store.increment("launches")
+            if state_store.get("first_seen") is None:
+                state_store.touch("first_seen")
+        notifications.warm()
     
-    miku_container = ft.Container(
-        content=miku_stack, expand=True, alignment=ft.Alignment.CENTER
-    )
+    boot = BootPipeline(debug=debug)
+    perf_hud: Optional[PerformanceHud] = None # Built with its menu
     
-    miku_gs = ft.GestureDetector(
-        content=miku_container,
-        mouse_cursor=ft.MouseCursor.GRAB,
-        on_double_tap=on_double_tap,
-        on_enter=on_enter,
-        on_exit=on_exit,
-        on_tap_down=on_tap_down,
-        on_secondary_tap=on_secondary_tap,
-        expand=True
-    )
+    # ---- Stage 1: First Frame (window + sprite only) ----
+    with boot.stage(BootStage.FIRST_FRAME):
+        snapshot = get_restored_snapshot(mascot_id)
+        initial_state = Miku[snapshot.expression] if snapshot and snapshot.expression in Miku.__members__ else Miku.NEUTRAL
+        miku = DynamicMiku(initial_state, debug=False, in_memory=settings.sprites_in_memory)
+        miku_img = miku.get_image()
+        anim_setup_main(miku_img)
+        
+        miku_img_container = ft.Container(
+            content=miku_img, padding=10, alignment=ft.Alignment.BOTTOM_LEFT,
+            expand=True
+        )
+        
+        # Menus are added as they're first opened
+        menu_column = ft.Column(
+            controls=[], expand=True,
+            alignment=ft.MainAxisAlignment.CENTER,
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+        )
+        menu_container = ft.Container(
+            content=menu_column, alignment=ft.Alignment.CENTER,
+            expand=True, visible=False
+        )
+        menus = MenuCache(menu_column)
+        declare_menus() # Specs only, no controls yet
+        
+        miku_row = ft.Row(
+            controls=[miku_img_container, menu_container], alignment=ft.MainAxisAlignment.START,
+            vertical_alignment=ft.CrossAxisAlignment.CENTER
+        )
+        miku_column = ft.Column(
+            controls=[miku_row], expand=False,
+            horizontal_alignment=ft.CrossAxisAlignment.START,
+            alignment=ft.MainAxisAlignment.END
+        )
+        
+        speech_column = ft.Column(
+            controls=[speech_bubble],
+            horizontal_alignment=ft.CrossAxisAlignment.START,
+            alignment=ft.MainAxisAlignment.START
+        )
+        
+        miku_stack = ft.Stack(
+            controls=[miku_column, speech_column],
+            alignment=ft.Alignment.CENTER, expand=True,
+        )
+        
+        miku_container = ft.Container(
+            content=miku_stack, expand=True, alignment=ft.Alignment.CENTER
+        )
+        
+        miku_gs = ft.GestureDetector(
+            content=miku_container,
+            mouse_cursor=ft.MouseCursor.GRAB,
+            expand=True
+        )
+        
+        form = ft.WindowDragArea(
+            content=miku_gs, maximizable=False,
+            expand=True
+        )
+        
+        page.add(form)
+        startup_profiler.mark("layout_build")
+        
+        if not debug: # Temporary solution for stretching during launch
+            page.decoration = ft.BoxDecoration(border_radius=10, border=ft.Border.all(2, ft.Colors.PRIMARY))
+            update_page(page)
+            await timer_wheel.sleep(0.1)
+            page.decoration = None
+            update_page(page)
+        
+        check_and_adjust_bounds(page, window_log.on)
+        debug_msg("...And Hatsune Miku enters the screen!", debug=debug)
+    startup_profiler.mark("first_frame")
+    opening_task = supervisor.spawn(coro=opening_animation(miku_img), group="boot", name="opening_animation")
+    
+    # ---- Stage 2: Interaction Handlers ----
+    with boot.stage(BootStage.HANDLERS):
+        miku_gs.on_double_tap = on_double_tap
+        miku_gs.on_enter = on_enter
+        miku_gs.on_exit = on_exit
+        miku_gs.on_tap_down = on_tap_down
+        miku_gs.on_secondary_tap = on_secondary_tap
+        miku_gs.hover_interval = 20 # ms, enough samples for strokes without flooding the channel
+        miku_gs.on_hover = on_hover
+        form.on_drag_start = on_drag_start
+        form.on_drag_end = on_drag_end
+        page.on_keyboard_event = on_keyboard_event
+        page.on_close = on_close
+        page.window.on_event = on_window_event
+        controller.register_loop(MikuLoop.WANDER, start_movement_loop, stop_movement_loop)
+        controller.register_loop(MikuLoop.BOB, start_idle_bobbing, stop_idle_bobbing)
+        controller.register_loop(MikuLoop.ANIMATION, None, stop_movement_animation)
+        controller.register_loop(MikuLoop.PHYSICS, start_physics, stop_physics)
+        spawn_ipc = lambda coro: supervisor.spawn(coro=coro, group="ipc", name="instance_command")
+        instance_server.debug = debug
+        instance_server.on(InstanceCommand.SHOW, on_show_command, spawn_ipc)
+        instance_server.on(InstanceCommand.FOCUS, on_focus_command, spawn_ipc)
+        instance_server.on(InstanceCommand.CHAT, on_chat_command, spawn_ipc)
+        instance_server.on(InstanceCommand.EXIT, on_exit_command, spawn_ipc)
+        await instance_server.start() # Only the first mascot actually starts it
+        apply_cursor_settings()
+        if debug:
+            supervisor.start("task_audit", audit_tasks(), name="audit_tasks")
+        update_control(form)
     
-    form = ft.WindowDragArea(
-        content=miku_gs, maximizable=False, on_drag_start=on_drag_start,
-        expand=True
+    # ---- Stage 3: Content and Notifications (background) ----
+    boot.run_in_background(
+        BootStage.SECONDARY, load_secondary(), start=lambda coro, name: supervisor.start("secondary", coro, name=name)
     )
     
-    page.on_keyboard_event = on_keyboard_event
-    page.on_close = on_close
-    page.window.on_event = on_event
-    page.add(form)
-    
-    if not debug: # Temporary solution for stretching during launch
-        page.decoration = ft.BoxDecoration(border_radius=10, border=ft.Border.all(2, ft.Colors.PRIMARY))
-        page.update()
-        await asyncio.sleep(0.1)
-        page.decoration = None
-        page.update()
-    
-    check_and_adjust_bounds(page, SHOW_WINDOW_LOGS)
-    debug_msg("...And Hatsune Miku enters the screen!", debug=debug)
-    await opening_animation(miku_img)
-    restart_loop_after_delay(await miku_chat(choose_random_from=CHAT_GREETINGS))
-
+    await opening_task
+    controller.begin()
+    restart_loop_after_delay(await miku_chat(choose_random_from=chat_greetings()))
+    await boot.wait_for(BootStage.SECONDARY)
+    debug_msg(f"Boot stage timings: {boot.timings()}", handler="BOOT", debug=debug)
+    startup_profiler.save(debug=debug)
 
 if __name__ == "__main__":
     ft.run(main=main_app, before_main=before_main_app)
\ No newline at end of file
@@ -1,32 +1,45 @@
+from __future__ import annotations
+
 import flet as ft
 
-from screeninfo import Monitor
-from typing import List
+from typing import List, TYPE_CHECKING
 from ui.styles import transparent_window
+from utilities.accounting import update_page
 from utilities.monitor import get_all_monitors
 from utilities.debug import debug_msg
+from utilities.profiler import startup_profiler
+from utilities.session import restore_session
+
+if TYPE_CHECKING:
+    from screeninfo import Monitor
 
 
-def set_win_pos_bc(monitors: List[Monitor], page: ft.Page):
-    """Sets the window's position to the primary monitor's bottom center."""
+def set_win_pos_bc(monitors: List[Monitor], page: ft.Page, slot: int = 0):
+    """
+    Sets the window's position to the primary monitor's bottom center.
+    Extra mascots (`slot > 0`) line up beside it, alternating right and left.
+    """
     if monitors:
         primary = monitors[0] # Gets the primary monitor
         window = page.window
         
         # Sets the window horizontally centered
-        window.left = primary.x + (primary.width - window.width) / 2
+        side = (slot + 1) // 2 * (1 if slot % 2 else -1)
+        window.left = primary.x + (primary.width - window.width) / 2 + side * window.width
         
         # Sets the window vertically centered
         window.top = primary.y + primary.height - window.height
 
-async def before_main_app(page: ft.Page, debug: bool = False):
+async def before_main_app(page: ft.Page, debug: bool = False, mascot_id: int = 0):
     """Serves as the setup function. Must be called before the `main`."""
     # -------- Before Main App --------
     transparent_window(page, width=288, height=270, debug=debug)
     
     # -- Set Window Position --
-    monitors = get_all_monitors()
-    set_win_pos_bc(monitors, page)
+    with startup_profiler.phase("window_position"):
+        monitors = get_all_monitors()
+        if restore_session(page, monitors, debug=debug, mascot_id=mascot_id) is None: # Warm start if the layout hasn't changed
+            set_win_pos_bc(monitors, page, slot=mascot_id)
     
     # Attach global page/window handlers before main starts.
     def on_keyboard_event(e: ft.KeyboardEvent):
@@ -41,4 +54,4 @@ async def before_main_app(page: ft.Page, debug: bool = False):
         page.on_keyboard_event = on_keyboard_event
     
     page.window.on_event = on_window_event
-    page.update()
\ No newline at end of file
+    update_page(page)
\ No newline at end of file
@@ -1,14 +1,15 @@
 import flet as ft
-import asyncio
 import math
 
+from utilities.accounting import update_accounting, update_control
 from utilities.debug import debug_msg
+from utilities.timers import timer_wheel
 
 
 # -------- Helpers --------
 def update_ctrl(ctrl: ft.LayoutControl) -> None:
     if ctrl.page is not None:
-        ctrl.update()
+        update_control(ctrl, site=update_accounting.caller()) # Count the animation, not this helper
 
 # -------- Setups --------
 def anim_setup_main(ctrl: ft.LayoutControl) -> None:
@@ -32,12 +33,12 @@ def anim_setup_menu(ctrl: ft.LayoutControl) -> None:
 # -------- Animation Seqeuences --------
 async def opening_animation(ctrl: ft.LayoutControl) -> None:
     """Application opening animation sequence for the main layout control."""
-    await asyncio.sleep(0.1)
+    await timer_wheel.sleep(0.1)
     ctrl.scale = 1
     ctrl.opacity = 1
     ctrl.rotate = ft.Rotate(math.pi * 2)
     update_ctrl(ctrl)
-    await asyncio.sleep(1)
+    await timer_wheel.sleep(1)
     ctrl.animate_scale = None
     ctrl.animate_rotation = ft.Animation(500, ft.AnimationCurve.EASE_IN_OUT)
     ctrl.rotate = 0
@@ -51,7 +52,7 @@ async def exit_animation(ctrl: ft.LayoutControl, delay: float, debug: bool = Fal
     ctrl.animate_opacity = ft.Animation(delay_in_ms, ft.AnimationCurve.EASE_IN_OUT)
     ctrl.animate_scale = ft.Animation(delay_in_ms, ft.AnimationCurve.EASE_IN_OUT)
     update_ctrl(ctrl)
-    await asyncio.sleep(0.1)
+    await timer_wheel.sleep(0.1)
     ctrl.rotate = ft.Rotate(math.pi * 2)
     ctrl.opacity = 0
     ctrl.scale = 0
@@ -61,12 +62,12 @@ async def show_menu_animation(ctrl: ft.LayoutControl, duration: float = 1):
     """Animates a menu layout control with `duration`."""
     ctrl.visible = True
     update_ctrl(ctrl)
-    await asyncio.sleep(0.1)
+    await timer_wheel.sleep(0.1)
     ctrl.offset = ft.Offset(x=0.0, y=0.0)
     ctrl.opacity = 1
     ctrl.scale = 1
     update_ctrl(ctrl)
-    await asyncio.sleep(duration)
+    await timer_wheel.sleep(duration)
     
 async def exit_menu_animation(ctrl: ft.LayoutControl, duration: float = 1):
     """Animates a menu layout control with `duration`. Returns used `duration`."""
@@ -74,6 +75,6 @@ async def exit_menu_animation(ctrl: ft.LayoutControl, duration: float = 1):
     ctrl.opacity = 0
     ctrl.scale = 0
     update_ctrl(ctrl)
-    await asyncio.sleep(duration)
+    await timer_wheel.sleep(duration)
     ctrl.visible = False
     update_ctrl(ctrl)
\ No newline at end of file
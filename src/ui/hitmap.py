@@ -0,0 +1,296 @@
+import hashlib, os, struct, threading, zlib
+
+from enum import IntEnum
+from pathlib import Path
+from typing import Callable, Hashable, Optional
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+CELL = 4              # Sprite pixels per hit-map cell, on each side
+ALPHA_THRESHOLD = 32  # A cell is solid if any of its pixels is more opaque than this
+
+
+class Region(IntEnum):
+    NONE = 0      # Transparent, the tap went through Miku
+    BODY = 1
+    HEADPAT = 2
+    FLUSTERED = 3
+
+
+# Labelled shapes in sprite pixels (516x420), first match wins, only where the sprite is solid.
+# ("circle", cx, cy, r) or ("rect", left, top, right, bottom)
+REGION_SHAPES: list[tuple[Region, tuple]] = [
+    (Region.FLUSTERED, ("circle", 262, 320, 80)), # Face and cheeks
+    (Region.HEADPAT,   ("rect", 0, 0, 516, 215)), # Top of the head, down to the eyes
+]
+# Everything else inside her outline is `Region.BODY`; outside it, `Region.NONE`.
+
+# The tap circles used before hit maps, in displayed image pixels (258x210), while a sprite's map isn't built yet.
+# Anything outside them is `Region.BODY`: without the outline, a tap can't be told from one that went through her.
+FALLBACK_SHAPES: list[tuple[Region, tuple]] = [
+    (Region.FLUSTERED, ("circle", 131, 160, 40)),
+    (Region.HEADPAT,   ("circle", 111, 85, 50)),
+]
+
+_REGIONS = tuple(Region) # By value, cheaper than calling `Region()`
+
+CACHE_MAGIC = b"MKHM1"
+# Anything that changes what a sprite's map looks like, so a cache built with other values is ignored
+CACHE_STAMP = hashlib.blake2s(repr((CELL, ALPHA_THRESHOLD, REGION_SHAPES)).encode(), digest_size=8).digest()
+_ENTRY = struct.Struct(">HqqIII") # Name length, sprite mtime (ns) and size, width, height, packed cells length
+
+
+# -------- PNG Decoding --------
+def _paeth(a: int, b: int, c: int) -> int:
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def decode_alpha(data: bytes) -> tuple[int, int, list[bytearray]]:
+    """
+    Returns `(width, height, rows)` of the alpha channel of an 8-bit RGBA, non-interlaced PNG.
+    With 4 bytes per pixel every PNG filter only reads the same channel of its neighbours,
+    so only the alpha bytes are unfiltered: a quarter of the work of a full decode.
+    """
+    if data[:8] != PNG_SIGNATURE:
+        raise ValueError("not a PNG")
+    pos, chunks = 8, []
+    width = height = 0
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        if kind == b"IHDR":
+            width, height, depth, color, _, _, interlace = struct.unpack(">IIBBBBB", body)
+            if (depth, color, interlace) != (8, 6, 0):
+                raise ValueError("expected an 8-bit RGBA, non-interlaced PNG")
+        elif kind == b"IDAT":
+            chunks.append(body)
+        elif kind == b"IEND":
+            break
+        pos += 12 + length
+
+    raw = zlib.decompress(b"".join(chunks))
+    stride = width * 4 + 1
+    prev = bytearray(width)
+    rows = []
+    for y in range(height):
+        start = y * stride
+        kind = raw[start]
+        row = bytearray(raw[start + 4:start + stride:4]) # Alpha bytes only
+        if kind == 1: # Sub
+            for x in range(1, width):
+                row[x] = (row[x] + row[x - 1]) & 0xFF
+        elif kind == 2: # Up
+            for x in range(width):
+                row[x] = (row[x] + prev[x]) & 0xFF
+        elif kind == 3: # Average
+            row[0] = (row[0] + (prev[0] >> 1)) & 0xFF
+            for x in range(1, width):
+                row[x] = (row[x] + ((row[x - 1] + prev[x]) >> 1)) & 0xFF
+        elif kind == 4: # Paeth
+            row[0] = (row[0] + prev[0]) & 0xFF
+            for x in range(1, width):
+                row[x] = (row[x] + _paeth(row[x - 1], prev[x], prev[x - 1])) & 0xFF
+        rows.append(row)
+        prev = row
+    return width, height, rows
+
+
+# -------- Hit Maps --------
+def _in_shape(shape: tuple, x: float, y: float) -> bool:
+    if shape[0] == "circle":
+        _, cx, cy, r = shape
+        return (x - cx) ** 2 + (y - cy) ** 2 <= r * r
+    _, left, top, right, bottom = shape
+    return left <= x < right and top <= y < bottom
+
+
+def fallback_region(x: float, y: float) -> Region:
+    """The region under `(x, y)` from `FALLBACK_SHAPES`, for taps before the hit map is ready."""
+    for label, shape in FALLBACK_SHAPES:
+        if _in_shape(shape, x, y):
+            return label
+    return Region.BODY
+
+
+def _outside(solid: bytearray, cols: int, rows: int) -> bytearray:
+    """Marks the transparent cells connected to the edges. Enclosed gaps (eyes, hair strands) stay part of Miku."""
+    outside = bytearray(cols * rows)
+    stack = [i for i in range(cols * rows)
+             if (i < cols or i >= cols * (rows - 1) or i % cols in (0, cols - 1)) and not solid[i]]
+    for i in stack:
+        outside[i] = 1
+    while stack:
+        i = stack.pop()
+        col = i % cols
+        for j in (i - cols, i + cols, i - 1 if col else -1, i + 1 if col < cols - 1 else -1):
+            if 0 <= j < len(solid) and not solid[j] and not outside[j]:
+                outside[j] = 1
+                stack.append(j)
+    return outside
+
+
+class HitMap:
+    """
+    One sprite's `Region` per `CELL`x`CELL` block of pixels, one byte each (about 13KB for Miku).
+    `region_at()` is a couple of multiplications and one index, however complex the outline.
+    """
+    __slots__ = ("width", "height", "cols", "rows", "cells")
+
+    def __init__(self, width: int, height: int, cells: bytes):
+        self.width = width
+        self.height = height
+        self.cols = -(-width // CELL)
+        self.rows = -(-height // CELL)
+        self.cells = cells
+
+    @classmethod
+    def from_png(cls, data: bytes, shapes: list[tuple[Region, tuple]] = REGION_SHAPES) -> "HitMap":
+        width, height, alpha = decode_alpha(data)
+        cols, rows = -(-width // CELL), -(-height // CELL)
+        solid = bytearray(cols * rows)
+        for row in range(rows):
+            block = alpha[row * CELL:(row + 1) * CELL]
+            for col in range(cols):
+                x = col * CELL
+                solid[row * cols + col] = max(max(line[x:x + CELL]) for line in block) > ALPHA_THRESHOLD
+        outside = _outside(solid, cols, rows)
+
+        cells = bytearray(cols * rows)
+        for row in range(rows):
+            cy = row * CELL + CELL / 2
+            for col in range(cols):
+                if outside[row * cols + col]:
+                    continue
+                cx = col * CELL + CELL / 2
+                region = Region.BODY
+                for label, shape in shapes:
+                    if _in_shape(shape, cx, cy):
+                        region = label
+                        break
+                cells[row * cols + col] = region
+        return cls(width, height, bytes(cells))
+
+    def region_at(
+        self, x: float, y: float, display_width: float, display_height: float,
+        flipped: bool = False, scale: float = 1.0
+    ) -> Region:
+        """
+        The region under `(x, y)`, in the coordinates of the image as displayed at
+        `display_width`x`display_height`, mirrored if `flipped`, and scaled by `scale` around its center.
+        """
+        if scale != 1.0:
+            if not scale:
+                return Region.NONE
+            x = display_width / 2 + (x - display_width / 2) / scale
+            y = display_height / 2 + (y - display_height / 2) / scale
+        if flipped:
+            x = display_width - x
+        sx = x * self.width / display_width
+        sy = y * self.height / display_height
+        if not (0 <= sx < self.width and 0 <= sy < self.height):
+            return Region.NONE
+        return _REGIONS[self.cells[int(sy) // CELL * self.cols + int(sx) // CELL]]
+
+    def coverage(self) -> dict[str, int]:
+        """Cells per region, for checking the shapes against a new sprite."""
+        return {region.name: self.cells.count(region) for region in Region}
+
+
+class HitMaps:
+    """
+    Builds each sprite's `HitMap` once, in `get()` or all at once with `warm()`, and keeps it. Taps only `peek()`.
+    With a `cache_path`, `warm()` saves the maps there and reuses them on the next launch for every sprite
+    whose file hasn't changed (same mtime and size): the PNGs are only decoded after a sprite changes.
+    """
+    def __init__(self, path: Callable[[Hashable], Path], cache_path: Optional[Callable[[], Path]] = None):
+        self._path = path
+        self._cache_path = cache_path
+        self._maps: dict[Hashable, HitMap] = {}
+        self._lock = threading.Lock() # `warm()` usually runs in a worker thread
+        self.stats = {"decoded": 0, "cached": 0}
+
+    def get(self, key: Hashable) -> Optional[HitMap]:
+        """The hit map of sprite `key`, or `None` if it can't be read (taps then fall back to the body)."""
+        hit_map = self._maps.get(key)
+        if hit_map is None:
+            with self._lock:
+                hit_map = self._maps.get(key)
+                if hit_map is None:
+                    try:
+                        hit_map = self._maps[key] = HitMap.from_png(self._path(key).read_bytes())
+                        self.stats["decoded"] += 1
+                    except (OSError, ValueError, zlib.error) as e:
+                        print(f"Error building the hit map for {key}:", e)
+                        return None
+        return hit_map
+
+    def peek(self, key: Hashable) -> Optional[HitMap]:
+        """The hit map of sprite `key` if it's already built, `None` otherwise. Never decodes or waits on `warm()`."""
+        return self._maps.get(key)
+
+    def warm(self, keys: list[Hashable]) -> None:
+        """Builds every map of `keys`, from the cache where the sprite hasn't changed, then updates the cache."""
+        cached = self._read_cache() if self._cache_path else {}
+        stamps = {}
+        for key in keys:
+            try:
+                stat = self._path(key).stat()
+            except OSError:
+                continue # `get()` reports it
+            stamps[key] = (stat.st_mtime_ns, stat.st_size)
+            entry = cached.get(str(key))
+            if entry is not None and entry[0] == stamps[key] and key not in self._maps:
+                with self._lock:
+                    self._maps.setdefault(key, entry[1])
+                self.stats["cached"] += 1
+        for key in keys:
+            self.get(key)
+        if self._cache_path and any(cached.get(str(key), (None,))[0] != stamp for key, stamp in stamps.items()):
+            self._write_cache({str(key): (stamp, self._maps[key]) for key, stamp in stamps.items() if key in self._maps})
+
+    # -------- Cache --------
+    def _read_cache(self) -> dict[str, tuple[tuple[int, int], HitMap]]:
+        """`{name: ((mtime_ns, size), map)}` from the cache file, empty if it's missing, stale or unreadable."""
+        try:
+            data = self._cache_path().read_bytes()
+        except OSError:
+            return {}
+        header = len(CACHE_MAGIC) + len(CACHE_STAMP)
+        if data[:header] != CACHE_MAGIC + CACHE_STAMP:
+            return {}
+        entries, pos = {}, header
+        try:
+            while pos < len(data):
+                name_len, mtime, size, width, height, packed_len = _ENTRY.unpack_from(data, pos)
+                pos += _ENTRY.size
+                name = data[pos:pos + name_len].decode("utf-8")
+                pos += name_len
+                cells = zlib.decompress(data[pos:pos + packed_len])
+                pos += packed_len
+                hit_map = HitMap(width, height, cells)
+                if len(cells) == hit_map.cols * hit_map.rows:
+                    entries[name] = ((mtime, size), hit_map)
+        except (struct.error, UnicodeDecodeError, zlib.error) as e:
+            print("Error reading the hit map cache, rebuilding it:", e)
+            return {}
+        return entries
+
+    def _write_cache(self, entries: dict[str, tuple[tuple[int, int], HitMap]]) -> None:
+        parts = [CACHE_MAGIC, CACHE_STAMP]
+        for name, ((mtime, size), hit_map) in entries.items():
+            encoded, packed = name.encode("utf-8"), zlib.compress(hit_map.cells)
+            parts += [_ENTRY.pack(len(encoded), mtime, size, hit_map.width, hit_map.height, len(packed)), encoded, packed]
+        path = self._cache_path()
+        temp = path.with_name(path.name + ".tmp")
+        try:
+            temp.write_bytes(b"".join(parts))
+            os.replace(temp, path) # Never leaves half a cache behind
+        except OSError as e:
+            print("Error saving the hit map cache:", e)
+
+    def __len__(self) -> int:
+        return len(self._maps)
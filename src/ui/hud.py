@@ -0,0 +1,50 @@
+import flet as ft
+
+from typing import Optional
+from ui.menus import DefaultMenu
+from utilities.accounting import update_control
+from utilities.perf import PerfSampler
+
+
+class PerformanceHud:
+    """
+    The "Performance" menu: live loop FPS, update traffic, tasks, monitor reads, physics steps, memory and event loop lag.
+    Every text changes in place and goes out in one update per sample, only while `run()` is running.
+    """
+    def __init__(self, sampler: PerfSampler, on_back: Optional[ft.ControlEventHandler[ft.Button]] = None):
+        self._sampler = sampler
+        self._menu = DefaultMenu(f"-- Performance --\nRefreshes every {sampler.interval:g}s.")
+        self._menu.add_button("Go Back", on_back)
+        self._fps = self._menu.add_text("Loops: waiting for a sample...")
+        self._traffic = self._menu.add_text()
+        self._tasks = self._menu.add_text()
+        self._physics = self._menu.add_text()
+        self._memory = self._menu.add_text()
+        self._lag = self._menu.add_text()
+
+    def add_button(
+        self, text: str, on_click: Optional[ft.ControlEventHandler[ft.Button]] = None
+    ) -> ft.Control:
+        """Add a diagnostics action below the readings."""
+        return self._menu.add_button(text, on_click)
+
+    def build(self) -> ft.Container:
+        return self._menu.build()
+
+    def show(self, sample: dict) -> None:
+        loops = ", ".join(f"{name} {fps:g}" for name, fps in sorted(sample["fps"].items())) or "none"
+        self._fps.value = f"FPS: clock {sample["clock_fps"]:g} | {loops}"
+        self._traffic.value = f"Window updates/s: {sample["window_updates_s"]:g} (all: {sample["msgs_s"]:g})"
+        self._tasks.value = (
+            f"Tasks: {sample["tasks"]} ({sample["tasks_long_running"]} long-running, {sample["tasks_untracked"]} untracked)"
+            f" | Monitor reads/s: {sample["monitor_enums_s"]:g}"
+        )
+        self._physics.value = f"Physics steps/s: {sample["physics_steps_s"]:g} ({sample["physics_step_us"]:g} µs/step)"
+        self._memory.value = f"Memory: {sample["rss_mb"]:g} MB"
+        self._lag.value = f"Event loop lag: {sample["loop_lag_ms"]:g} ms"
+        update_control(self._menu.container, site="PerformanceHud.show")
+
+    async def run(self) -> None:
+        """Refreshes the menu until cancelled. Run it only while the menu is visible."""
+        async for sample in self._sampler.samples():
+            self.show(sample)
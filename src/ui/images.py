@@ -1,13 +1,20 @@
 import flet as ft
+import time
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import Optional
+from ui.hitmap import HitMaps, Region, fallback_region
+from utilities.accounting import update_control
+from utilities.data import get_app_data_dir
 
 
 IMAGES_PATH = Path("images")
 MIKU_STATES = IMAGES_PATH / "miku_states"
+ASSETS_PATH = Path(__file__).resolve().parents[1] / "assets"
+HIT_MAP_CACHE = "hitmaps.bin" # In the app's directory, see `HitMaps`
 
 
 def error_container(msg: str) -> ft.Container:
@@ -39,6 +46,77 @@ def get_miku_state(state: MikuStates) -> str:
     return str(img_path)
 
 
+class SpriteCache:
+    """
+    In-process LRU cache of sprite bytes keyed by `MikuStates`, bounded by `max_bytes`.
+    Swapping to a cached sprite never touches disk, but every swap sends the full image
+    bytes over the Flet channel instead of a short asset path, so check `report()`.
+    """
+    def __init__(self, max_bytes: int = 4 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._sprites: OrderedDict[MikuStates, bytes] = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_time = 0.0
+        self.bytes_served = 0
+
+    def _load(self, state: MikuStates) -> bytes:
+        start = time.perf_counter()
+        data = (ASSETS_PATH / get_miku_state(state)).read_bytes()
+        self.load_time += time.perf_counter() - start
+        return data
+
+    def get(self, state: MikuStates) -> bytes:
+        """Returns the sprite bytes for `state`, loading and caching them on a miss."""
+        data = self._sprites.get(state)
+        if data is not None:
+            self.hits += 1
+            self._sprites.move_to_end(state)
+        else:
+            self.misses += 1
+            data = self._load(state)
+            self._sprites[state] = data
+            self._size += len(data)
+            # Evict least recently used sprites, but always keep the one just loaded
+            while self._size > self.max_bytes and len(self._sprites) > 1:
+                _, evicted = self._sprites.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+        self.bytes_served += len(data)
+        return data
+
+    def preload(self, states: Optional[list[MikuStates]] = None) -> None:
+        """Loads `states` (all of them by default) ahead of time, within the memory cap."""
+        for state in states or list(MikuStates):
+            if state not in self._sprites:
+                self.get(state)
+
+    def clear(self) -> None:
+        self._sprites.clear()
+        self._size = 0
+
+    def report(self) -> dict:
+        """Returns the memory/latency trade-off of the cache so far."""
+        lookups = self.hits + self.misses
+        return {
+            "sprites": len(self._sprites),
+            "resident_bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "avg_load_ms": round(self.load_time / self.misses * 1000, 3) if self.misses else 0.0,
+            "bytes_served": self.bytes_served,
+        }
+
+
+sprite_cache = SpriteCache()
+hit_maps = HitMaps(lambda state: ASSETS_PATH / get_miku_state(state), cache_path=lambda: get_app_data_dir() / HIT_MAP_CACHE)
+
+
 @dataclass
 class ImageData:
     src: str
@@ -82,10 +160,20 @@ class Sprites(Enum):
     SPEECH_BUBBLE = ImageData(src=str(IMAGES_PATH / "speech_bubble.png"), width=1024, height=577)
 
 class DynamicMiku:
-    def __init__(self, miku_data: Miku, debug: bool = False):
+    """
+    Wraps Miku's `Image` and swaps her expressions. Set `in_memory` to hand the image
+    sprite bytes from `cache` (the shared `sprite_cache` by default) instead of asset paths.
+    """
+    def __init__(
+        self, miku_data: Miku, debug: bool = False,
+        in_memory: bool = False, cache: Optional[SpriteCache] = None
+    ):
         self.debug = debug
         self.miku_data = miku_data
+        self.in_memory = in_memory
+        self._cache = cache or sprite_cache
         self._image = self._generate_image(miku_data.value)
+        self._image.src = self._get_src(miku_data)
         self.state = miku_data.name
     
     # -----------------------------
@@ -95,6 +183,11 @@ class DynamicMiku:
         self._debug_msg("A miku has been made.")
         return generate_image(miku_data)
     
+    def _get_src(self, miku_data: Miku) -> str | bytes:
+        if self.in_memory:
+            return self._cache.get(MikuStates[miku_data.name])
+        return miku_data.value.src
+    
     def _debug_msg(self, msg: str):
         if self.debug:
             print(f"[Miku] {msg}")
@@ -108,14 +201,32 @@ class DynamicMiku:
     
     def get_image(self) -> ft.Image:
         return self._image
+    
+    def cache_report(self) -> Optional[dict]:
+        """Returns the sprite cache report, or `None` if not using in-memory sprites."""
+        return self._cache.report() if self.in_memory else None
+
+    def hit_test(self, x: float, y: float) -> Region:
+        """
+        The region of the current sprite under `(x, y)`, relative to the image, flip and scale included.
+        Until `hit_maps.warm()` has built the sprite's map, the fixed tap circles: a tap never decodes on the event loop.
+        """
+        hit_map = hit_maps.peek(MikuStates[self.miku_data.name])
+        if hit_map is None:
+            return fallback_region(x, y)
+        scale = self._image.scale if isinstance(self._image.scale, (int, float)) else 1.0
+        return hit_map.region_at(
+            x, y, self.miku_data.value.width, self.miku_data.value.height,
+            flipped=self.is_flipped(), scale=scale
+        )
 
     def set_state(self, new_state: Miku):
         """Swap to a new Miku state."""
         self._debug_msg(f"Setting state from {self.miku_data.name} -> {new_state.name}")
         self.state = new_state.name
         self.miku_data = new_state
-        self._image.src = new_state.value.src
-        self._image.update()
+        self._image.src = self._get_src(new_state)
+        update_control(self._image, site="DynamicMiku.set_state")
 
     # -----------------------------
     # Helpers for common flags
@@ -124,7 +235,7 @@ class DynamicMiku:
         self._debug_msg(f"Setting flip to {flipped}")
         self._image.data["flipped"] = flipped
         self._image.scale = ft.Scale(scale_x=-1 if flipped else 1)
-        self._image.update()
+        update_control(self._image, site="DynamicMiku.set_flipped")
 
     def is_flipped(self) -> bool:
         return self._image.data.get("flipped", False)
@@ -148,8 +259,6 @@ def generate_image(image_data: ImageData) -> ft.Image:
 Run test for images.py with:
 py -m src.images
 """
-from desktop_notifier import DesktopNotifier, Notification, Urgency
-
 async def before_test(page: ft.Page):
     page.bgcolor = ft.Colors.TRANSPARENT
     page.padding = 0
@@ -166,6 +275,8 @@ async def before_test(page: ft.Page):
     page.update()
 
 async def test(page: ft.Page):
+    from desktop_notifier import DesktopNotifier, Notification, Urgency
+    
     notifier = DesktopNotifier(app_name="Desktop Assistant")
     
     note = Notification(
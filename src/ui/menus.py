@@ -1,13 +1,34 @@
 import flet as ft
 
-from typing import Optional
+from dataclasses import dataclass
+from typing import Callable, Hashable, Iterable, NamedTuple, Optional, Union
 from ui.components import default_text, default_container, default_button
 from ui.animations import anim_setup_menu
+from utilities.accounting import update_control
+
+
+VIRTUAL_AFTER = 40 # Menus with more entries than this get a virtualized list
+CHUNK = 30         # Entries a virtualized list builds at a time, as it's scrolled
+ITEM_EXTENT = 44   # Height of one entry in a virtualized list, lets Flutter skip measuring them
+
+
+def _on_page(ctrl: ft.Control) -> bool:
+    """Whether `ctrl` can be updated yet, see `DefaultMenu.add_button`."""
+    return hasattr(ctrl, "_page_ref") and ctrl._page_ref() is not None
+
+
+class MenuEntry(NamedTuple):
+    text: str
+    on_click: Optional[ft.ControlEventHandler[ft.Button]] = None
 
 
 class DefaultMenu:
-    """Dynamic menu with title and buttons."""
-    def __init__(self, title: str, visible: bool = False):
+    """
+    Dynamic menu with title and buttons. With `virtual`, the buttons go in a `ListView` that Flutter
+    only lays out where visible, and entries added with `add_entries()` are only turned into controls
+    `CHUNK` at a time, as the list is scrolled toward its end.
+    """
+    def __init__(self, title: str, visible: bool = False, virtual: bool = False):
         # Title
         title_text = default_text(value=title, size=20)
         title_container = default_container(content=title_text, expand=True)
@@ -22,18 +43,26 @@ class DefaultMenu:
         )
 
         # Buttons (start empty)
-        self._buttons = ft.ResponsiveRow(
-            controls=[], expand=True, spacing=10,
-            alignment=ft.MainAxisAlignment.CENTER,
-            vertical_alignment=ft.CrossAxisAlignment.CENTER,
-            run_spacing=10,
-        )
-        self._button_column = ft.Column(
-            controls=[self._buttons],
-            expand=True, height=80, scroll=ft.ScrollMode.ALWAYS,
-            alignment=ft.MainAxisAlignment.CENTER,
-            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-        )
+        self._entries: list[MenuEntry] = [] # Not built yet, only used by virtual menus
+        if virtual:
+            self._buttons = ft.ListView(
+                controls=[], expand=True, spacing=10, item_extent=ITEM_EXTENT,
+                build_controls_on_demand=True, scroll_interval=100, on_scroll=self._on_scroll,
+            )
+            self._button_column = ft.Column(controls=[self._buttons], expand=True, height=80)
+        else:
+            self._buttons = ft.ResponsiveRow(
+                controls=[], expand=True, spacing=10,
+                alignment=ft.MainAxisAlignment.CENTER,
+                vertical_alignment=ft.CrossAxisAlignment.CENTER,
+                run_spacing=10,
+            )
+            self._button_column = ft.Column(
+                controls=[self._buttons],
+                expand=True, height=80, scroll=ft.ScrollMode.ALWAYS,
+                alignment=ft.MainAxisAlignment.CENTER,
+                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            )
         button_row = ft.Row(
             controls=[self._button_column], expand=True,
             alignment=ft.MainAxisAlignment.CENTER,
@@ -70,7 +99,7 @@ class DefaultMenu:
         # When checking if a container is already attached to a page, there 3 options. The 1st one is
         # implemented below:
         if hasattr(self.container, "_page_ref") and self.container._page_ref() is not None:
-            self.container.update()
+            update_control(self.container, site="DefaultMenu.add_button")
         return btn
         # Option 2 is by wrapping it in a try/except catch like this:
         # try:
@@ -80,6 +109,84 @@ class DefaultMenu:
         #     pass
         # Option 3 is you simply do `page.add()` and add the container first before accessing it.
 
+    def add_text(self, value: str = "", size: ft.Number = 14) -> ft.Text:
+        """Add a full-width line of text to the menu, in order with the buttons."""
+        text = default_text(value=value, size=size)
+        text.col = 12
+        self._buttons.controls.append(text)
+        if hasattr(self.container, "_page_ref") and self.container._page_ref() is not None:
+            update_control(self.container, site="DefaultMenu.add_text")
+        return text
+
+    # -------- Virtual Lists --------
+    def add_entries(self, entries: Iterable[MenuEntry]) -> None:
+        """Queue entries for a virtual menu; only the first `CHUNK` are built right away."""
+        self._entries.extend(entries)
+        if len(self._buttons.controls) < CHUNK:
+            self._build_chunk()
+
+    def _build_chunk(self) -> bool:
+        start = len(self._buttons.controls)
+        chunk = self._entries[start:start + CHUNK]
+        for entry in chunk:
+            self._buttons.controls.append(default_button(text=entry.text, on_click=entry.on_click))
+        return bool(chunk)
+
+    def _on_scroll(self, e: ft.OnScrollEvent) -> None:
+        if e.pixels >= e.max_scroll_extent - ITEM_EXTENT * 5 and self._build_chunk() and _on_page(self._buttons):
+            update_control(self._buttons, site="DefaultMenu._on_scroll")
+
     def build(self) -> ft.Container:
         """Return the root container for placement in the UI."""
         return self.container
+
+
+# -------- Lazy Menus --------
+@dataclass(frozen=True)
+class MenuSpec:
+    """
+    What a menu holds, without any controls. `entries` can be a callable, read on first open,
+    for content that isn't loaded yet. Menus with more than `VIRTUAL_AFTER` entries are virtual.
+    """
+    title: str
+    entries: Union[list[MenuEntry], Callable[[], list[MenuEntry]]]
+
+    def build(self) -> ft.Container:
+        entries = self.entries() if callable(self.entries) else self.entries
+        if len(entries) > VIRTUAL_AFTER:
+            menu = DefaultMenu(self.title, virtual=True)
+            menu.add_entries(entries)
+        else:
+            menu = DefaultMenu(self.title)
+            for entry in entries:
+                menu.add_button(entry.text, entry.on_click)
+        return menu.build()
+
+
+class MenuCache:
+    """
+    Declared menus, built the first time they're opened and kept for reuse. A menu is only
+    added to `column` once built, so unopened menus cost nothing on the page either.
+    """
+    def __init__(self, column: ft.Column):
+        self._column = column
+        self._specs: dict[Hashable, Union[MenuSpec, Callable[[], ft.Container]]] = {}
+        self._built: dict[Hashable, ft.Container] = {}
+
+    def declare(self, name: Hashable, spec: Union[MenuSpec, Callable[[], ft.Container]]) -> None:
+        """`spec` is a `MenuSpec`, or a callable for menus that build themselves (e.g. `PerformanceHud`)."""
+        self._specs[name] = spec
+
+    def get(self, name: Hashable) -> ft.Container:
+        """The menu's container, built and added to the column on first use."""
+        ctrl = self._built.get(name)
+        if ctrl is None:
+            spec = self._specs[name]
+            ctrl = self._built[name] = spec.build() if isinstance(spec, MenuSpec) else spec()
+            self._column.controls.append(ctrl)
+            if _on_page(self._column):
+                update_control(self._column, site="MenuCache.get")
+        return ctrl
+
+    def built(self) -> list[ft.Container]:
+        return list(self._built.values())
@@ -2,6 +2,7 @@ import flet as ft
 
 from pathlib import Path
 from enum import Enum
+from utilities.accounting import update_page
 
 
 class FontStyles(Enum):
@@ -31,7 +32,7 @@ def transparent_window(page: ft.Page, width: int = 258, height: int = 210, debug
     page.window.height = height
     page.window.alignment = ft.Alignment.BOTTOM_CENTER
     page.window.prevent_close = True
-    page.update()
+    update_page(page)
     
     # page.update()
     # page.appbar = ft.AppBar(
@@ -0,0 +1,166 @@
+import os, sys, time
+
+from collections import Counter, deque
+from typing import Any, Callable, Optional
+
+
+WINDOW_SECONDS = 60     # How much history `rates()` can look back on
+BUDGET_WARN_EVERY = 10.0 # Seconds between two budget warnings
+
+_SCALAR_BYTES = 8  # Rough msgpack size of a number, bool or enum
+_CHILD_BYTES = 16  # Rough size of a reference to a child control
+
+
+class _Second:
+    """Everything sent during one wall-clock second."""
+    __slots__ = ("second", "msgs", "bytes", "controls", "sites")
+
+    def __init__(self, second: int):
+        self.second = second
+        self.msgs = 0
+        self.bytes = 0
+        self.controls: Counter[str] = Counter()
+        self.sites: Counter[str] = Counter()
+
+
+def estimate_bytes(target: Any) -> int:
+    """
+    Approximate serialized size of `target`'s properties: strings and bytes by length, anything
+    else at a flat rate, child controls by reference only. Flet builds that keep a dirty set
+    (`_values`/`_dirty`) are measured on what changed; otherwise every set property counts,
+    an upper bound. Cheap enough to run on every update.
+    """
+    values = getattr(target, "_values", None)
+    dirty = getattr(target, "_dirty", None)
+    if isinstance(values, dict) and isinstance(dirty, dict):
+        items = ((name, values.get(name)) for name in dirty)
+    else:
+        items = vars(target).items()
+    size = 0
+    for name, value in items:
+        if name[0] == "_" or value is None:
+            continue
+        size += len(name)
+        if isinstance(value, (str, bytes)):
+            size += len(value)
+        elif isinstance(value, (list, tuple)):
+            size += _CHILD_BYTES * len(value)
+        else:
+            size += _SCALAR_BYTES
+    return size
+
+
+class UpdateAccountant:
+    """
+    Counts the messages Miku sends to Flutter, and roughly how many bytes they carry,
+    by control and by call site, in one-second buckets kept for `window` seconds.
+    With a `budget` (messages per second), every second that goes over it is reported.
+    """
+    def __init__(self, window: int = WINDOW_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self.enabled = True
+        self.budget: Optional[float] = None
+        self._clock = clock
+        self._buckets: deque[_Second] = deque(maxlen=window)
+        self._sites: dict[Any, str] = {} # Code object -> "module.function" label
+        self._last_warning = float("-inf")
+        self._totals = {"msgs": 0, "bytes": 0, "over_budget_seconds": 0}
+        self._control_totals: Counter[str] = Counter()
+
+    # -------- Recording --------
+    def record(self, control: str, site: str, size: int) -> None:
+        now = self._clock()
+        second = int(now)
+        buckets = self._buckets
+        if not buckets or buckets[-1].second != second:
+            if buckets:
+                self._check_budget(buckets[-1], now)
+            buckets.append(_Second(second))
+        bucket = buckets[-1]
+        bucket.msgs += 1
+        bucket.bytes += size
+        bucket.controls[control] += 1
+        bucket.sites[site] += 1
+        self._totals["msgs"] += 1
+        self._totals["bytes"] += size
+        self._control_totals[control] += 1
+
+    def caller(self, depth: int = 2) -> str:
+        """`module.function` of the frame `depth` levels above this call, cached per code object."""
+        code = sys._getframe(depth).f_code
+        site = self._sites.get(code)
+        if site is None:
+            module = os.path.splitext(os.path.basename(code.co_filename))[0]
+            site = self._sites[code] = f"{module}.{code.co_name}"
+        return site
+
+    def _check_budget(self, bucket: _Second, now: float) -> None:
+        """Runs once per finished second, never on the hot path of an update."""
+        if self.budget is None or bucket.msgs <= self.budget:
+            return
+        self._totals["over_budget_seconds"] += 1
+        if now - self._last_warning < BUDGET_WARN_EVERY:
+            return
+        self._last_warning = now
+        top = ", ".join(f"{site} x{n}" for site, n in bucket.sites.most_common(3))
+        print(f"[ACCOUNTING] {bucket.msgs} msgs/s over the budget of {self.budget:g}: {top}")
+
+    # -------- Queries --------
+    def rates(self, window: float = 10.0, top: int = 5) -> dict:
+        """Messages and bytes per second over the last `window` seconds, with the busiest controls and sites."""
+        window = max(1, min(int(window), self._buckets.maxlen))
+        since = int(self._clock()) - window
+        msgs = size = 0
+        controls: Counter[str] = Counter()
+        sites: Counter[str] = Counter()
+        for bucket in reversed(self._buckets):
+            if bucket.second <= since:
+                break
+            msgs += bucket.msgs
+            size += bucket.bytes
+            controls.update(bucket.controls)
+            sites.update(bucket.sites)
+        return {
+            "window_s": window,
+            "msgs_per_s": round(msgs / window, 2),
+            "bytes_per_s": round(size / window, 1),
+            "by_control": dict(controls.most_common(top)),
+            "by_site": dict(sites.most_common(top)),
+        }
+
+    def total(self) -> int:
+        """Messages counted since launch."""
+        return self._totals["msgs"]
+
+    def control_total(self, control: str) -> int:
+        """Messages counted since launch for one control type, e.g. `"Window"`."""
+        return self._control_totals[control]
+
+    def peak(self) -> int:
+        """The most messages sent in any one second still in the window."""
+        return max((b.msgs for b in self._buckets), default=0)
+
+    def stats(self) -> dict:
+        return {**self._totals, "peak_msgs_per_s": self.peak(), **self.rates(WINDOW_SECONDS, top=3)}
+
+
+update_accounting = UpdateAccountant()
+
+
+# -------- Accounted Updates --------
+def update_page(page, site: Optional[str] = None) -> None:
+    """`page.update()`, counted."""
+    if update_accounting.enabled:
+        update_accounting.record("Page", site or update_accounting.caller(), estimate_bytes(page))
+    page.update()
+
+def update_window(page, site: Optional[str] = None) -> None:
+    """`page.window.update()`, counted."""
+    if update_accounting.enabled:
+        update_accounting.record("Window", site or update_accounting.caller(), estimate_bytes(page.window))
+    page.window.update()
+
+def update_control(ctrl, site: Optional[str] = None) -> None:
+    """`ctrl.update()`, counted under the control's type."""
+    if update_accounting.enabled:
+        update_accounting.record(type(ctrl).__name__, site or update_accounting.caller(), estimate_bytes(ctrl))
+    ctrl.update()
@@ -0,0 +1,78 @@
+import asyncio, time
+
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Awaitable, Callable, Coroutine, Optional
+from utilities.debug import debug_msg
+from utilities.profiler import startup_profiler
+
+
+class BootStage(Enum):
+    FIRST_FRAME = "first_frame" # Window and Miku's sprite on screen
+    HANDLERS = "handlers"       # Gestures, window and keyboard events
+    SECONDARY = "secondary"     # Speech content, memories and notifications
+
+
+class BootPipeline:
+    """
+    Runs the app's boot in explicit stages, each with a readiness event and a timing,
+    so early events can wait for (or skip) whatever hasn't been set up yet.
+    """
+    def __init__(self, debug: bool = False):
+        self.debug = debug
+        self._events = {stage: asyncio.Event() for stage in BootStage}
+        self._timings: dict[str, float] = {}
+        self._t0 = time.perf_counter()
+        self._task: Optional[asyncio.Task] = None
+
+    @contextmanager
+    def stage(self, stage: BootStage):
+        """Times the wrapped block as `stage`, then marks it as ready."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._finish(stage, start)
+
+    def _finish(self, stage: BootStage, start: float) -> None:
+        self._timings[stage.value] = round((time.perf_counter() - start) * 1000, 3)
+        startup_profiler.mark(f"boot:{stage.value}")
+        self._events[stage].set()
+        if all(self.is_ready(s) for s in BootStage):
+            self._timings["total"] = round((time.perf_counter() - self._t0) * 1000, 3)
+        debug_msg(f"Stage '{stage.value}' ready in {self._timings[stage.value]}ms", handler="BOOT", debug=self.debug)
+
+    def run_in_background(
+        self, stage: BootStage, coro: Awaitable, start: Optional[Callable[[Coroutine, str], Any]] = None
+    ) -> Optional[asyncio.Task]:
+        """
+        Runs `coro` as `stage` without blocking the stages before it, through `start(coro, name)`
+        (e.g. a `TaskSupervisor` slot, defaults to `asyncio.create_task`).
+        """
+        async def run():
+            started = time.perf_counter()
+            try:
+                await coro
+            finally:
+                self._finish(stage, started)
+        name = f"boot -> {stage.value}"
+        if start is None:
+            self._task = asyncio.create_task(coro=run(), name=name)
+        else:
+            self._task = start(run(), name)
+        return self._task
+
+    def is_ready(self, stage: BootStage) -> bool:
+        return self._events[stage].is_set()
+
+    async def wait_for(self, stage: BootStage, timeout: Optional[float] = None) -> bool:
+        """Waits until `stage` is ready. Returns `False` if `timeout` passes first."""
+        try:
+            await asyncio.wait_for(self._events[stage].wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def timings(self) -> dict[str, float]:
+        """Returns each finished stage's duration in ms, plus the `total` once all are ready."""
+        return dict(self._timings)
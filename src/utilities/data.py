@@ -1,5 +1,6 @@
-import json, random
+import json, os, random
 
+from functools import cache
 from pathlib import Path
 from datetime import datetime
 from enum import Enum
@@ -16,7 +17,17 @@ def random_line(lines: list[dict]) -> dict:
     """Chooses a random entry from the list of dicts."""
     return random.choice(lines)
 
-SPEECH_LINES = load_lines(LINES_PATH)
+@cache
+def get_speech_lines() -> list[dict]:
+    """Loads Miku's speech lines on first use, then returns the same list."""
+    return load_lines(LINES_PATH)
+
+def get_app_data_dir() -> Path:
+    """Returns (and creates) the per-user directory for the app's own files."""
+    base = os.environ.get("LOCALAPPDATA")
+    path = Path(base) / "MikuMiku" if base else Path.home() / ".mikumiku"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
 
 
 # ----- Time Stuff -----
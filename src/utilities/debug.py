@@ -1,12 +1,186 @@
-import ctypes
+import asyncio, json, os, time
+
+from enum import IntEnum
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional
+from utilities.data import get_app_data_dir
+from utilities.tasks import owned_task
+from utilities.timers import TimerHandle, timer_wheel
+
+
+LOG_FILE_NAME = "miku.log"
+
+
+# -------- Structured Logging --------
+class LogLevel(IntEnum):
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    ERROR = 40
+    OFF = 100
+
+
+class LogRecord(NamedTuple):
+    time: float
+    channel: str
+    level: LogLevel
+    msg: str
+    args: tuple
+    fields: dict[str, Any]
+
+    def text(self) -> str:
+        """`msg` with its `%`-style args. Only built by the sinks."""
+        return self.msg % self.args if self.args else self.msg
+
+    def message(self) -> str:
+        """`text()` followed by the fields as `key=value`."""
+        if not self.fields:
+            return self.text()
+        return self.text() + " " + " ".join(f"{k}={v}" for k, v in self.fields.items())
+
+
+class Channel:
+    """
+    One named stream of logs with its own level. Arguments are formatted by the sinks, and
+    only for records that pass, so a call on a quiet channel costs one attribute check.
+    For arguments that are costly to compute, guard the call: `if log.on: log.debug(...)`.
+    """
+    __slots__ = ("name", "level", "on", "_logger")
+
+    def __init__(self, name: str, logger: "Logger", level: LogLevel = LogLevel.OFF):
+        self.name = name
+        self._logger = logger
+        self.set_level(level)
+
+    def set_level(self, level: LogLevel) -> None:
+        self.level = level
+        self.on = level <= LogLevel.DEBUG # Plain attribute: the fast path reads nothing else
+
+    def debug(self, msg: str, *args: Any, **fields: Any) -> None:
+        if self.on:
+            self._logger.emit(self.name, LogLevel.DEBUG, msg, args, fields)
+
+    def info(self, msg: str, *args: Any, **fields: Any) -> None:
+        if self.level <= LogLevel.INFO:
+            self._logger.emit(self.name, LogLevel.INFO, msg, args, fields)
+
+    def warning(self, msg: str, *args: Any, **fields: Any) -> None:
+        if self.level <= LogLevel.WARNING:
+            self._logger.emit(self.name, LogLevel.WARNING, msg, args, fields)
+
+    def error(self, msg: str, *args: Any, **fields: Any) -> None:
+        if self.level <= LogLevel.ERROR:
+            self._logger.emit(self.name, LogLevel.ERROR, msg, args, fields)
+
+
+def console_sink(record: LogRecord) -> None:
+    print(f"[{record.channel.upper()}] {record.message()}")
+
+
+class FileSink:
+    """
+    Appends records as JSON lines. Records are buffered in memory and written in one batch
+    every `flush_interval` seconds, off the event loop, so logging never waits on the disk.
+    The file is moved to `<name>.1<suffix>` once it grows past `max_bytes`.
+    """
+    def __init__(self, path: Path, flush_interval: float = 2.0, max_bytes: int = 2 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._flush_interval = flush_interval
+        self._lines: list[str] = []
+        self._handle: Optional[TimerHandle] = None
+        self._flushing: Optional[asyncio.Task] = None
+
+    def __call__(self, record: LogRecord) -> None:
+        self._lines.append(json.dumps({
+            "time": round(record.time, 3), "channel": record.channel, "level": record.level.name,
+            "msg": record.text(), **({"fields": record.fields} if record.fields else {}),
+        }, default=str, ensure_ascii=False))
+        if self._handle is None or not self._handle.active():
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return # Written by `close()`
+            self._handle = timer_wheel.schedule(self._flush_interval, self._start_flush)
+
+    def _start_flush(self) -> None:
+        if self._flushing is None or self._flushing.done():
+            self._flushing = owned_task(asyncio.create_task(self.flush(), name="logs -> flush"))
+
+    def _append(self, lines: list[str]) -> None:
+        try:
+            if self.path.stat().st_size > self.max_bytes:
+                os.replace(self.path, self.path.with_name(f"{self.path.stem}.1{self.path.suffix}"))
+        except FileNotFoundError:
+            pass
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    async def flush(self) -> None:
+        lines, self._lines = self._lines, []
+        if not lines:
+            return
+        try:
+            await asyncio.to_thread(self._append, lines)
+        except OSError as e:
+            print("Error writing logs:", e)
+
+    async def close(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._flushing is not None:
+            await self._flushing
+        await self.flush()
+
+
+class Logger:
+    """Owns every channel and hands each passing record to the sinks (the console by default)."""
+    def __init__(self):
+        self.channels: dict[str, Channel] = {}
+        self.sinks: list[Callable[[LogRecord], None]] = [console_sink]
+        self._file: Optional[FileSink] = None
+
+    def channel(self, name: str) -> Channel:
+        """Returns the channel called `name`, created switched off."""
+        channel = self.channels.get(name)
+        if channel is None:
+            channel = self.channels[name] = Channel(name, self)
+        return channel
+
+    def configure(self, levels: dict[str, LogLevel]) -> None:
+        for name, level in levels.items():
+            self.channel(name).set_level(level)
+
+    def open_file(self, path: Optional[Path] = None) -> None:
+        """Also writes every record to `path` (`miku.log` in the app's directory), as JSON lines."""
+        if self._file is None:
+            self._file = FileSink(path or get_app_data_dir() / LOG_FILE_NAME)
+            self.sinks.append(self._file)
+
+    async def close_file(self) -> None:
+        if self._file is not None:
+            self.sinks.remove(self._file)
+            file, self._file = self._file, None
+            await file.close()
+
+    def emit(self, channel: str, level: LogLevel, msg: str, args: tuple = (), fields: Optional[dict] = None) -> None:
+        record = LogRecord(time.time(), channel, level, msg, args, fields or {})
+        for sink in self.sinks:
+            sink(record)
+
+
+logs = Logger()
 
 
 def debug_msg(msg: str, handler: str = "DEBUG", debug: bool = False):
+    """Logs a preformatted `msg` when `debug` is set. Prefer a `logs.channel()` in loops."""
     if debug:
-        print(f"[{handler}] {msg}")
+        logs.emit(handler, LogLevel.DEBUG, msg)
         
 def get_full_username():
     """(Only works in Windows) Returns the user currently logged in the pc."""
+    import ctypes # Deferred, only needed once for the greetings
     GetUserNameEx = ctypes.windll.secur32.GetUserNameExW
     NameDisplay = 3  # NameDisplay gives full name
 
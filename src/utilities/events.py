@@ -0,0 +1,144 @@
+import asyncio, time
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Hashable, Optional
+from utilities.debug import Channel
+from utilities.timers import TimerHandle, TimerWheel, timer_wheel
+
+
+class EventPolicy(Enum):
+    PASSTHROUGH = "passthrough" # Deliver every event right away
+    DEBOUNCE = "debounce"       # Deliver only the last event of a burst, once it settles
+    THROTTLE = "throttle"       # Deliver the first event, then drop the rest for `interval`
+
+
+@dataclass(frozen=True)
+class EventRule:
+    policy: EventPolicy = EventPolicy.PASSTHROUGH
+    interval: float = 0.0           # Seconds of quiet (debounce) or between deliveries (throttle)
+    max_age: Optional[float] = None # Drop events that waited longer than this before delivery
+
+
+class _TypeStats:
+    __slots__ = ("received", "delivered", "dropped", "first_seen")
+
+    def __init__(self):
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.first_seen = time.perf_counter()
+
+
+class EventPipeline:
+    """
+    Sits between an event source (e.g. `page.window.on_event`) and its handler, and shapes
+    each event type by its `EventRule`. Only one handler runs per type at a time: events
+    arriving meanwhile wait as a single pending event, so older ones are dropped as stale.
+    """
+    def __init__(
+        self, handler: Callable[[Any], Awaitable[None]],
+        rules: Optional[dict[Hashable, EventRule]] = None,
+        key: Callable[[Any], Hashable] = lambda e: e.type,
+        spawn: Optional[Callable[[Awaitable[None]], Any]] = None,
+        wheel: Optional[TimerWheel] = None, log: Optional[Channel] = None
+    ):
+        self._handler = handler
+        self._rules = rules or {}
+        self._key = key
+        self._spawn = spawn or asyncio.create_task
+        self._wheel = wheel or timer_wheel
+        self.log = log # Checked on every record, so switching the channel applies right away
+        self._debounces: dict[Hashable, TimerHandle] = {}
+        self._latest: dict[Hashable, tuple[Any, float]] = {}
+        self._throttled_until: dict[Hashable, float] = {}
+        self._running: set[Hashable] = set()
+        self._pending: dict[Hashable, tuple[Any, float]] = {}
+        self._stats: dict[Hashable, _TypeStats] = {}
+
+    async def push(self, e: Any) -> None:
+        """Entry point for the event source. Returns right away."""
+        self.submit(e)
+
+    def submit(self, e: Any) -> None:
+        kind = self._key(e)
+        stats = self._stats.get(kind)
+        if stats is None:
+            stats = self._stats[kind] = _TypeStats()
+        stats.received += 1
+        rule = self._rules.get(kind, EventRule())
+        now = time.perf_counter()
+
+        if rule.policy is EventPolicy.DEBOUNCE:
+            if kind in self._latest:
+                stats.dropped += 1 # Collapsed into the newer event
+            self._latest[kind] = (e, now)
+            handle = self._debounces.get(kind)
+            if handle is None:
+                self._debounces[kind] = self._wheel.schedule(rule.interval, self._settle, kind)
+            else:
+                handle.reset(rule.interval)
+        elif rule.policy is EventPolicy.THROTTLE:
+            if now < self._throttled_until.get(kind, 0.0):
+                stats.dropped += 1
+                return
+            self._throttled_until[kind] = now + rule.interval
+            self._deliver(kind, e, now)
+        else:
+            self._deliver(kind, e, now)
+
+    def _settle(self, kind: Hashable) -> None:
+        self._debounces.pop(kind, None)
+        e, received_at = self._latest.pop(kind)
+        self._deliver(kind, e, received_at)
+
+    def _deliver(self, kind: Hashable, e: Any, received_at: float) -> None:
+        if kind in self._running:
+            if kind in self._pending:
+                self._stats[kind].dropped += 1 # Superseded while waiting
+            self._pending[kind] = (e, received_at)
+            return
+        self._running.add(kind)
+        self._spawn(self._run(kind, e, received_at))
+
+    async def _run(self, kind: Hashable, e: Any, received_at: float) -> None:
+        try:
+            while True:
+                max_age = self._rules.get(kind, EventRule()).max_age
+                if max_age is not None and time.perf_counter() - received_at > max_age:
+                    self._stats[kind].dropped += 1
+                    if self.log is not None:
+                        self.log.debug("Dropped stale %s event", kind)
+                else:
+                    self._stats[kind].delivered += 1
+                    try:
+                        await self._handler(e)
+                    except Exception as ex:
+                        print(f"Error handling {kind} event: {ex!r}")
+                if kind not in self._pending:
+                    break
+                e, received_at = self._pending.pop(kind)
+        finally:
+            self._running.discard(kind)
+            self._pending.pop(kind, None)
+
+    def metrics(self) -> dict[str, dict]:
+        """Returns received/delivered/dropped counts and the received rate per event type."""
+        now = time.perf_counter()
+        return {
+            str(kind): {
+                "received": stats.received,
+                "delivered": stats.delivered,
+                "dropped": stats.dropped,
+                "received_per_s": round(stats.received / max(now - stats.first_seen, 1e-9), 3),
+            }
+            for kind, stats in self._stats.items()
+        }
+
+    def cancel(self) -> None:
+        """Drops every pending debounce, e.g. when shutting down."""
+        for handle in self._debounces.values():
+            handle.cancel()
+        self._debounces.clear()
+        self._latest.clear()
+        self._pending.clear()
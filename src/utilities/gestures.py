@@ -0,0 +1,145 @@
+import math, time
+
+from array import array
+from enum import Enum
+from typing import Callable, Optional
+from utilities.debug import debug_msg
+from utilities.timers import TimerHandle, TimerWheel, timer_wheel
+
+
+class Stroke(Enum):
+    PAT = "pat"     # Up and down
+    RUB = "rub"     # Side to side
+    POKE = "poke"   # A press that barely moves
+    SHAKE = "shake" # Fast, back and forth any way
+
+
+STROKE_CODES = {stroke: code for code, stroke in enumerate(Stroke, 1)} # Telemetry values
+
+
+class GestureRecognizer:
+    """
+    Classifies pointer strokes from a stream of samples. `push()` only writes four numbers into
+    preallocated ring buffers (`array`s, no object per sample). A stroke ends after `gap` seconds
+    without samples, or once it holds `window` samples, and is then classified in one pass over
+    its slice of the buffers, every `interval` seconds on the timer wheel. A stroke never holds
+    more than `window` samples, which bounds each classification; its cost is kept in `stats()`.
+    """
+    def __init__(
+        self, on_stroke: Optional[Callable[[Stroke, dict], None]] = None,
+        capacity: int = 256, window: int = 48, gap: float = 0.25, interval: float = 0.1,
+        wheel: Optional[TimerWheel] = None, clock: Callable[[], float] = time.monotonic
+    ):
+        self.on_stroke = on_stroke
+        self.debug = False
+        self._capacity = capacity
+        self._window = min(window, capacity)
+        self._gap = gap
+        self._interval = interval
+        self._wheel = wheel or timer_wheel
+        self._clock = clock
+        self._t = array("d", bytes(8 * capacity))
+        self._x = array("f", bytes(4 * capacity))
+        self._y = array("f", bytes(4 * capacity))
+        self._pressed = array("B", bytes(capacity))
+        self._head = 0  # Total samples pushed; the next one goes to `_head % capacity`
+        self._start = 0 # First sample of the current stroke
+        self._handle: Optional[TimerHandle] = None
+        self._stats = {"samples": 0, "strokes": 0, "classified": 0, "max_us": 0.0, "total_us": 0.0}
+
+    # -------- Sampling --------
+    def push(self, x: float, y: float, pressed: bool = False) -> None:
+        i = self._head % self._capacity
+        self._t[i] = self._clock()
+        self._x[i] = x
+        self._y[i] = y
+        self._pressed[i] = pressed
+        self._head += 1
+        self._stats["samples"] += 1
+        if self._handle is None or not self._handle.active():
+            self._handle = self._wheel.schedule(self._interval, self._poll)
+
+    def reset(self) -> None:
+        """Drops the current stroke, e.g. when Miku gets dragged or the pointer leaves."""
+        self._start = self._head
+
+    def _poll(self) -> None:
+        self._start = max(self._start, self._head - self._capacity) # Overwritten while the loop was busy
+        pending = self._head - self._start
+        if not pending:
+            return
+        last = self._t[(self._head - 1) % self._capacity]
+        if pending >= self._window or self._clock() - last >= self._gap:
+            end = min(self._head, self._start + self._window)
+            self._finish(self._start, end)
+            self._start = end
+        if self._head > self._start:
+            self._handle = self._wheel.schedule(self._interval, self._poll)
+
+    def _finish(self, start: int, end: int) -> None:
+        began = time.perf_counter()
+        stroke, features = self.classify(start, end)
+        elapsed_us = (time.perf_counter() - began) * 1e6
+        self._stats["strokes"] += 1
+        self._stats["total_us"] += elapsed_us
+        self._stats["max_us"] = max(self._stats["max_us"], elapsed_us)
+        if stroke is None:
+            return
+        self._stats["classified"] += 1
+        debug_msg(f"{stroke.name} {features}", handler="GESTURES", debug=self.debug)
+        if self.on_stroke is not None:
+            self.on_stroke(stroke, features)
+
+    def stats(self) -> dict:
+        strokes = self._stats["strokes"]
+        return dict(
+            self._stats, max_us=round(self._stats["max_us"], 1), total_us=round(self._stats["total_us"], 1),
+            mean_us=round(self._stats["total_us"] / strokes, 1) if strokes else 0.0
+        )
+
+    # -------- Classification --------
+    def _slice(self, buffer: array, start: int, end: int) -> array:
+        """Samples `start` to `end` of a ring buffer, in order."""
+        a, b = start % self._capacity, end % self._capacity
+        return buffer[a:b] if a < b else buffer[a:] + buffer[:b]
+
+    def classify(self, start: int, end: int) -> tuple[Optional[Stroke], dict]:
+        t = self._slice(self._t, start, end)
+        xs = self._slice(self._x, start, end)
+        ys = self._slice(self._y, start, end)
+        pressed = any(self._slice(self._pressed, start, end))
+        duration = t[-1] - t[0]
+        dx = [b - a for a, b in zip(xs, xs[1:])]
+        dy = [b - a for a, b in zip(ys, ys[1:])]
+        travel_x = sum(map(abs, dx))
+        travel_y = sum(map(abs, dy))
+        path = sum(map(math.hypot, dx, dy))
+        features = {
+            "samples": len(t),
+            "duration": round(duration, 3),
+            "path": round(path, 1),
+            "speed": round(path / duration, 1) if duration else 0.0,
+            "turns_x": _reversals(dx),
+            "turns_y": _reversals(dy),
+            "vertical": round(travel_y / (travel_x + travel_y), 2) if path else 0.0,
+        }
+        return _label(features, pressed), features
+
+
+def _reversals(deltas: list[float], dead_zone: float = 2.0) -> int:
+    """Direction changes along one axis, ignoring jitter smaller than `dead_zone` pixels."""
+    signs = [d > 0 for d in deltas if abs(d) > dead_zone]
+    return sum(a != b for a, b in zip(signs, signs[1:]))
+
+
+def _label(f: dict, pressed: bool) -> Optional[Stroke]:
+    if pressed and f["path"] < 12 and f["duration"] < 0.35:
+        return Stroke.POKE
+    turns = f["turns_x"] + f["turns_y"]
+    if turns >= 4 and f["speed"] > 1500:
+        return Stroke.SHAKE
+    if f["turns_y"] >= 2 and f["vertical"] > 0.6:
+        return Stroke.PAT
+    if f["turns_x"] >= 2 and f["vertical"] < 0.4:
+        return Stroke.RUB
+    return None
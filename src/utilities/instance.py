@@ -0,0 +1,165 @@
+import asyncio, json, socket, sys
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Awaitable, Callable, Optional
+from utilities.debug import debug_msg
+
+
+INSTANCE_HOST = "127.0.0.1"
+INSTANCE_PORT = 39039 # "Mi-Ku", binding it is the single-instance lock
+PROTOCOL = "miku/1"   # Guards against talking to some other app on the same port
+CLIENT_TIMEOUT = 1.0
+STARTUP_WAIT = 20.0   # How long a launch waits for the running instance to finish booting and answer
+
+
+class InstanceCommand(Enum):
+    SHOW = "show"   # Un-minimize and put Miku back on screen
+    FOCUS = "focus" # Bring Miku to the front
+    CHAT = "chat"   # Have Miku say something (the given text, or a random line)
+    EXIT = "exit"   # Say bye and close
+
+
+@dataclass(frozen=True)
+class LaunchArgs:
+    command: InstanceCommand = InstanceCommand.SHOW
+    text: str = ""
+    multi: bool = False # Allow another full instance on purpose
+    mascots: int = 1    # Mascots to run inside this one process
+
+
+def parse_args(argv: list[str]) -> LaunchArgs:
+    """
+    Parses `[show|focus|chat [text...]|exit] [--multi] [--mascots=N]`. Unknown arguments
+    are ignored, since packaged builds may be launched with extra ones.
+    """
+    multi = "--multi" in argv
+    mascots = 1
+    for arg in argv:
+        if arg.startswith("--mascots="):
+            try:
+                mascots = max(1, int(arg.split("=", 1)[1]))
+            except ValueError:
+                pass
+    words = [a for a in argv if not a.startswith("-")]
+    command = InstanceCommand.SHOW
+    text = ""
+    if words:
+        try:
+            command = InstanceCommand(words[0].lower())
+        except ValueError:
+            return LaunchArgs(multi=multi, mascots=mascots)
+        if command is InstanceCommand.CHAT:
+            text = " ".join(words[1:])
+    return LaunchArgs(command=command, text=text, multi=multi, mascots=mascots)
+
+
+def claim_instance(port: int = INSTANCE_PORT) -> Optional[socket.socket]:
+    """Binds the instance port. Returns the listening socket, or `None` if it's taken."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    if sys.platform == "win32":
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+    try:
+        sock.bind((INSTANCE_HOST, port))
+        sock.listen()
+    except OSError:
+        sock.close()
+        return None
+    sock.setblocking(False)
+    return sock
+
+
+def forward_command(args: LaunchArgs, port: int = INSTANCE_PORT, wait: float = STARTUP_WAIT) -> Optional[bool]:
+    """
+    Sends `args.command` to the running instance. Returns `True` if it was accepted, `False` if
+    nothing could be reached, and `None` if it connected but got no reply within `wait` seconds.
+    The port is listening from launch but only answered once Miku is up (see `InstanceServer.start`):
+    until then the request waits in the listen queue, so a launch during boot waits here instead
+    of starting a second Miku.
+    """
+    request = json.dumps({"protocol": PROTOCOL, "command": args.command.value, "text": args.text})
+    try:
+        with socket.create_connection((INSTANCE_HOST, port), timeout=CLIENT_TIMEOUT) as conn:
+            conn.sendall(request.encode("utf-8") + b"\n")
+            conn.settimeout(wait)
+            try:
+                reply = conn.makefile("rb").readline()
+            except TimeoutError:
+                return None
+    except OSError:
+        return False
+    return reply.strip() == b"ok"
+
+
+CommandHandler = Callable[[str], Awaitable[None]]
+Spawner = Callable[[Awaitable[None]], object]
+
+
+class InstanceServer:
+    """
+    Listens on the socket from `claim_instance` and runs the handlers registered for each
+    forwarded command (one per mascot). Handlers are spawned, so the client never waits on them.
+    """
+    def __init__(self, debug: bool = False):
+        self.debug = debug
+        self._sock: Optional[socket.socket] = None
+        self._server: Optional[asyncio.Server] = None
+        self._handlers: dict[InstanceCommand, list[tuple[CommandHandler, Spawner]]] = {}
+
+    def attach(self, sock: Optional[socket.socket]) -> None:
+        """
+        Keeps the socket claimed at launch until `start()`; `None` means no guard (`--multi`).
+        It's already listening: other launches queue up on it and get their reply once serving.
+        """
+        self._sock = sock
+
+    def on(self, command: InstanceCommand, handler: CommandHandler, spawn: Optional[Spawner] = None) -> None:
+        """Runs `handler(text)` for `command`, through `spawn` (defaults to `asyncio.create_task`)."""
+        self._handlers.setdefault(command, []).append((handler, spawn or asyncio.create_task))
+
+    def off(self, *handlers: CommandHandler) -> None:
+        for command, subscribers in self._handlers.items():
+            self._handlers[command] = [s for s in subscribers if s[0] not in handlers]
+
+    async def start(self) -> bool:
+        """Starts serving. Returns `False` if this instance has no claimed socket or already serves."""
+        if self._sock is None or self._server is not None:
+            return False
+        self._server = await asyncio.start_server(self._handle, sock=self._sock)
+        debug_msg(f"Listening for commands on {INSTANCE_HOST}:{self._sock.getsockname()[1]}", handler="INSTANCE", debug=self.debug)
+        return True
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        reply = b"error"
+        try:
+            line = await asyncio.wait_for(reader.readline(), timeout=CLIENT_TIMEOUT)
+            request = json.loads(line)
+            if request.get("protocol") == PROTOCOL:
+                command = InstanceCommand(request.get("command"))
+                subscribers = self._handlers.get(command)
+                if subscribers:
+                    debug_msg(f"Received '{command.value}' from another launch", handler="INSTANCE", debug=self.debug)
+                    text = str(request.get("text") or "")
+                    for handler, spawn in subscribers:
+                        spawn(handler(text))
+                    reply = b"ok"
+        except (asyncio.TimeoutError, ValueError, AttributeError):
+            pass
+        try:
+            writer.write(reply + b"\n")
+            await writer.drain()
+            writer.close()
+        except OSError:
+            pass
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        elif self._sock is not None:
+            self._sock.close()
+        self._sock = None
+
+
+instance_server = InstanceServer()
@@ -0,0 +1,60 @@
+import asyncio
+
+from functools import partial
+from pathlib import Path
+from typing import Awaitable, Callable
+from utilities.debug import debug_msg
+from utilities.tasks import owned_task
+
+
+MascotMain = Callable[..., Awaitable[None]] # (page, mascot_id=...) -> None
+
+
+class MascotRegistry:
+    """
+    Tracks the mascots running in this process. Per-mascot state lives in each `main_app`
+    call; process-wide systems (timer wheel, frame clock, instance server) are only torn
+    down by the last mascot to leave.
+    """
+    def __init__(self):
+        self._live: set[int] = set()
+
+    def join(self, mascot_id: int) -> None:
+        self._live.add(mascot_id)
+
+    def leave(self, mascot_id: int) -> bool:
+        """Returns `True` if `mascot_id` was the last mascot running."""
+        self._live.discard(mascot_id)
+        return not self._live
+
+    @property
+    def count(self) -> int:
+        return len(self._live)
+
+
+mascots = MascotRegistry()
+
+
+async def run_mascots(
+    main: MascotMain, before_main: MascotMain, count: int, assets_dir: Path, debug: bool = False
+) -> None:
+    """
+    Runs `count` mascots in this one Python process: each is its own `ft.run_async` app (socket
+    server, session and desktop view, set up by Flet itself), while the interpreter, Flet and
+    every module-level cache are shared. Returns once every view has been closed.
+    """
+    import flet as ft
+
+    async def run(mascot_id: int) -> None:
+        debug_msg(f"Starting mascot {mascot_id}", handler="MASCOTS", debug=debug)
+        try:
+            await ft.run_async(
+                main=partial(main, mascot_id=mascot_id), before_main=partial(before_main, mascot_id=mascot_id),
+                assets_dir=str(assets_dir)
+            )
+        except Exception as e:
+            print(f"Error running mascot {mascot_id}:", e)
+
+    await asyncio.gather(*(
+        owned_task(asyncio.create_task(run(mascot_id), name=f"mascots -> {mascot_id}")) for mascot_id in range(count)
+    ))
@@ -0,0 +1,172 @@
+import asyncio, gc, json, time, tracemalloc
+
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+from utilities.data import get_app_data_dir
+from utilities.debug import debug_msg
+from utilities.perf import rss_mb
+from utilities.tasks import owned_task
+from utilities.timers import TimerHandle, TimerWheel, timer_wheel
+
+
+REPORT_DIR_NAME = "memory"
+KEEP_REPORTS = 10 # Older reports are deleted when a new one is written
+
+# Allocations made by the profiler itself or the import system aren't Miku's
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _growth(snapshot: tracemalloc.Snapshot, since: tracemalloc.Snapshot, top: int) -> list[dict]:
+    """The `top` allocation sites that grew the most from `since` to `snapshot`."""
+    diffs = [d for d in snapshot.compare_to(since, "lineno") if d.size_diff > 0][:top]
+    return [
+        {
+            "site": f"{d.traceback[0].filename}:{d.traceback[0].lineno}",
+            "size_kb": round(d.size / 1024, 1),
+            "grew_kb": round(d.size_diff / 1024, 1),
+            "count": d.count,
+            "grew_count": d.count_diff,
+        }
+        for d in diffs
+    ]
+
+
+def count_flet_controls() -> Counter[str]:
+    """Live Flet controls by type, including detached ones nothing shows anymore. Scans the whole heap."""
+    from flet import BaseControl # Deferred, already loaded by the app
+    counts: Counter[str] = Counter()
+    for obj in gc.get_objects():
+        if isinstance(obj, BaseControl):
+            counts[type(obj).__name__] += 1
+    return counts
+
+
+def count_tasks() -> Counter[str]:
+    """Pending asyncio tasks by coroutine name. Call it on the event loop's thread."""
+    return Counter(
+        getattr(task.get_coro(), "__qualname__", "?") for task in asyncio.all_tasks()
+    )
+
+
+class MemoryProfiler:
+    """
+    Tracks where memory grows during long sessions. While running, tracemalloc records one frame per
+    allocation and a snapshot is taken every `interval` seconds, off the event loop. Only the first,
+    previous and latest snapshots are kept, so the cost stays flat however long Miku runs.
+    `write_report()` ranks the growing allocation sites and counts live Flet controls and tasks.
+    """
+    def __init__(self, interval: float = 300.0, top: int = 15, wheel: Optional[TimerWheel] = None):
+        self.interval = interval
+        self.top = top
+        self.debug = False
+        self._wheel = wheel or timer_wheel
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._latest: Optional[tracemalloc.Snapshot] = None
+        self._handle: Optional[TimerHandle] = None
+        self._sampling: Optional[asyncio.Task] = None
+        self._started_tracing = False
+        self._stats = {"samples": 0, "reports": 0, "sample_ms": 0.0}
+
+    @property
+    def running(self) -> bool:
+        return self._handle is not None
+
+    @property
+    def report_dir(self) -> Path:
+        return get_app_data_dir() / REPORT_DIR_NAME
+
+    # -------- Sampling --------
+    def start(self) -> None:
+        if self.running:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(1) # One frame per trace: the allocation site is all we rank
+            self._started_tracing = True
+        debug_msg(f"Memory profiling every {self.interval:g}s", handler="MEMORY", debug=self.debug)
+        self._handle = self._wheel.schedule(0, self._start_sample) # The baseline
+
+    def stop(self) -> None:
+        """Stops sampling and tracing, and drops the snapshots."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._sampling is not None:
+            self._sampling.cancel()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self._baseline = self._previous = self._latest = None
+
+    def _start_sample(self) -> None:
+        if self._sampling is None or self._sampling.done():
+            self._sampling = owned_task(asyncio.create_task(self.sample(), name="memory -> sample"))
+        self._handle = self._wheel.schedule(self.interval, self._start_sample)
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+    async def sample(self) -> None:
+        if not tracemalloc.is_tracing():
+            return
+        start = time.perf_counter()
+        snapshot = await asyncio.to_thread(self._take_snapshot)
+        if self._baseline is None:
+            self._baseline = snapshot
+        self._previous, self._latest = self._latest, snapshot
+        self._stats["samples"] += 1
+        self._stats["sample_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    # -------- Reports --------
+    def _build_report(self, reason: str, tasks: Counter[str]) -> dict:
+        report = {
+            "reason": reason,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "rss_mb": round(rss_mb(), 1),
+            "tasks": {"total": sum(tasks.values()), "by_coroutine": dict(tasks.most_common(self.top))},
+        }
+        controls = count_flet_controls()
+        report["flet_controls"] = {"total": sum(controls.values()), "by_type": dict(controls.most_common(self.top))}
+        if self._latest is not None:
+            current, peak = tracemalloc.get_traced_memory()
+            report["traced_kb"] = {"current": round(current / 1024, 1), "peak": round(peak / 1024, 1)}
+            report["growth_since_start"] = _growth(self._latest, self._baseline, self.top)
+            if self._previous is not None:
+                report["growth_since_last_sample"] = _growth(self._latest, self._previous, self.top)
+        return report
+
+    def _write(self, report: dict) -> Path:
+        directory = self.report_dir
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"memory-{time.strftime('%Y%m%d-%H%M%S')}-{report['reason']}.json"
+        path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        for old in sorted(directory.glob("memory-*.json"))[:-KEEP_REPORTS]:
+            old.unlink(missing_ok=True)
+        return path
+
+    async def write_report(self, reason: str = "manual") -> Optional[Path]:
+        """Takes a fresh sample (if profiling) and writes the report as JSON. Returns its path."""
+        if self.running:
+            await self.sample()
+        tasks = count_tasks() # Has to be read on the loop's thread
+        try:
+            report = await asyncio.to_thread(self._build_report, reason, tasks)
+            path = await asyncio.to_thread(self._write, report)
+        except OSError as e:
+            print("Error writing the memory report:", e)
+            return None
+        self._stats["reports"] += 1
+        debug_msg(f"Memory report written to {path}", handler="MEMORY", debug=self.debug)
+        return path
+
+    def stats(self) -> dict:
+        return dict(self._stats, running=self.running)
+
+
+memory_profiler = MemoryProfiler()
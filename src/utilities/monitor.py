@@ -1,35 +1,57 @@
+from __future__ import annotations
+
 import flet as ft
-import screeninfo
+import time
 
-from typing import Optional
+from typing import Optional, Tuple, List, TYPE_CHECKING
+from utilities.accounting import update_window
 from utilities.debug import debug_msg
 
+if TYPE_CHECKING:
+    import screeninfo
 
-import flet as ft
-import screeninfo
-from typing import Optional, Tuple, List
-from utilities.debug import debug_msg
+
+MONITOR_CACHE_TTL = 2.0 # Seconds an enumeration is shared before the topology is read again
+
+_monitor_cache: Tuple[float, List[screeninfo.Monitor]] = (0.0, [])
+monitor_stats = {"calls": 0, "enumerations": 0}
 
 
-def get_all_monitors() -> List[screeninfo.Monitor]:
-    """Return a list of monitors detected in the system."""
+def get_all_monitors(refresh: bool = False) -> List[screeninfo.Monitor]:
+    """
+    Return a list of monitors detected in the system.
+    The topology is shared by every caller (and mascot) for `MONITOR_CACHE_TTL` seconds,
+    set `refresh` to enumerate again anyway. Don't modify the returned list.
+    """
+    global _monitor_cache
+    monitor_stats["calls"] += 1
+    read_at, monitors = _monitor_cache
+    now = time.monotonic()
+    if not refresh and monitors and now - read_at < MONITOR_CACHE_TTL:
+        return monitors
+    import screeninfo # Deferred until the first enumeration
+    monitor_stats["enumerations"] += 1
     try:
-        return screeninfo.get_monitors()
+        monitors = screeninfo.get_monitors()
     except Exception as e:
         print("Error detecting monitors:", e)
         return []
+    _monitor_cache = (now, monitors)
+    return monitors
 
 
 def get_monitor_for_window(
     left: Optional[float] = None, top: Optional[float] = None,
     width: Optional[float] = None, height: Optional[float] = None,
-    page: Optional[ft.Page] = None
+    page: Optional[ft.Page] = None, monitors: Optional[List[screeninfo.Monitor]] = None
 ) -> Optional[screeninfo.Monitor]:
     """
     Return the monitor where the window is located (largest overlap).
     Accepts explicit window geometry or derives it from a `page`.
+    Pass already enumerated `monitors` to skip enumerating them again.
     """
-    monitors = get_all_monitors()
+    if monitors is None:
+        monitors = get_all_monitors()
     if not monitors:
         return None
 
@@ -91,12 +113,14 @@ def clamp_to_monitor(
 def check_and_adjust_bounds(
     page: Optional[ft.Page] = None, debug: bool = False,
     left: Optional[float] = None, top: Optional[float] = None,
-    width: Optional[float] = None, height: Optional[float] = None
+    width: Optional[float] = None, height: Optional[float] = None,
+    monitors: Optional[List[screeninfo.Monitor]] = None
 ) -> bool:
     """
     Automatically adjust window within boundaries of the monitor it is in.
     Returns True if a valid monitor was found.
     Accepts explicit window geometry or derives it from a `page`.
+    Pass already enumerated `monitors` to skip enumerating them again.
     """
     if page is None:
         if None in (left, top, width, height):
@@ -106,7 +130,8 @@ def check_and_adjust_bounds(
         win = page.window
         win_left, win_top, win_width, win_height = win.left, win.top, win.width, win.height
 
-    monitor = get_monitor_for_window(left=win_left, top=win_top, width=win_width, height=win_height, page=page)
+    monitor = get_monitor_for_window(left=win_left, top=win_top, width=win_width, height=win_height, page=page,
+                                     monitors=monitors)
     if not monitor:
         debug_msg("DANGER! NO MONITOR!", debug=debug)
         return False
@@ -118,6 +143,6 @@ def check_and_adjust_bounds(
 
     if page is not None and (clamped_left != win_left or clamped_top != win_top):
         page.window.left, page.window.top = clamped_left, clamped_top
-        page.window.update()
+        update_window(page)
 
     return True
\ No newline at end of file
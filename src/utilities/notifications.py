@@ -1,19 +1,175 @@
-from desktop_notifier import DesktopNotifier, Urgency
-from typing import Callable, Any
+from __future__ import annotations
 
+import asyncio, time
 
-global_notifier = DesktopNotifier(app_name="Hatsune Miku")
+from dataclasses import dataclass
+from typing import Callable, Any, Optional, Protocol
+from utilities.debug import debug_msg
+from utilities.tasks import owned_task
 
 
-async def send_notif(title: str, msg: str, urgency: Urgency, on_clicked: Callable[[], Any]) -> None:
-    """Send a notification that can be clicked. Only works in Windows."""
-    await global_notifier.send(title=title, message=msg, urgency=urgency, on_clicked=on_clicked)
-    
-async def preset_help_notif(on_clicked: Callable[[], Any]) -> None:
+@dataclass(frozen=True)
+class Notice:
+    title: str
+    message: str
+    urgency: str = "normal" # "low", "normal" or "critical"
+    on_clicked: Optional[Callable[[], Any]] = None
+
+
+# -------- Backends --------
+class NotificationBackend(Protocol):
+    async def send(self, notice: Notice) -> None: ...
+
+
+class DesktopBackend:
+    """Sends through the OS with `desktop_notifier`. Clickable notifications only work in Windows."""
+    def __init__(self, app_name: str = "Hatsune Miku"):
+        from desktop_notifier import DesktopNotifier # Deferred until the first notification
+        self.notifier = DesktopNotifier(app_name=app_name)
+
+    async def send(self, notice: Notice) -> None:
+        from desktop_notifier import Urgency
+        await self.notifier.send(
+            title=notice.title, message=notice.message,
+            urgency=Urgency(notice.urgency), on_clicked=notice.on_clicked
+        )
+
+
+class InMemoryBackend:
+    """Keeps sent notices in `sent` instead of showing them, for tests and benchmarks."""
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.sent: list[Notice] = []
+
+    async def send(self, notice: Notice) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.sent.append(notice)
+
+
+# -------- Rate Limiting --------
+class TokenBucket:
+    """Allows bursts of up to `capacity`, refilled at `rate` tokens per second."""
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    def try_take(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+# -------- Service --------
+class NotificationService:
+    """
+    Queues notifications for a background sender, so callers (like the movement loop) never
+    wait on the OS. Identical notices within `dedup_window` seconds are dropped, and a token
+    bucket caps the rate. The backend is only created when the first notice goes out.
+    """
+    def __init__(
+        self, backend_factory: Callable[[], NotificationBackend] = DesktopBackend,
+        dedup_window: float = 60.0, rate: float = 0.1, burst: int = 3,
+        max_queued: int = 8, debug: bool = False
+    ):
+        self._factory = backend_factory
+        self._backend: Optional[NotificationBackend] = None
+        self.dedup_window = dedup_window
+        self._bucket = TokenBucket(rate, burst)
+        self._last_sent: dict[tuple[str, str], float] = {}
+        self._queue: Optional[asyncio.Queue[Notice]] = None
+        self._max_queued = max_queued
+        self._sender: Optional[asyncio.Task] = None
+        self.debug = debug
+        self._stats = {"queued": 0, "sent": 0, "deduped": 0, "rate_limited": 0, "dropped": 0, "failed": 0}
+
+    @property
+    def backend(self) -> NotificationBackend:
+        if self._backend is None:
+            self._backend = self._factory()
+        return self._backend
+
+    def set_backend(self, backend: NotificationBackend) -> None:
+        self._backend = backend
+
+    def warm(self) -> None:
+        """Creates the backend ahead of time, e.g. once startup is done."""
+        try:
+            self.backend
+        except Exception as e:
+            print("Error creating the notification backend:", e)
+
+    def notify(
+        self, title: str, message: str, urgency: str = "normal",
+        on_clicked: Optional[Callable[[], Any]] = None
+    ) -> bool:
+        """Queues a notification without waiting for it. Returns `False` if it was dropped."""
+        now = time.monotonic()
+        key = (title, message)
+        last = self._last_sent.get(key)
+        if last is not None and now - last < self.dedup_window:
+            self._stats["deduped"] += 1
+            debug_msg(f"Dropped duplicate notification '{title}'", handler="NOTIFY", debug=self.debug)
+            return False
+        if not self._bucket.try_take():
+            self._stats["rate_limited"] += 1
+            debug_msg(f"Rate limited notification '{title}'", handler="NOTIFY", debug=self.debug)
+            return False
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._max_queued)
+        try:
+            self._queue.put_nowait(Notice(title, message, urgency, on_clicked))
+        except asyncio.QueueFull:
+            self._stats["dropped"] += 1
+            return False
+        self._last_sent[key] = now
+        self._stats["queued"] += 1
+        if self._sender is None or self._sender.done():
+            self._sender = owned_task(asyncio.create_task(self._send_loop(), name="notifications -> send_loop"))
+        return True
+
+    async def _send_loop(self) -> None:
+        while True:
+            notice = await self._queue.get()
+            try:
+                await self.backend.send(notice)
+                self._stats["sent"] += 1
+            except Exception as e:
+                self._stats["failed"] += 1
+                print("Error sending notification:", e)
+
+    def stats(self) -> dict[str, int]:
+        return dict(self._stats, pending=self._queue.qsize() if self._queue else 0)
+
+    async def close(self) -> None:
+        """Stops the sender; anything still queued is dropped."""
+        if self._sender is not None:
+            self._sender.cancel()
+            try:
+                await self._sender
+            except asyncio.CancelledError:
+                pass
+            self._sender = None
+
+
+notifications = NotificationService()
+
+
+def send_notif(title: str, msg: str, urgency: str = "normal", on_clicked: Optional[Callable[[], Any]] = None) -> bool:
+    """Queue a notification that can be clicked. Only clickable in Windows."""
+    return notifications.notify(title=title, message=msg, urgency=urgency, on_clicked=on_clicked)
+
+def preset_help_notif(on_clicked: Callable[[], Any]) -> bool:
     """A preset `Notification` used by Miku."""
-    await send_notif(
+    return send_notif(
         title="Help Me!",
-        message="I've somehow ended up outside of your monitor... I'm in the void! （；´д｀）ゞ",
-        urgency=Urgency.Critical,
+        msg="I've somehow ended up outside of your monitor... I'm in the void! （；´д｀）ゞ",
+        urgency="critical",
         on_clicked=on_clicked
-    )
\ No newline at end of file
+    )
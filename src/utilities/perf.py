@@ -0,0 +1,96 @@
+import asyncio, os, sys
+
+from collections import Counter
+from typing import AsyncIterator, Callable, Optional
+from utilities.accounting import update_accounting
+from utilities.monitor import monitor_stats
+from utilities.physics import physics_stats
+from utilities.timers import frame_clock
+
+
+def _windows_rss() -> int:
+    import ctypes # Deferred, only read while the HUD is open
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+        return 0
+    return counters.WorkingSetSize
+
+
+def rss_mb() -> float:
+    """Resident memory of this process in MB (the peak on platforms without /proc), 0.0 if unknown."""
+    try:
+        if sys.platform == "win32":
+            return _windows_rss() / 2**20
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+class PerfSampler:
+    """
+    Turns the app's running counters into per-second rates, once every `interval` seconds.
+    It only reads counters that already exist, so sampling adds nothing to the paths it measures;
+    how late each sample wakes up is the event loop lag.
+    """
+    def __init__(
+        self, loop_frames: Counter[str], active_tasks: Callable[[], int],
+        task_report: Optional[Callable[[], dict[str, list]]] = None, interval: float = 1.0
+    ):
+        self.interval = interval
+        self._loop_frames = loop_frames
+        self._active_tasks = active_tasks
+        self._task_report = task_report # e.g. `TaskSupervisor.report`, for long-running and untracked tasks
+
+    def _counters(self) -> dict[str, int]:
+        counters = {f"loop.{name}": n for name, n in self._loop_frames.items()}
+        counters["clock"] = frame_clock.frames
+        counters["window"] = update_accounting.control_total("Window")
+        counters["msgs"] = update_accounting.total()
+        counters["monitors"] = monitor_stats["enumerations"]
+        counters["physics_steps"] = physics_stats["steps"]
+        counters["physics_ns"] = physics_stats["step_ns"]
+        return counters
+
+    async def samples(self) -> AsyncIterator[dict]:
+        """Yields a sample every `interval` seconds, until cancelled."""
+        loop = asyncio.get_running_loop()
+        before, then = self._counters(), loop.time()
+        while True:
+            await asyncio.sleep(self.interval)
+            now = loop.time()
+            counters = self._counters()
+            elapsed = now - then
+            rate = lambda key: (counters.get(key, 0) - before.get(key, 0)) / elapsed
+            steps = counters["physics_steps"] - before["physics_steps"]
+            report = self._task_report() if self._task_report else {}
+            yield {
+                "fps": {key[5:]: round(rate(key), 1) for key in counters if key.startswith("loop.")},
+                "clock_fps": round(rate("clock"), 1),
+                "window_updates_s": round(rate("window"), 1),
+                "msgs_s": round(rate("msgs"), 1),
+                "tasks": self._active_tasks(),
+                "tasks_long_running": len(report.get("long_running", ())),
+                "tasks_untracked": len(report.get("untracked", ())),
+                "monitor_enums_s": round(rate("monitors"), 2),
+                "physics_steps_s": round(rate("physics_steps"), 1),
+                "physics_step_us": round((counters["physics_ns"] - before["physics_ns"]) / steps / 1000, 2) if steps else 0.0,
+                "rss_mb": round(rss_mb(), 1),
+                "loop_lag_ms": round(max(elapsed - self.interval, 0.0) * 1000, 1),
+            }
+            before, then = counters, now
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import time
+
+from array import array
+from typing import Optional, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import screeninfo
+
+
+# Shared by every mascot's world, read by the performance menu (see `utilities.perf`)
+physics_stats = {"steps": 0, "step_ns": 0, "throws": 0}
+
+
+class VelocityTracker:
+    """The window's recent positions while dragged, in a fixed ring buffer, for the velocity at release."""
+    def __init__(self, size: int = 8):
+        self._size = size
+        self._t = array("d", bytes(8 * size))
+        self._x = array("d", bytes(8 * size))
+        self._y = array("d", bytes(8 * size))
+        self._count = 0
+
+    def push(self, x: float, y: float, t: Optional[float] = None) -> None:
+        i = self._count % self._size
+        self._t[i] = time.monotonic() if t is None else t
+        self._x[i] = x
+        self._y[i] = y
+        self._count += 1
+
+    def clear(self) -> None:
+        self._count = 0
+
+    def velocity(self, window: float = 0.1, now: Optional[float] = None) -> tuple[float, float]:
+        """
+        Pixels per second over the samples of the last `window` seconds of movement.
+        `(0, 0)` if there are fewer than two, or the window stopped moving `window` seconds before `now`.
+        """
+        if self._count < 2:
+            return 0.0, 0.0
+        last = (self._count - 1) % self._size
+        newest = self._t[last]
+        if now is not None and now - newest > window:
+            return 0.0, 0.0
+        first = last
+        for back in range(1, min(self._count, self._size)):
+            i = (self._count - 1 - back) % self._size
+            if newest - self._t[i] > window:
+                break
+            first = i
+        elapsed = newest - self._t[first]
+        if elapsed <= 0:
+            return 0.0, 0.0
+        return (self._x[last] - self._x[first]) / elapsed, (self._y[last] - self._y[first]) / elapsed
+
+
+class Body:
+    """The window as a point mass: its top-left corner, velocity, and where it was one step ago."""
+    __slots__ = ("x", "y", "vx", "vy", "prev_x", "prev_y", "monitor", "resting")
+
+    def __init__(self):
+        self.x = self.y = self.vx = self.vy = self.prev_x = self.prev_y = 0.0
+        self.monitor = -1
+        self.resting = True
+
+
+class PhysicsWorld:
+    """
+    Throws, falls and bounces for a window, on a fixed timestep. `advance()` runs as many `step`s
+    as the frame took (at most `max_steps`, the rest is dropped) and returns how far the simulation
+    is into the next step, so `position()` can interpolate: motion looks the same at any frame rate.
+
+    Monitor edges are the colliders. An edge is open where another monitor continues past it, so
+    Miku can fly over to a neighbouring screen or fall onto one below. She comes to rest on a floor.
+    A step only does float math on `Body`'s slots: no containers or objects are created.
+    """
+    def __init__(
+        self, step: float = 1 / 120, gravity: float = 2400.0, bounce: float = 0.45,
+        friction: float = 0.75, max_steps: int = 8, max_speed: float = 6000.0
+    ):
+        self.step = step
+        self.gravity = gravity     # px/s²
+        self.bounce = bounce       # Speed kept by a bounce
+        self.friction = friction   # Horizontal speed kept by a floor bounce
+        self.max_steps = max_steps
+        self.max_speed = max_speed
+        self.rest_speed = 60.0     # Slower than this on a floor and she stops
+        self.ground_drag = 0.97    # Horizontal speed kept per step while sliding on a floor
+        self.body = Body()
+        self._rects: tuple[tuple[float, float, float, float], ...] = () # left, top, right, bottom
+        self._width = self._height = 0.0
+        self._accumulator = 0.0
+
+    # -------- Setup --------
+    def set_colliders(self, monitors: Sequence[screeninfo.Monitor], width: float, height: float) -> None:
+        self._rects = tuple((m.x, m.y, m.x + m.width, m.y + m.height) for m in monitors)
+        self._width, self._height = width, height
+
+    def throw(self, x: float, y: float, vx: float, vy: float) -> bool:
+        """Starts flying from `(x, y)`. `False` if the window isn't over any monitor."""
+        b = self.body
+        monitor = self._monitor_at(x + self._width / 2, y + self._height / 2)
+        if monitor < 0:
+            return False
+        speed = (vx * vx + vy * vy) ** 0.5
+        if speed > self.max_speed:
+            vx, vy = vx * self.max_speed / speed, vy * self.max_speed / speed
+        b.x = b.prev_x = x
+        b.y = b.prev_y = y
+        b.vx, b.vy = vx, vy
+        b.monitor = monitor
+        b.resting = False
+        self._accumulator = 0.0
+        physics_stats["throws"] += 1
+        return True
+
+    # -------- Simulation --------
+    def advance(self, dt: float) -> float:
+        """Steps the world through `dt` seconds. Returns the interpolation factor for `position()`."""
+        if self.body.resting:
+            return 1.0
+        self._accumulator += dt
+        steps = 0
+        start = time.perf_counter_ns()
+        while self._accumulator >= self.step and steps < self.max_steps and not self.body.resting:
+            self._step()
+            self._accumulator -= self.step
+            steps += 1
+        physics_stats["steps"] += steps
+        physics_stats["step_ns"] += time.perf_counter_ns() - start
+        if steps == self.max_steps:
+            self._accumulator = 0.0 # Too far behind (a stalled loop), don't try to catch up
+        return 1.0 if self.body.resting else self._accumulator / self.step
+
+    def position(self, alpha: float) -> tuple[float, float]:
+        """The window position `alpha` of the way from the previous step to the current one."""
+        b = self.body
+        return b.prev_x + (b.x - b.prev_x) * alpha, b.prev_y + (b.y - b.prev_y) * alpha
+
+    def _monitor_at(self, x: float, y: float) -> int:
+        for i, (left, top, right, bottom) in enumerate(self._rects):
+            if left <= x < right and top <= y < bottom:
+                return i
+        return -1
+
+    def _step(self) -> None:
+        b, dt = self.body, self.step
+        b.prev_x = b.x
+        b.prev_y = b.y
+        b.vy += self.gravity * dt # Semi-implicit Euler: velocity first, then position
+        b.x += b.vx * dt
+        b.y += b.vy * dt
+
+        left, top, right, bottom = self._rects[b.monitor]
+        w, h = self._width, self._height
+        cx, cy = b.x + w / 2, b.y + h / 2
+        if b.x < left and self._monitor_at(b.x, cy) < 0:
+            b.x = left
+            b.vx = -b.vx * self.bounce
+        elif b.x + w > right and self._monitor_at(b.x + w, cy) < 0:
+            b.x = right - w
+            b.vx = -b.vx * self.bounce
+        if b.y < top and self._monitor_at(cx, b.y) < 0:
+            b.y = top
+            b.vy = -b.vy * self.bounce
+        elif b.y + h >= bottom and self._monitor_at(cx, b.y + h) < 0:
+            b.y = bottom - h
+            if b.vy > self.rest_speed:
+                b.vy = -b.vy * self.bounce
+                b.vx *= self.friction
+            else: # On the floor: slide to a stop
+                b.vy = 0.0
+                b.vx *= self.ground_drag
+                if -self.rest_speed < b.vx < self.rest_speed:
+                    b.vx = 0.0
+                    b.resting = True
+
+        if not (left <= cx < right and top <= cy < bottom): # Crossed over to a neighbouring monitor
+            monitor = self._monitor_at(cx, cy)
+            if monitor >= 0:
+                b.monitor = monitor
+            else: # Slipped through a corner into the void, stop where she was
+                b.x = b.prev_x
+                b.y = b.prev_y
+                b.vx = b.vy = 0.0
+                b.resting = True
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import bisect, random
+
+from operator import attrgetter
+from typing import NamedTuple, Optional, Sequence, TYPE_CHECKING
+from utilities.debug import debug_msg
+
+if TYPE_CHECKING:
+    import screeninfo
+
+
+ROW_CACHE_SIZE = 64 # Rows kept per topology; Miku only walks a few distinct heights
+
+
+class Link(NamedTuple):
+    """Two monitors sharing a vertical edge, and the window tops at which Miku can walk across it."""
+    left: int   # Monitor index on the left of the edge
+    right: int
+    edge: int   # Screen x of the shared edge
+    top: int
+    bottom: int
+
+
+class Lane(NamedTuple):
+    """The window lefts at which Miku stands fully on one monitor, on one row."""
+    monitor: int
+    start: int
+    end: int
+
+
+Span = tuple[Lane, ...] # Lanes joined by links, left to right: everywhere Miku can walk without the void
+_lane_start = attrgetter("start")
+
+
+class MovementPlanner:
+    """
+    Knows where Miku can walk. From the monitor topology and the window size it precomputes which
+    monitor edges connect (`links`), then, per window top, the walkable `Span`s of the row. Both are
+    only rebuilt when `refresh()` sees a different topology. `wander()` keeps a random step on walkable
+    ground and `route()` splits a longer walk into steps, e.g. to another screen with `route_to_neighbour()`.
+    Steps never end straddling two monitors, where the bounds check would snap Miku back.
+    """
+    def __init__(self):
+        self.debug = False
+        self.links: list[Link] = []
+        self._fingerprint: Optional[tuple] = None
+        self._monitors: tuple[tuple[int, int, int, int], ...] = ()
+        self._size = (0, 0)
+        self._linked: set[tuple[int, int]] = set()
+        self._rows: dict[int, tuple[Span, ...]] = {}
+        self._stats = {"refreshes": 0, "rebuilds": 0, "rows": 0, "routes": 0}
+
+    # -------- Topology --------
+    def refresh(self, monitors: Sequence[screeninfo.Monitor], width: float, height: float) -> bool:
+        """Rebuilds the links for a new topology or window size. Returns whether anything changed."""
+        self._stats["refreshes"] += 1
+        rects = tuple((m.x, m.y, m.width, m.height) for m in monitors)
+        fingerprint = (rects, int(width), int(height))
+        if fingerprint == self._fingerprint:
+            return False
+        self._fingerprint = fingerprint
+        self._monitors = rects
+        self._size = (int(width), int(height))
+        self.links = self._build_links()
+        self._linked = {(link.left, link.right) for link in self.links}
+        self._rows.clear()
+        self._stats["rebuilds"] += 1
+        debug_msg(
+            f"Topology of {len(rects)} monitors, {len(self.links)} walkable edges", handler="PLANNER", debug=self.debug
+        )
+        return True
+
+    def _build_links(self) -> list[Link]:
+        """Checks each monitor only against those starting where it ends, and overlapping it vertically."""
+        height = self._size[1]
+        by_left_edge: dict[int, list[tuple[int, int, int]]] = {} # x: [(y, bottom, index)] sorted by y
+        for i, (x, y, _, h) in enumerate(self._monitors):
+            by_left_edge.setdefault(x, []).append((y, y + h, i))
+        tallest: dict[int, int] = {}
+        for x, column in by_left_edge.items():
+            column.sort()
+            tallest[x] = max(bottom - y for y, bottom, _ in column)
+        links = []
+        for i, (x, y, w, h) in enumerate(self._monitors):
+            column = by_left_edge.get(x + w)
+            if column is None:
+                continue
+            first = bisect.bisect_left(column, (y - tallest[x + w],))
+            for other_y, other_bottom, j in column[first:]:
+                if other_y >= y + h:
+                    break
+                top, bottom = max(y, other_y), min(y + h, other_bottom) - height
+                if top <= bottom:
+                    links.append(Link(i, j, x + w, top, bottom))
+        return links
+
+    def row(self, top: float) -> tuple[Span, ...]:
+        """The walkable spans for a window at `top`, left to right."""
+        top = int(top)
+        spans = self._rows.get(top)
+        if spans is None:
+            if len(self._rows) >= ROW_CACHE_SIZE:
+                self._rows.clear()
+            spans = self._rows[top] = self._build_row(top)
+            self._stats["rows"] += 1
+        return spans
+
+    def _build_row(self, top: int) -> tuple[Span, ...]:
+        width, height = self._size
+        lanes = sorted(
+            (Lane(i, x, x + w - width) for i, (x, y, w, h) in enumerate(self._monitors)
+             if y <= top and top + height <= y + h and w >= width),
+            key=lambda lane: lane.start
+        )
+        spans: list[list[Lane]] = []
+        for lane in lanes:
+            if spans and (spans[-1][-1].monitor, lane.monitor) in self._linked:
+                spans[-1].append(lane)
+            else:
+                spans.append([lane])
+        return tuple(tuple(span) for span in spans)
+
+    def span_at(self, left: float, top: float) -> Optional[Span]:
+        """The span the window at `(left, top)` stands on, or `None` if it's in the void."""
+        for span in self.row(top):
+            if span[0].start <= left <= span[-1].end:
+                return span
+        return None
+
+    # -------- Planning --------
+    @staticmethod
+    def _settle(span: Span, target: float, origin: float) -> int:
+        """`target` kept on `span` and moved off any edge between two monitors, to the side nearest `origin`."""
+        target = min(max(target, span[0].start), span[-1].end)
+        k = bisect.bisect_right(span, target, key=_lane_start) - 1
+        lane = span[k]
+        if target > lane.end: # Straddling lanes k and k + 1
+            after = span[k + 1].start
+            target = lane.end if abs(origin - lane.end) <= abs(origin - after) else after
+        return int(target)
+
+    def wander(self, left: float, top: float, step: int) -> int:
+        """`step` shortened so Miku stays on walkable ground. Unchanged if she's already in the void."""
+        span = self.span_at(left, top)
+        if span is None:
+            return step
+        return self._settle(span, left + step, left) - int(left)
+
+    def route(self, left: float, top: float, goal: float, max_step: int) -> list[int]:
+        """
+        Steps of at most `max_step` pixels from `left` to `goal` along the row. Stops early if
+        the goal isn't on the same span, or an edge can't be crossed in one step.
+        """
+        span = self.span_at(left, top)
+        if span is None or max_step <= 0:
+            return []
+        self._stats["routes"] += 1
+        position, goal = int(left), self._settle(span, goal, goal)
+        steps = []
+        while position != goal:
+            direction = 1 if goal > position else -1
+            target = position + direction * min(abs(goal - position), max_step)
+            settled = self._settle(span, target, position)
+            if settled == position: # Standing at an edge, try landing on its far side
+                settled = self._settle(span, target, target + direction * self._size[0])
+                if settled == position or abs(settled - position) > max_step:
+                    break
+            steps.append(settled - position)
+            position = settled
+        return steps
+
+    def route_to_neighbour(
+        self, left: float, top: float, max_step: int, rng: Optional[random.Random] = None
+    ) -> list[int]:
+        """A walk to a random spot on another monitor of the same span. Empty if there's none."""
+        span = self.span_at(left, top)
+        if span is None:
+            return []
+        rng = rng or random
+        here = min(span, key=lambda lane: 0 if lane.start <= left <= lane.end else min(
+            abs(left - lane.start), abs(left - lane.end)
+        ))
+        others = [lane for lane in span if lane.monitor != here.monitor]
+        if not others:
+            return []
+        lane = rng.choice(others)
+        return self.route(left, top, rng.randint(lane.start, lane.end), max_step)
+
+    def stats(self) -> dict:
+        return dict(self._stats, monitors=len(self._monitors), links=len(self.links), cached_rows=len(self._rows))
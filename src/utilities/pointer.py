@@ -0,0 +1,209 @@
+import math, sys, time
+
+from typing import Callable, Optional
+from utilities.debug import debug_msg
+from utilities.timers import TimerHandle, TimerWheel, timer_wheel
+
+
+Point = tuple[float, float]
+PointerSource = Callable[[], Optional[Point]] # The cursor in screen pixels, `None` if it can't be read
+
+
+# -------- Sources --------
+def _windows_source() -> PointerSource:
+    import ctypes # Deferred, only needed once the cursor is watched
+    from ctypes import wintypes
+    point = wintypes.POINT()
+    get_cursor_pos = ctypes.windll.user32.GetCursorPos
+
+    def read() -> Optional[Point]:
+        if not get_cursor_pos(ctypes.byref(point)):
+            return None
+        return point.x, point.y
+    return read
+
+
+def _x11_source() -> Optional[PointerSource]:
+    import ctypes, ctypes.util
+    name = ctypes.util.find_library("X11")
+    if name is None:
+        return None
+    xlib = ctypes.cdll.LoadLibrary(name)
+    xlib.XOpenDisplay.restype = ctypes.c_void_p
+    xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+    xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+    xlib.XQueryPointer.argtypes = [ctypes.c_void_p, ctypes.c_ulong] + [ctypes.c_void_p] * 7
+    display = xlib.XOpenDisplay(None)
+    if not display:
+        return None
+    root = xlib.XDefaultRootWindow(display)
+    window, x, y, ignored, mask = ctypes.c_ulong(), ctypes.c_int(), ctypes.c_int(), ctypes.c_int(), ctypes.c_uint()
+    refs = [ctypes.byref(v) for v in (window, window, x, y, ignored, ignored, mask)]
+
+    def read() -> Optional[Point]:
+        if not xlib.XQueryPointer(display, root, *refs):
+            return None
+        return x.value, y.value
+    return read
+
+
+def _macos_source() -> PointerSource:
+    import ctypes, ctypes.util
+
+    class CGPoint(ctypes.Structure):
+        _fields_ = [("x", ctypes.c_double), ("y", ctypes.c_double)]
+
+    quartz = ctypes.cdll.LoadLibrary(ctypes.util.find_library("ApplicationServices"))
+    core = ctypes.cdll.LoadLibrary(ctypes.util.find_library("CoreFoundation"))
+    quartz.CGEventCreate.restype = ctypes.c_void_p
+    quartz.CGEventGetLocation.argtypes = [ctypes.c_void_p]
+    quartz.CGEventGetLocation.restype = CGPoint
+    core.CFRelease.argtypes = [ctypes.c_void_p]
+
+    def read() -> Optional[Point]:
+        event = quartz.CGEventCreate(None)
+        if not event:
+            return None
+        location = quartz.CGEventGetLocation(event)
+        core.CFRelease(event)
+        return location.x, location.y
+    return read
+
+
+def system_pointer() -> Optional[PointerSource]:
+    """The OS cursor as a `PointerSource`, or `None` on platforms (or sessions, e.g. Wayland) without one."""
+    try:
+        if sys.platform == "win32":
+            return _windows_source()
+        if sys.platform == "darwin":
+            return _macos_source()
+        return _x11_source()
+    except (OSError, AttributeError, TypeError) as e:
+        print("Error reading the cursor position:", e)
+        return None
+
+
+class SyntheticPointer:
+    """A scripted `PointerSource`: `path(t)` gives the cursor `t` seconds after creation. For tests and benchmarks."""
+    def __init__(self, path: Callable[[float], Optional[Point]], clock: Callable[[], float] = time.monotonic):
+        self._path = path
+        self._clock = clock
+        self._t0 = clock()
+        self.reads = 0
+
+    def __call__(self) -> Optional[Point]:
+        self.reads += 1
+        return self._path(self._clock() - self._t0)
+
+
+# -------- Sampling --------
+class PointerSampler:
+    """
+    Reads a `PointerSource` on the timer wheel, as rarely as it can: every `fast` seconds while the cursor
+    is within `near` pixels of `target()`, every `slow` seconds beyond `far` (in between, proportionally),
+    and every `idle` seconds once it hasn't moved for `idle_after` seconds. `on_move(x, y, distance)`
+    is only called when the cursor actually moved.
+    """
+    def __init__(
+        self, source: PointerSource, target: Callable[[], Point],
+        on_move: Optional[Callable[[float, float, float], None]] = None,
+        near: float = 400.0, far: float = 1500.0, fast: float = 0.05, slow: float = 0.4,
+        idle: float = 1.0, idle_after: float = 2.0,
+        wheel: Optional[TimerWheel] = None, clock: Callable[[], float] = time.monotonic
+    ):
+        self.source = source
+        self.target = target
+        self.on_move = on_move
+        self.near, self.far = near, far
+        self.fast, self.slow, self.idle = fast, slow, idle
+        self.idle_after = idle_after
+        self.debug = False
+        self._wheel = wheel or timer_wheel
+        self._clock = clock
+        self._handle: Optional[TimerHandle] = None
+        self._last: Optional[Point] = None
+        self._moved_at = 0.0
+        self._stats = {"reads": 0, "moves": 0, "failed": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._handle is not None
+
+    @property
+    def last(self) -> Optional[Point]:
+        """The cursor at the last read, `None` before the first."""
+        return self._last
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._moved_at = self._clock()
+        self._handle = self._wheel.schedule(0, self._sample)
+        debug_msg(f"Sampling the cursor every {self.fast:g}s to {self.idle:g}s", handler="POINTER", debug=self.debug)
+
+    def stop(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._last = None
+
+    def interval(self, distance: float, still_for: float) -> float:
+        """Seconds until the next read."""
+        if still_for >= self.idle_after:
+            return self.idle
+        if distance <= self.near:
+            return self.fast
+        if distance >= self.far:
+            return self.slow
+        return self.fast + (self.slow - self.fast) * (distance - self.near) / (self.far - self.near)
+
+    def _sample(self) -> None:
+        now = self._clock()
+        self._stats["reads"] += 1
+        try:
+            point = self.source()
+            target = self.target() if point is not None else None
+        except Exception as e: # e.g. a ctypes or X11 error: try again later rather than stop watching
+            debug_msg(f"Error reading the cursor: {e!r}", handler="POINTER", debug=self.debug)
+            point = None
+        if point is None:
+            self._stats["failed"] += 1
+            self._handle = self._wheel.schedule(self.idle, self._sample)
+            return
+        tx, ty = target
+        distance = math.hypot(point[0] - tx, point[1] - ty)
+        if point != self._last:
+            self._last = point
+            self._moved_at = now
+            self._stats["moves"] += 1
+            if self.on_move is not None:
+                self.on_move(point[0], point[1], distance)
+        self._handle = self._wheel.schedule(self.interval(distance, now - self._moved_at), self._sample)
+
+    def stats(self) -> dict:
+        return dict(self._stats, running=self.running)
+
+
+class FacingHysteresis:
+    """
+    Whether Miku should turn toward a cursor `dx` pixels right of her center. She only turns once
+    it's more than `dead_zone` pixels to the other side, and at most once every `hold` seconds.
+    """
+    def __init__(self, dead_zone: float = 60.0, hold: float = 0.5, clock: Callable[[], float] = time.monotonic):
+        self.dead_zone = dead_zone
+        self.hold = hold
+        self._clock = clock
+        self._turned_at = float("-inf")
+        self.turns = 0
+
+    def should_turn(self, dx: float, facing_left: bool) -> bool:
+        """`facing_left` as in `DynamicMiku.is_flipped()`."""
+        beyond = dx > self.dead_zone if facing_left else dx < -self.dead_zone
+        if not beyond:
+            return False
+        now = self._clock()
+        if now - self._turned_at < self.hold:
+            return False
+        self._turned_at = now
+        self.turns += 1
+        return True
@@ -0,0 +1,96 @@
+import builtins, json, sys, time
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+from utilities.data import get_app_data_dir
+from utilities.debug import debug_msg
+
+
+STARTUP_REPORT_NAME = "startup_report.json"
+
+
+class StartupProfiler:
+    """
+    Records import and phase timings from process start up to Miku's first frame.
+    Every call is a no-op unless `enabled` is set, so it can stay wired in.
+    """
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._t0 = time.perf_counter()
+        self._phases: dict[str, float] = {}
+        self._marks: dict[str, float] = {}
+        self._imports: dict[str, float] = {}
+        self._original_import = None
+
+    def _elapsed_ms(self, since: Optional[float] = None) -> float:
+        return round((time.perf_counter() - (self._t0 if since is None else since)) * 1000, 3)
+
+    # -------- Imports --------
+    def track_imports(self) -> None:
+        """Times every first-time import until `stop_tracking_imports()` is called."""
+        if not self.enabled or self._original_import is not None:
+            return
+        original_import = builtins.__import__
+        imports = self._imports
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in sys.modules:
+                return original_import(name, globals, locals, fromlist, level)
+            start = time.perf_counter()
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                imports.setdefault(name, round((time.perf_counter() - start) * 1000, 3))
+
+        self._original_import = original_import
+        builtins.__import__ = timed_import
+
+    def stop_tracking_imports(self) -> None:
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    # -------- Phases --------
+    @contextmanager
+    def phase(self, name: str):
+        """Times the wrapped block as the phase `name`."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._phases[name] = self._elapsed_ms(start)
+
+    def mark(self, name: str) -> None:
+        """Records the time since process start at which `name` was reached."""
+        if self.enabled:
+            self._marks.setdefault(name, self._elapsed_ms())
+
+    # -------- Reports --------
+    def report(self) -> dict:
+        slowest = sorted(self._imports.items(), key=lambda item: item[1], reverse=True)
+        return {
+            "phases_ms": dict(self._phases),
+            "marks_ms": dict(self._marks),
+            "imports_ms": dict(slowest),
+        }
+
+    def save(self, path: Optional[Path] = None, debug: bool = False) -> Optional[Path]:
+        """Writes the report as JSON to `path` (the app data dir by default)."""
+        if not self.enabled:
+            return None
+        self.stop_tracking_imports()
+        path = path or get_app_data_dir() / STARTUP_REPORT_NAME
+        try:
+            path.write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+        except OSError as e:
+            print("Error saving startup report:", e)
+            return None
+        debug_msg(f"Startup report saved to {path}", handler="PROFILER", debug=debug)
+        return path
+
+
+startup_profiler = StartupProfiler()
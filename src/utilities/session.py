@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import flet as ft
+import hashlib, json, time
+
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Optional, List, TYPE_CHECKING
+from utilities.data import get_app_data_dir
+from utilities.debug import debug_msg
+from utilities.monitor import get_monitor_for_window
+
+if TYPE_CHECKING:
+    from screeninfo import Monitor
+
+
+SESSION_FILE_NAME = "session.json"
+SNAPSHOT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class SessionSnapshot:
+    """What Miku needs to pick up exactly where she left off."""
+    left: float
+    top: float
+    width: float
+    height: float
+    fingerprint: str
+    expression: str
+    monitor_index: int
+    version: int = SNAPSHOT_VERSION
+
+
+def monitor_fingerprint(monitors: List[Monitor]) -> str:
+    """Returns a short hash of the monitor layout, so any change invalidates a snapshot."""
+    layout = ";".join(f"{m.x},{m.y},{m.width},{m.height},{int(bool(m.is_primary))}" for m in monitors)
+    return hashlib.blake2s(layout.encode(), digest_size=8).hexdigest()
+
+
+def get_session_path(mascot_id: int = 0) -> Path:
+    """Each mascot in the process keeps its own snapshot; the first one uses `session.json`."""
+    if mascot_id == 0:
+        return get_app_data_dir() / SESSION_FILE_NAME
+    return get_app_data_dir() / f"session-{mascot_id}.json"
+
+
+def load_snapshot(path: Optional[Path] = None) -> Optional[SessionSnapshot]:
+    """Returns the saved snapshot, or `None` if there is none or it can't be read."""
+    try:
+        data = json.loads((path or get_session_path()).read_text(encoding="utf-8"))
+        snapshot = SessionSnapshot(**data)
+    except (OSError, ValueError, TypeError):
+        return None
+    return snapshot if snapshot.version == SNAPSHOT_VERSION else None
+
+
+def save_snapshot(snapshot: SessionSnapshot, path: Optional[Path] = None) -> bool:
+    """Writes `snapshot` to disk. Returns `True` if it was saved."""
+    try:
+        (path or get_session_path()).write_text(json.dumps(asdict(snapshot)), encoding="utf-8")
+    except OSError as e:
+        print("Error saving session snapshot:", e)
+        return False
+    return True
+
+
+def take_snapshot(
+    page: ft.Page, monitors: List[Monitor], expression: str, top: Optional[float] = None
+) -> SessionSnapshot:
+    """Builds a snapshot from the current window. Pass `top` to skip transient offsets (e.g. bobbing)."""
+    win = page.window
+    monitor = get_monitor_for_window(page=page, monitors=monitors)
+    monitor_index = monitors.index(monitor) if monitor in monitors else 0
+    return SessionSnapshot(
+        left=win.left, top=win.top if top is None else top,
+        width=win.width, height=win.height,
+        fingerprint=monitor_fingerprint(monitors),
+        expression=expression, monitor_index=monitor_index
+    )
+
+
+_restored: dict[int, SessionSnapshot] = {}
+
+
+def restore_session(
+    page: ft.Page, monitors: List[Monitor], debug: bool = False, mascot_id: int = 0
+) -> Optional[SessionSnapshot]:
+    """
+    Applies the saved window geometry if the monitor layout hasn't changed since it was taken,
+    kept within the monitor she was on (e.g. if she was saved halfway across an edge).
+    Returns the applied snapshot, or `None` if the full positioning path should run instead.
+    """
+    start = time.perf_counter()
+    snapshot = load_snapshot(get_session_path(mascot_id))
+    if (
+        snapshot is None or snapshot.fingerprint != monitor_fingerprint(monitors)
+        or not 0 <= snapshot.monitor_index < len(monitors)
+    ):
+        debug_msg("No matching session snapshot, using a cold start.", handler="SESSION", debug=debug)
+        return None
+    monitor = monitors[snapshot.monitor_index]
+    win = page.window
+    win.left = max(monitor.x, min(snapshot.left, monitor.x + monitor.width - snapshot.width))
+    win.top = max(monitor.y, min(snapshot.top, monitor.y + monitor.height - snapshot.height))
+    win.width, win.height = snapshot.width, snapshot.height
+    _restored[mascot_id] = snapshot
+    debug_msg(
+        f"Warm start from snapshot took {(time.perf_counter() - start) * 1000:.3f}ms",
+        handler="SESSION", debug=debug
+    )
+    return snapshot
+
+
+def get_restored_snapshot(mascot_id: int = 0) -> Optional[SessionSnapshot]:
+    """Returns the snapshot applied by `restore_session`, if any."""
+    return _restored.get(mascot_id)
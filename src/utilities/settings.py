@@ -0,0 +1,274 @@
+import json, math, os
+
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from typing import Any, Callable, Optional
+from utilities.data import get_app_data_dir
+from utilities.debug import LogLevel, debug_msg
+from utilities.timers import TimerHandle, TimerWheel, timer_wheel
+
+
+SETTINGS_FILE_NAME = "settings.json"
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Every tunable of the app. Loaded from `settings.json`, then never mutated."""
+    # Debug (`debug`, `profile_startup` and `sprites_in_memory` only apply on the next launch)
+    debug:                bool = False
+    profile_startup:      bool = False # Import and phase timings up to the first frame, in `startup_report.json`
+    allow_void_traversal: bool = False
+    enable_mv_override:   bool = False
+    show_movement_logs:   bool = False
+    show_idle_logs:       bool = False
+    show_chat_logs:       bool = False
+    show_loop_logs:       bool = False
+    show_window_logs:     bool = False
+    memory_profiling:     bool = False # tracemalloc snapshots, reports in `memory/` (see `utilities.memory`)
+    log_file:             bool = False # Also write the logs to `miku.log` as JSON lines
+
+    # Interaction counts in `telemetry.bin` (see `utilities.telemetry`), never sent anywhere
+    telemetry: bool = True
+
+    # Performance
+    fps:               float = 60.0  # Shared frame rate of every animation loop
+    sprites_in_memory: bool = False  # Hand sprite bytes from `sprite_cache` to the image instead of asset paths
+    update_budget:     float = 0.0   # Warn when more Flet updates than this are sent per second (0 is off)
+
+    # Movement
+    move_freq_ms:     tuple[int, int] = (2000, 3000) # Frequency of randomized Miku movement
+    move_step:        tuple[int, int] = (-300, 300)  # Range of randomized Miku movement
+    rotate_mod:       float = 0.125                  # Rotation modifier for Miku flip
+    flip_chance:      int = 5                        # Chance of Miku flip out of 100%
+    chat_chance:      int = 20                       # Chance for Miku to randomly chat out of 100%
+    travel_chance:    int = 10                       # Chance for Miku to walk to another screen out of 100%
+    watch_cursor:     bool = False                   # Miku turns to face the mouse cursor
+    follow_cursor:    bool = False                   # ...and walks toward it instead of wandering
+    min_anim_frame:   float = 1.0                    # Used for clamping the lowest allowable animation time per frame
+    throw_physics:    bool = False                   # Letting go mid-drag throws Miku, she falls and bounces
+    gravity:          float = 2400.0                 # px/s², for `throw_physics`
+    bounce:           float = 0.45                   # Speed kept by each bounce, for `throw_physics`
+
+    # Idle Animation
+    idle_amp: float = 4.0 # Pixels up/down (tweak for subtlety)
+
+    # Speech Values (in seconds)
+    msg_base_time: float = 2.0  # Minimum time to display
+    per_char_time: float = 0.02 # Tweak speed factor
+
+
+RESTART_FIELDS = frozenset({"debug", "profile_startup", "sprites_in_memory"})
+
+# The `logs` channel each `show_*_logs` switch turns on
+LOG_CHANNELS: dict[str, str] = {
+    "movement": "show_movement_logs",
+    "idle": "show_idle_logs",
+    "chat": "show_chat_logs",
+    "loop": "show_loop_logs",
+    "window": "show_window_logs",
+}
+
+PRESETS: dict[str, dict[str, Any]] = {
+    "default": {},
+    "low_power": { # Weak machines and laptops on battery
+        "fps": 24.0, "move_freq_ms": (5000, 9000), "idle_amp": 2.0, "chat_chance": 10,
+    },
+    "smooth": {
+        "fps": 120.0, "move_freq_ms": (1500, 2500),
+    },
+}
+
+# (minimum, maximum) for numbers, applied to both ends of pairs
+_LIMITS: dict[str, tuple[float, float]] = {
+    "fps": (1.0, 240.0),
+    "update_budget": (0.0, 10_000.0),
+    "move_freq_ms": (100, 600_000),
+    "move_step": (-5000, 5000),
+    "rotate_mod": (0.0, 10.0),
+    "flip_chance": (0, 100),
+    "chat_chance": (0, 100),
+    "travel_chance": (0, 100),
+    "min_anim_frame": (0.0, 1.0),
+    "gravity": (0.0, 20_000.0),
+    "bounce": (0.0, 0.95),
+    "idle_amp": (0.0, 50.0),
+    "msg_base_time": (0.0, 60.0),
+    "per_char_time": (0.0, 1.0),
+}
+
+
+# -------- Validation --------
+def _validate(name: str, value: Any, default: Any) -> Any:
+    """Returns `value` converted to the type of `default`, or raises `ValueError`."""
+    if isinstance(default, bool):
+        if not isinstance(value, bool):
+            raise ValueError("expected true or false")
+        return value
+    if isinstance(default, tuple):
+        if not isinstance(value, (list, tuple)) or len(value) != 2:
+            raise ValueError("expected a [min, max] pair")
+        pair = tuple(_validate(name, v, default[0]) for v in value)
+        if pair[0] > pair[1]:
+            raise ValueError("min is larger than max")
+        return pair
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError("expected a number")
+    if not math.isfinite(value):
+        raise ValueError("expected a finite number")
+    if isinstance(default, int) and value != int(value):
+        raise ValueError("expected a whole number")
+    value = type(default)(value)
+    low, high = _LIMITS.get(name, (float("-inf"), float("inf")))
+    if not low <= value <= high:
+        raise ValueError(f"expected {low} to {high}")
+    return value
+
+
+def parse_settings(data: dict[str, Any], base: Optional[Settings] = None) -> Settings:
+    """
+    Builds a `Settings` from `data`: its `preset` first, then the individual values.
+    Invalid or unknown entries are reported and skipped, so a typo never keeps Miku from starting.
+    """
+    settings = base or Settings()
+    defaults = {f.name: getattr(settings, f.name) for f in fields(Settings)}
+    preset = data.get("preset", "default")
+    if not isinstance(preset, str) or preset not in PRESETS:
+        print(f"Unknown settings preset '{preset}', expected one of {', '.join(PRESETS)}")
+        preset = "default"
+    overrides = {k: v for k, v in data.items() if k != "preset"}
+
+    changes = {}
+    for values in (PRESETS[preset], overrides): # An invalid override keeps the preset's value
+        for name, value in values.items():
+            if name not in defaults:
+                print(f"Ignoring unknown setting '{name}'")
+                continue
+            try:
+                changes[name] = _validate(name, value, defaults[name])
+            except ValueError as e:
+                print(f"Ignoring setting '{name}' = {value!r}: {e}")
+    return replace(settings, **changes)
+
+
+def log_levels(settings: Settings) -> dict[str, LogLevel]:
+    """Channel levels for `logs.configure()`, from the `show_*_logs` switches."""
+    return {
+        channel: LogLevel.DEBUG if getattr(settings, name) else LogLevel.OFF
+        for channel, name in LOG_CHANNELS.items()
+    }
+
+
+def get_settings_path() -> Path:
+    return get_app_data_dir() / SETTINGS_FILE_NAME
+
+
+def load_settings(path: Optional[Path] = None) -> Settings:
+    """Reads the settings file. Falls back to the defaults if it's missing or unreadable."""
+    try:
+        data = json.loads((path or get_settings_path()).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return Settings()
+    except (OSError, ValueError) as e:
+        print("Error reading settings, using the defaults:", e)
+        return Settings()
+    if not isinstance(data, dict):
+        print("Error reading settings, expected a JSON object. Using the defaults.")
+        return Settings()
+    return parse_settings(data)
+
+
+def changed_fields(old: Settings, new: Settings) -> frozenset[str]:
+    return frozenset(f.name for f in fields(Settings) if getattr(old, f.name) != getattr(new, f.name))
+
+
+# -------- Store --------
+SettingsListener = Callable[[Settings, frozenset[str]], None]
+
+
+class SettingsStore:
+    """
+    Holds the current `Settings` snapshot and tells listeners which fields changed,
+    so each loop only re-reads what it cares about. `watch()` polls the file's mtime
+    on the timer wheel for live reloads.
+    """
+    def __init__(self, path: Optional[Path] = None, wheel: Optional[TimerWheel] = None):
+        self._path = path
+        self._wheel = wheel or timer_wheel
+        self._current: Optional[Settings] = None
+        self._mtime: Optional[float] = None
+        self._listeners: list[SettingsListener] = []
+        self._watch: Optional[TimerHandle] = None
+        self._interval = 2.0
+        self.debug = False
+
+    @property
+    def path(self) -> Path:
+        return self._path or get_settings_path()
+
+    @property
+    def current(self) -> Settings:
+        """The settings snapshot, loaded once on first access."""
+        if self._current is None:
+            self._mtime = self._read_mtime()
+            self._current = load_settings(self.path)
+        return self._current
+
+    def _read_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def subscribe(self, listener: SettingsListener) -> Callable[[], None]:
+        """Calls `listener(settings, changed)` on every change. Returns a function to unsubscribe."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener) if listener in self._listeners else None
+
+    def apply(self, new: Settings) -> frozenset[str]:
+        """Replaces the snapshot and notifies listeners. Returns the changed fields."""
+        old = self.current
+        changed = changed_fields(old, new)
+        if not changed:
+            return changed
+        self._current = new
+        debug_msg(f"Settings changed: {', '.join(sorted(changed))}", handler="SETTINGS", debug=self.debug)
+        if changed & RESTART_FIELDS:
+            print(f"Settings {', '.join(sorted(changed & RESTART_FIELDS))} apply on the next launch")
+        for listener in list(self._listeners):
+            try:
+                listener(new, changed)
+            except Exception as e:
+                print("Error applying settings:", e)
+        return changed
+
+    def reload(self) -> frozenset[str]:
+        """Re-reads the file if it was modified since the last read."""
+        mtime = self._read_mtime()
+        if mtime == self._mtime:
+            return frozenset()
+        self._mtime = mtime
+        return self.apply(load_settings(self.path))
+
+    def watch(self, interval: float = 2.0) -> None:
+        """Starts polling the file for changes every `interval` seconds."""
+        self._interval = interval
+        if self._watch is None:
+            self.current
+            self._watch = self._wheel.schedule(interval, self._poll)
+
+    def _poll(self) -> None:
+        try:
+            self.reload()
+        except Exception as e:
+            print("Error reloading settings:", e)
+        finally:
+            if self._watch is not None: # Keep watching, the next save may fix it
+                self._watch.reset(self._interval)
+
+    def stop_watching(self) -> None:
+        if self._watch is not None:
+            self._watch.cancel()
+            self._watch = None
+
+
+settings_store = SettingsStore()
@@ -0,0 +1,192 @@
+import asyncio, json, sqlite3, threading, time
+
+from pathlib import Path
+from typing import Any, Optional
+from utilities.data import get_app_data_dir
+from utilities.debug import debug_msg
+from utilities.tasks import owned_task
+from utilities.timers import TimerHandle, TimerWheel, timer_wheel
+
+
+STORE_FILE_NAME = "miku.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    key     TEXT PRIMARY KEY,
+    value   TEXT NOT NULL,
+    updated REAL NOT NULL
+)
+"""
+
+
+class StateStore:
+    """
+    What Miku remembers between launches: counters, last-seen times and preferences.
+    Everything is read with one query by `load()` (in a worker thread) and served from memory
+    afterwards; writes only mark keys dirty, and are coalesced into one SQLite (WAL) transaction
+    every `flush_interval` seconds and on exit, off the event loop. Nothing here reads the
+    database on the caller's thread: writes made before `load()` are kept aside and merged in by it.
+    """
+    def __init__(
+        self, path: Optional[Path] = None, flush_interval: float = 5.0, wheel: Optional[TimerWheel] = None
+    ):
+        self._path = path
+        self._flush_interval = flush_interval
+        self._wheel = wheel or timer_wheel
+        self._values: Optional[dict[str, Any]] = None
+        self._dirty: set[str] = set()
+        self._early: dict[str, Any] = {}           # Set before `load()`
+        self._early_increments: dict[str, int] = {} # Incremented before `load()`, added to the stored counts
+        self._early_lock = threading.Lock() # `load()` merges them from a worker thread
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock() # The loading and flushing threads share one connection
+        self._flush_handle: Optional[TimerHandle] = None
+        self._flushing: Optional[asyncio.Task] = None
+        self.debug = False
+        self._stats = {"writes": 0, "flushes": 0, "rows_flushed": 0, "load_ms": 0.0}
+
+    @property
+    def path(self) -> Path:
+        return self._path or get_app_data_dir() / STORE_FILE_NAME
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    # -------- Reading --------
+    def load(self) -> None:
+        """Reads every key with a single query. Safe to call from a worker thread."""
+        with self._db_lock:
+            if self._values is not None:
+                return
+            start = time.perf_counter()
+            values = {}
+            try:
+                for key, raw in self._connect().execute("SELECT key, value FROM kv"):
+                    try:
+                        values[key] = json.loads(raw)
+                    except ValueError:
+                        print(f"Ignoring unreadable stored value for '{key}'")
+            except sqlite3.Error as e:
+                print("Error loading the state store, starting fresh:", e)
+            with self._early_lock:
+                values.update(self._early)
+                for key, by in self._early_increments.items():
+                    values[key] = values.get(key, 0) + by
+                self._dirty.update(self._early)
+                self._dirty.update(self._early_increments)
+                self._early.clear()
+                self._early_increments.clear()
+                self._values = values
+            self._stats["load_ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Before `load()`, only what was `set()` since: the database is never read from here."""
+        if self._values is None:
+            with self._early_lock:
+                if self._values is None:
+                    return self._early.get(key, default)
+        return self._values.get(key, default)
+
+    # -------- Writing (memory only) --------
+    def set(self, key: str, value: Any) -> None:
+        self._stats["writes"] += 1
+        if self._values is None:
+            with self._early_lock:
+                if self._values is None:
+                    self._early[key] = value
+                    self._early_increments.pop(key, None) # Replaces whatever was stored
+                    return
+        self._values[key] = value
+        self._dirty.add(key)
+        self._schedule_flush()
+
+    def increment(self, key: str, by: int = 1) -> int:
+        """Returns the new count; before `load()`, only the increments since if `key` wasn't `set()`."""
+        if self._values is None:
+            with self._early_lock:
+                if self._values is None:
+                    self._stats["writes"] += 1
+                    if key in self._early:
+                        self._early[key] += by
+                        return self._early[key]
+                    value = self._early_increments[key] = self._early_increments.get(key, 0) + by
+                    return value
+        value = self.get(key, 0) + by
+        self.set(key, value)
+        return value
+
+    def touch(self, key: str) -> None:
+        """Stores the current time under `key`, e.g. for last-seen times."""
+        self.set(key, time.time())
+
+    # -------- Flushing --------
+    def _schedule_flush(self) -> None:
+        if self._flush_handle is not None and self._flush_handle.active():
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return # Nothing to schedule on; `close()` still writes it
+        self._flush_handle = self._wheel.schedule(self._flush_interval, self._start_flush)
+
+    def _start_flush(self) -> None:
+        if self._flushing is None or self._flushing.done():
+            self._flushing = owned_task(asyncio.create_task(self.flush(), name="store -> flush"))
+
+    def _take_dirty(self) -> list[tuple[str, str, float]]:
+        now = time.time()
+        rows = [(key, json.dumps(self._values[key]), now) for key in self._dirty]
+        self._dirty.clear()
+        return rows
+
+    def _write(self, rows: list[tuple[str, str, float]]) -> None:
+        with self._db_lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO kv (key, value, updated) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated = excluded.updated",
+                    rows
+                )
+
+    async def flush(self) -> None:
+        """Writes every dirty key in one transaction, off the event loop."""
+        if not self._dirty:
+            return
+        rows = self._take_dirty()
+        try:
+            await asyncio.to_thread(self._write, rows)
+        except sqlite3.Error as e:
+            print("Error saving the state store:", e)
+            self._dirty.update(key for key, _, _ in rows) # Try again with the next flush
+            return
+        self._stats["flushes"] += 1
+        self._stats["rows_flushed"] += len(rows)
+
+    def stats(self) -> dict:
+        return dict(self._stats, dirty=len(self._dirty), early=len(self._early) + len(self._early_increments))
+
+    async def close(self) -> None:
+        """Flushes what's left and closes the database."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flushing is not None:
+            await self._flushing
+        if self._values is None and (self._early or self._early_increments):
+            await asyncio.to_thread(self.load) # Merges the early writes so they're saved
+        await self.flush()
+        debug_msg(f"State store: {self.stats()}", handler="STORE", debug=self.debug)
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+state_store = StateStore()
@@ -1,6 +1,21 @@
-import asyncio
+import asyncio, weakref
+
+from pathlib import Path
+from typing import Any, Coroutine, Optional
+
+
+SOURCE_ROOT = str(Path(__file__).resolve().parents[1]) # Only tasks running the app's own code can be leaks
+_accounted: "weakref.WeakSet[asyncio.Task]" = weakref.WeakSet() # Every supervisor's tasks, and `owned_task`s
+
+
+def owned_task(task: asyncio.Task) -> asyncio.Task:
+    """
+    Marks `task` as owned by a process-wide system (a writer, a sampler, the timer wheel) that
+    cancels or awaits it in its own `close()`, so `TaskSupervisor.find_untracked()` skips it.
+    """
+    _accounted.add(task)
+    return task
 
-from typing import Optional
 
 
 def is_task_done(task: Optional[asyncio.Task]) -> Optional[bool]:
@@ -31,4 +46,147 @@ async def await_task_completion(task: Optional[asyncio.Task]) -> bool:
         except asyncio.CancelledError:
             return True
         return True
-    return False
\ No newline at end of file
+    return False
+
+class TaskSupervisor:
+    """
+    Owns every background task of the app so none can outlive it.
+    - Slots hold one task each, and starting a slot cancels whatever was running in it.
+    - Groups hold any number of fire-and-forget tasks (e.g. from menu buttons).
+    - `shutdown()` cancels and awaits all of them.
+    Grouped tasks alive for longer than `long_running_s` are reported by `find_long_running()`, and
+    tasks of the app nobody owns by `find_untracked()`; `report()` has both, for the HUD and the logs.
+    """
+    def __init__(self, long_running_s: float = 30.0, debug: bool = False):
+        self.long_running_s = long_running_s
+        self.debug = debug
+        self._slots: dict[str, asyncio.Task] = {}
+        self._groups: dict[str, set[asyncio.Task]] = {}
+        self._started_at: dict[asyncio.Task, float] = {}
+        self._closed = False
+
+    def _debug_msg(self, msg: str):
+        if self.debug:
+            print(f"[TASKS] {msg}")
+
+    def _track(self, task: asyncio.Task) -> asyncio.Task:
+        self._started_at[task] = asyncio.get_running_loop().time()
+        _accounted.add(task)
+        task.add_done_callback(self._on_done)
+        return task
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        self._started_at.pop(task, None)
+        for group in self._groups.values():
+            group.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Task '{task.get_name()}' failed: {task.exception()!r}")
+
+    # -------- Slots --------
+    def start(self, slot: str, coro: Coroutine[Any, Any, Any], name: Optional[str] = None) -> Optional[asyncio.Task]:
+        """Starts `coro` in `slot`, cancelling the task already running there."""
+        if self._closed:
+            coro.close()
+            return None
+        if cancel_task(self._slots.get(slot)):
+            self._debug_msg(f"Replaced task in slot '{slot}'")
+        task = self._track(asyncio.create_task(coro=coro, name=name or slot))
+        self._slots[slot] = task
+        return task
+
+    def get(self, slot: str) -> Optional[asyncio.Task]:
+        return self._slots.get(slot)
+
+    def is_running(self, slot: str) -> bool:
+        task = self._slots.get(slot)
+        return task is not None and not task.done()
+
+    def cancel(self, slot: str) -> bool:
+        """
+        Returns `True` if a running task in `slot` has been cancelled.
+        A task asking to cancel its own slot is left to finish on its own.
+        """
+        task = self._slots.get(slot)
+        if task is not None and task is asyncio.current_task():
+            return False
+        return cancel_task(self._slots.pop(slot, None))
+
+    # -------- Groups --------
+    def spawn(
+        self, coro: Coroutine[Any, Any, Any], group: str = "default", name: Optional[str] = None
+    ) -> Optional[asyncio.Task]:
+        """Starts a fire-and-forget `coro` that is still tracked under `group`."""
+        if self._closed:
+            coro.close()
+            return None
+        task = self._track(asyncio.create_task(coro=coro, name=name))
+        self._groups.setdefault(group, set()).add(task)
+        return task
+
+    def cancel_group(self, group: str) -> int:
+        """Cancels every task in `group`. Returns how many were cancelled."""
+        return sum(cancel_task(task) for task in list(self._groups.get(group, ())))
+
+    # -------- Monitoring --------
+    def counts(self) -> dict[str, int]:
+        """Returns the number of live tasks per slot and per group."""
+        counts = {slot: int(not task.done()) for slot, task in self._slots.items()}
+        for group, tasks in self._groups.items():
+            counts[f"group:{group}"] = sum(not task.done() for task in tasks)
+        return counts
+
+    def active_count(self) -> int:
+        return len(self._started_at)
+
+    def find_long_running(self, threshold_s: Optional[float] = None) -> list[tuple[str, float]]:
+        """
+        Returns `(name, age_s)` of grouped tasks older than `threshold_s` (`long_running_s` by default).
+        Slots are left out: they hold the loops, which run for as long as their state does.
+        """
+        threshold_s = self.long_running_s if threshold_s is None else threshold_s
+        now = asyncio.get_running_loop().time()
+        grouped = set().union(*self._groups.values())
+        return [
+            (task.get_name(), round(now - started, 3))
+            for task, started in self._started_at.items()
+            if task in grouped and now - started > threshold_s
+        ]
+
+    @staticmethod
+    def find_untracked() -> list[str]:
+        """
+        Returns the names of running tasks of the app's own code that no supervisor (of any mascot)
+        tracks and that aren't an `owned_task`. Flet's and asyncio's own tasks are left out.
+        """
+        current = asyncio.current_task()
+        untracked = []
+        for task in asyncio.all_tasks():
+            if task is current or task in _accounted:
+                continue
+            code = getattr(task.get_coro(), "cr_code", None)
+            if code is not None and code.co_filename.startswith(SOURCE_ROOT):
+                untracked.append(task.get_name())
+        return untracked
+
+    def report(self) -> dict[str, list]:
+        return {"long_running": self.find_long_running(), "untracked": self.find_untracked()}
+
+    # -------- Shutdown --------
+    async def shutdown(self, timeout: float = 2.0) -> list[str]:
+        """
+        Cancels every tracked task (except the caller) and waits up to `timeout` for them.
+        Returns the names of tasks that refused to finish, i.e. leaks.
+        """
+        self._closed = True
+        current = asyncio.current_task()
+        tasks = [task for task in self._started_at if task is not current]
+        for task in tasks:
+            task.cancel()
+        if not tasks:
+            return []
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        leaked = [task.get_name() for task in pending]
+        if leaked:
+            print(f"Tasks still running after shutdown: {leaked}")
+        self._debug_msg(f"Shut down {len(tasks) - len(leaked)} task(s)")
+        return leaked
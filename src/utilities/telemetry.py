@@ -0,0 +1,175 @@
+import asyncio, os, struct, time
+
+from enum import IntEnum
+from pathlib import Path
+from typing import Iterator, Optional
+from utilities.data import get_app_data_dir
+from utilities.debug import debug_msg
+from utilities.tasks import owned_task
+from utilities.timers import timer_wheel
+
+
+TELEMETRY_FILE_NAME = "telemetry.bin"
+FILE_MAGIC = b"MKTL\x01"          # Starts every telemetry file (format version 1)
+RECORD = struct.Struct("<dHHf")   # timestamp, event, mascot id, value: 16 bytes per event
+
+
+class TelemetryEvent(IntEnum):
+    TAP = 1          # value: 0 anywhere, 1 headpat, 2 flustered
+    FED_UP = 2       # Too many taps in a row
+    DRAG = 3
+    DROP = 4
+    MENU_OPEN = 5
+    MENU_CLOSE = 6
+    VOID = 7         # value: the step that led her there
+    WINDOW_BLUR = 8
+    WINDOW_FOCUS = 9
+    STROKE = 10      # value: 1 pat, 2 rub, 3 poke, 4 shake (see `utilities.gestures`)
+
+
+class TelemetryRecorder:
+    """
+    Records interaction events into a preallocated ring buffer of fixed-size records,
+    so `record()` never allocates or touches the disk. A background writer appends them
+    to `telemetry.bin` in batches, rotating the file once it reaches `max_bytes`.
+    If the writer falls behind, the oldest unwritten records are overwritten.
+    """
+    def __init__(
+        self, capacity: int = 1024, flush_interval: float = 10.0,
+        max_bytes: int = 1024 * 1024, backups: int = 2, path: Optional[Path] = None
+    ):
+        self.enabled = True
+        self.debug = False
+        self._capacity = capacity
+        self._buffer = bytearray(capacity * RECORD.size)
+        self._head = 0  # Next slot to write
+        self._count = 0 # Unflushed records
+        self._flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._path = path
+        self._writer: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._stats = {"recorded": 0, "written": 0, "overwritten": 0, "batches": 0, "rotations": 0}
+
+    @property
+    def path(self) -> Path:
+        return self._path or get_app_data_dir() / TELEMETRY_FILE_NAME
+
+    # -------- Recording --------
+    def record(self, event: TelemetryEvent, value: float = 0.0, mascot_id: int = 0) -> None:
+        if not self.enabled:
+            return
+        RECORD.pack_into(self._buffer, self._head * RECORD.size, time.time(), event, mascot_id, value)
+        self._head = (self._head + 1) % self._capacity
+        if self._count == self._capacity:
+            self._stats["overwritten"] += 1
+        else:
+            self._count += 1
+        self._stats["recorded"] += 1
+        if self._writer is None:
+            self._start()
+        elif self._count * 2 >= self._capacity:
+            self._wake.set() # Half full, don't wait for the interval
+
+    def _take_batch(self) -> bytes:
+        """Copies out the unflushed records, oldest first, and empties the buffer."""
+        if not self._count:
+            return b""
+        start = (self._head - self._count) % self._capacity
+        end = start + self._count
+        if end <= self._capacity:
+            batch = bytes(self._buffer[start * RECORD.size:end * RECORD.size])
+        else:
+            batch = bytes(self._buffer[start * RECORD.size:]) + bytes(self._buffer[:self._head * RECORD.size])
+        self._count = 0
+        return batch
+
+    # -------- Writing --------
+    def _start(self) -> None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return # Flushed by `close()` or the next record made on the loop
+        self._wake = asyncio.Event()
+        self._writer = owned_task(asyncio.create_task(self._write_loop(), name="telemetry -> write_loop"))
+
+    async def _write_loop(self) -> None:
+        while True:
+            deadline = timer_wheel.schedule(self._flush_interval, self._wake.set)
+            try:
+                await self._wake.wait() # The interval passed, or the buffer is half full
+            finally:
+                deadline.cancel()
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Writes the buffered records off the event loop."""
+        batch = self._take_batch()
+        if not batch:
+            return
+        try:
+            await asyncio.to_thread(self._append, batch)
+        except OSError as e:
+            print("Error writing telemetry:", e)
+            return
+        self._stats["written"] += len(batch) // RECORD.size
+        self._stats["batches"] += 1
+
+    def _append(self, batch: bytes) -> None:
+        path = self.path
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size and size + len(batch) > self.max_bytes:
+            self._rotate(path)
+            size = 0
+        with open(path, "ab") as f:
+            if not size:
+                f.write(FILE_MAGIC)
+            f.write(batch)
+
+    def _rotate(self, path: Path) -> None:
+        """`telemetry.bin` -> `telemetry.1.bin` -> ... -> `telemetry.<backups>.bin`, dropping the oldest."""
+        for i in range(self.backups, 0, -1):
+            older = rotated_path(path, i)
+            newer = rotated_path(path, i - 1) if i > 1 else path
+            if newer.exists():
+                os.replace(newer, older)
+        if not self.backups:
+            path.unlink(missing_ok=True)
+        self._stats["rotations"] += 1
+
+    def stats(self) -> dict[str, int]:
+        return dict(self._stats, buffered=self._count)
+
+    async def close(self) -> None:
+        """Stops the writer and flushes whatever is left."""
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        await self.flush()
+        debug_msg(f"Telemetry: {self.stats()}", handler="TELEMETRY", debug=self.debug)
+
+
+def rotated_path(path: Path, index: int) -> Path:
+    return path.with_name(f"{path.stem}.{index}{path.suffix}")
+
+
+def read_records(path: Path) -> Iterator[tuple[float, int, int, float]]:
+    """Yields `(timestamp, event, mascot_id, value)` from one telemetry file."""
+    data = path.read_bytes()
+    if not data.startswith(FILE_MAGIC):
+        raise ValueError(f"{path} is not a telemetry file")
+    body = memoryview(data)[len(FILE_MAGIC):]
+    usable = len(body) - len(body) % RECORD.size # A torn last record is skipped
+    return RECORD.iter_unpack(body[:usable])
+
+
+telemetry = TelemetryRecorder()
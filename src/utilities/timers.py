@@ -1,35 +1,254 @@
-import asyncio, time
+import asyncio, math, time
 
-class ResettableTimer:
-    """An asynchronous timer that can be reset while running."""
-    def __init__(self, duration: float):
-        self.duration = duration
-        self._task = None
-        self._reset_event = asyncio.Event()
-        self.expired = asyncio.Event()  # <-- external event
+from typing import Any, Callable, Optional
+from utilities.tasks import owned_task
+
+
+class TimerHandle:
+    """A deadline scheduled on a `TimerWheel`. Cancelling and resetting it are both O(1)."""
+    __slots__ = ("_wheel", "_callback", "_args", "_deadline", "_level", "_bucket")
+
+    def __init__(self, wheel: "TimerWheel", callback: Callable[..., Any], args: tuple):
+        self._wheel = wheel
+        self._callback = callback
+        self._args = args
+        self._deadline = 0
+        self._level = 0
+        self._bucket: Optional[set] = None
+
+    def active(self) -> bool:
+        return self._bucket is not None
+
+    def cancel(self) -> bool:
+        """Returns `True` if the timer was still pending."""
+        return self._wheel._remove(self)
+
+    def reset(self, delay: float) -> None:
+        """Moves the deadline to `delay` seconds from now, even if the timer already fired."""
+        self._wheel._remove(self)
+        self._wheel._insert(self, delay)
+
+
+class TimerWheel:
+    """
+    A hierarchical timer wheel: one driver task manages every deadline of the app.
+    Timers are hashed into `levels` wheels of `slots` buckets, where each level's bucket
+    spans a full turn of the level below; they cascade down as their deadline approaches.
+    The driver only wakes up for buckets that have timers in them, and sleeps while idle.
+    """
+    def __init__(self, resolution: float = 0.01, slot_bits: int = 8, levels: int = 4):
+        self.resolution = resolution
+        self._bits = slot_bits
+        self._mask = (1 << slot_bits) - 1
+        self._levels = levels
+        self._wheels = [[set() for _ in range(1 << slot_bits)] for _ in range(levels)]
+        self._counts = [0] * levels
+        self._max_ticks = (1 << (slot_bits * levels)) - 1
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._t0 = 0.0
+        self._tick = 0
+        self._driver: Optional[asyncio.Task] = None
+        self._waiter: Optional[asyncio.Future] = None
+        self._armed_tick: Optional[int] = None
+        self.wakeups = 0
+        self.fired = 0
+
+    # -------- Public API --------
+    def schedule(self, delay: float, callback: Callable[..., Any], *args: Any) -> TimerHandle:
+        """Calls `callback(*args)` after `delay` seconds."""
+        self._ensure_driver()
+        handle = TimerHandle(self, callback, args)
+        self._insert(handle, delay)
+        return handle
+
+    async def sleep(self, delay: float) -> None:
+        """Awaitable counterpart of `schedule`, a drop-in for `asyncio.sleep(delay)`."""
+        if delay <= 0:
+            await asyncio.sleep(0)
+            return
+        self._ensure_driver()
+        future = self._loop.create_future()
+        handle = self.schedule(delay, _resolve, future)
+        try:
+            await future
+        finally:
+            handle.cancel()
+
+    def pending(self) -> int:
+        return sum(self._counts)
+
+    def stats(self) -> dict:
+        """Returns the driver's wakeups and fired timers so far, and how many are pending."""
+        uptime = self._loop.time() - self._t0 if self._loop else 0.0
+        return {
+            "pending": self.pending(),
+            "fired": self.fired,
+            "wakeups": self.wakeups,
+            "wakeups_per_s": round(self.wakeups / uptime, 3) if uptime > 0 else 0.0,
+        }
 
-    async def _run(self):
+    async def close(self) -> None:
+        """Stops the driver and drops every pending timer. Tasks in `sleep()` are cancelled, not left waiting."""
+        for level, wheel in enumerate(self._wheels):
+            for bucket in wheel:
+                for handle in bucket:
+                    handle._bucket = None
+                    if handle._callback is _resolve and not handle._args[0].done():
+                        handle._args[0].cancel()
+                bucket.clear()
+            self._counts[level] = 0
+        if self._driver and not self._driver.done():
+            self._driver.cancel()
+            try:
+                await self._driver
+            except asyncio.CancelledError:
+                pass
+        self._driver = None
+
+    # -------- Wheel Internals --------
+    def _ensure_driver(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._t0 = loop.time()
+            self._tick = 0
+        if self._driver is None or self._driver.done():
+            self._driver = owned_task(loop.create_task(self._drive(), name="TimerWheel -> _drive"))
+
+    def _current_tick(self) -> int:
+        return int((self._loop.time() - self._t0) / self.resolution)
+
+    def _insert(self, handle: TimerHandle, delay: float) -> None:
+        when = self._loop.time() + max(delay, 0.0) - self._t0
+        handle._deadline = max(math.ceil(when / self.resolution), self._tick + 1)
+        self._place(handle)
+        if self._armed_tick is None or handle._deadline < self._armed_tick:
+            self._rearm()
+
+    def _place(self, handle: TimerHandle) -> None:
+        ticks = min(handle._deadline - self._tick, self._max_ticks)
+        level = 0
+        while level < self._levels - 1 and ticks >> (self._bits * (level + 1)):
+            level += 1
+        index = (handle._deadline >> (self._bits * level)) & self._mask
+        bucket = self._wheels[level][index]
+        bucket.add(handle)
+        handle._bucket = bucket
+        handle._level = level
+        self._counts[level] += 1
+
+    def _remove(self, handle: TimerHandle) -> bool:
+        bucket = handle._bucket
+        if bucket is None:
+            return False
+        bucket.discard(handle)
+        handle._bucket = None
+        self._counts[handle._level] -= 1
+        return True
+
+    def _cascade(self, level: int, index: int) -> None:
+        bucket = self._wheels[level][index]
+        if not bucket:
+            return
+        handles = list(bucket)
+        bucket.clear()
+        self._counts[level] -= len(handles)
+        for handle in handles:
+            self._place(handle)
+
+    def _advance_one(self) -> None:
+        self._tick += 1
+        tick = self._tick
+        if not tick & self._mask:
+            for level in range(1, self._levels):
+                index = (tick >> (self._bits * level)) & self._mask
+                self._cascade(level, index)
+                if index:
+                    break
+        bucket = self._wheels[0][tick & self._mask]
+        if not bucket:
+            return
+        handles = list(bucket)
+        bucket.clear()
+        self._counts[0] -= len(handles)
+        for handle in handles:
+            handle._bucket = None
+            self.fired += 1
+            try:
+                handle._callback(*handle._args)
+            except Exception as e:
+                print(f"Timer callback {handle._callback!r} failed: {e!r}")
+
+    def _next_event_tick(self) -> Optional[int]:
+        """Returns the next tick with timers to fire or to cascade, or `None` if idle."""
+        if not self.pending():
+            return None
+        boundary = (self._tick | self._mask) + 1
+        if self._counts[0]:
+            for tick in range(self._tick + 1, boundary):
+                if self._wheels[0][tick & self._mask]:
+                    return tick
+        return boundary
+
+    def _advance_to(self, target: int) -> None:
+        while self._tick < target:
+            next_tick = self._next_event_tick()
+            if next_tick is None or next_tick > target:
+                self._tick = target
+                return
+            self._tick = next_tick - 1
+            self._advance_one()
+
+    def _rearm(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def _drive(self) -> None:
+        loop = self._loop
         while True:
+            self._advance_to(self._current_tick())
+            next_tick = self._next_event_tick()
+            self._armed_tick = next_tick
+            self._waiter = loop.create_future()
+            call = None
+            if next_tick is not None:
+                call = loop.call_at(self._t0 + next_tick * self.resolution, _resolve, self._waiter)
             try:
-                # Wait for reset OR timeout
-                await asyncio.wait_for(self._reset_event.wait(), timeout=self.duration)
-                self._reset_event.clear()
-            except asyncio.TimeoutError:
-                # Timer expired
-                self.expired.set()   # <-- signal expiration
-                break
+                await self._waiter
+            finally:
+                if call is not None:
+                    call.cancel()
+                self._armed_tick = None
+            self.wakeups += 1
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+timer_wheel = TimerWheel()
+
+
+class ResettableTimer:
+    """An asynchronous timer that can be reset while running, backed by `timer_wheel`."""
+    def __init__(self, duration: float, wheel: Optional[TimerWheel] = None):
+        self.duration = duration
+        self._wheel = wheel or timer_wheel
+        self._handle: Optional[TimerHandle] = None
+        self.expired = asyncio.Event()  # <-- external event
 
     def start(self):
         self.expired.clear()  # clear old expiration
-        if self._task is None or self._task.done():
-            self._task = asyncio.create_task(self._run())
+        if self._handle is None:
+            self._handle = self._wheel.schedule(self.duration, self.expired.set)
         else:
-            self._reset_event.set()
+            self._handle.reset(self.duration)
 
     def cancel(self):
-        if self._task and not self._task.done():
-            self._task.cancel()
-            self._task = None
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
 
 class DeltaTimer:
     """
@@ -64,3 +283,80 @@ class DeltaTimer:
     def delta(self) -> float:
         """Get the most recent delta time."""
         return self._dt
+
+
+class FrameClock:
+    """
+    One frame scheduler shared by every animation loop in the process.
+    All loops waiting on a frame wake up together from a single timer, so N loops
+    cost one wakeup per frame instead of N. It doesn't wake up at all while nobody waits.
+    """
+    def __init__(self, target_fps: float = 60.0):
+        self._frame_time = 1 / target_fps
+        self._waiters: list[asyncio.Future] = []
+        self._call: Optional[asyncio.TimerHandle] = None
+        self._last_frame = 0.0
+        self.frames = 0
+        self.served = 0
+
+    def set_target_fps(self, target_fps: float) -> None:
+        """Takes effect from the next frame."""
+        self._frame_time = 1 / target_fps
+
+    def timer(self) -> "FrameTimer":
+        """Returns a per-loop timer with the same interface as `DeltaTimer`."""
+        return FrameTimer(self)
+
+    async def next_frame(self) -> None:
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        if self._call is None:
+            at = max(self._last_frame + self._frame_time, loop.time())
+            self._call = loop.call_at(at, self._fire, loop)
+        await waiter
+
+    def _fire(self, loop: asyncio.AbstractEventLoop) -> None:
+        waiters, self._waiters = self._waiters, []
+        self._call = None
+        self._last_frame = loop.time()
+        self.frames += 1
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+                self.served += 1
+
+    def stats(self) -> dict:
+        """Returns the frames fired and the average loops served per frame."""
+        return {
+            "frames": self.frames,
+            "served": self.served,
+            "loops_per_frame": round(self.served / self.frames, 3) if self.frames else 0.0,
+        }
+
+
+class FrameTimer:
+    """A loop's view of a `FrameClock`: `tick()` waits for the next shared frame."""
+    __slots__ = ("_clock", "_last_time", "_dt")
+
+    _MIN_DT_S = 0.01
+
+    def __init__(self, clock: FrameClock):
+        self._clock = clock
+        self._last_time = time.perf_counter()
+        self._dt = 0.0
+
+    async def tick(self) -> float:
+        """Waits for the next frame and returns the delta time since this loop's last one."""
+        await self._clock.next_frame()
+        now = time.perf_counter()
+        self._dt = max(now - self._last_time, self._MIN_DT_S)
+        self._last_time = now
+        return self._dt
+
+    @property
+    def delta(self) -> float:
+        return self._dt
+
+
+frame_clock = FrameClock(target_fps=60.0)
@@ -0,0 +1,95 @@
+"""
+This script aggregates Miku's interaction telemetry (`telemetry.bin` and its rotated
+backups) into counts per event, per day and per mascot.
+
+If you want to run this script separately, you can with (if with `uv`):
+    uv run py -m tools.telemetry_report [path/to/telemetry.bin] [--json]
+"""
+
+import json, sys
+
+from collections import Counter
+from datetime import date, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from utilities.data import get_app_data_dir
+from utilities.telemetry import TELEMETRY_FILE_NAME, TelemetryEvent, read_records, rotated_path
+
+
+def telemetry_files(path: Path) -> list[Path]:
+    """The rotated backups (oldest first), then the live file."""
+    backups = []
+    index = 1
+    while rotated_path(path, index).exists():
+        backups.append(rotated_path(path, index))
+        index += 1
+    return [*reversed(backups), *([path] if path.exists() else [])]
+
+
+def aggregate(files: list[Path]) -> dict:
+    events, days, mascots, taps, strokes = Counter(), Counter(), Counter(), Counter(), Counter()
+    first = last = None
+    total = 0
+    utc_offset = datetime.now().astimezone().utcoffset().total_seconds() # Days in local time
+    epoch = date(1970, 1, 1).toordinal()
+    for file in files:
+        try:
+            records = read_records(file)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Skipping {file.name}: {e}", file=sys.stderr)
+            continue
+        for timestamp, event, mascot_id, value in records:
+            events[event] += 1
+            mascots[mascot_id] += 1
+            days[int((timestamp + utc_offset) // 86400)] += 1
+            if event == TelemetryEvent.TAP:
+                taps[int(value)] += 1
+            elif event == TelemetryEvent.STROKE:
+                strokes[int(value)] += 1
+            first = timestamp if first is None else min(first, timestamp)
+            last = timestamp if last is None else max(last, timestamp)
+            total += 1
+
+    def name(event: int) -> str:
+        try:
+            return TelemetryEvent(event).name.lower()
+        except ValueError:
+            return f"unknown_{event}"
+
+    return {
+        "files": [f.name for f in files],
+        "records": total,
+        "first": datetime.fromtimestamp(first).isoformat(timespec="seconds") if first else None,
+        "last": datetime.fromtimestamp(last).isoformat(timespec="seconds") if last else None,
+        "events": {name(e): n for e, n in events.most_common()},
+        "taps": {["anywhere", "headpat", "flustered"][k] if k < 3 else str(k): n for k, n in sorted(taps.items())},
+        "strokes": {["?", "pat", "rub", "poke", "shake"][k] if 0 < k < 5 else str(k): n for k, n in sorted(strokes.items())},
+        "per_day": {date.fromordinal(epoch + d).isoformat(): n for d, n in sorted(days.items())},
+        "per_mascot": dict(sorted(mascots.items())),
+    }
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    path = Path(args[0]) if args else get_app_data_dir() / TELEMETRY_FILE_NAME
+    files = telemetry_files(path)
+    if not files:
+        print(f"❌ No telemetry found at {path}")
+        return
+
+    report = aggregate(files)
+    if "--json" in sys.argv:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"📊 {report['records']} events from {report['first']} to {report['last']} ({len(files)} file(s))")
+    for title in ("events", "taps", "strokes", "per_day", "per_mascot"):
+        print(f"\n{title.replace('_', ' ').capitalize()}:")
+        for key, count in report[title].items():
+            print(f"  {key:<14} {count:>8}")
+
+
+if __name__ == "__main__":
+    main()